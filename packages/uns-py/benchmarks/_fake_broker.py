@@ -0,0 +1,109 @@
+"""Minimal in-process MQTT 3.1.1 / 5 broker used by the connection benchmarks.
+
+Acknowledges CONNECT, SUBSCRIBE, UNSUBSCRIBE, PINGREQ and QoS 1/2 PUBLISH
+(optionally after ``ack_delay`` seconds to emulate a WAN round trip), counts
+PUBLISH frames and their bytes and discards the payloads. MQTT 5 clients are
+offered ``topic_alias_maximum`` in CONNACK. ``stop()`` also drops the open client
+connections, like a broker node going down. Not a real broker: nothing is routed.
+"""
+
+import asyncio
+
+
+class FakeBroker:
+    def __init__(self, *, ack_delay: float = 0.0, topic_alias_maximum: int = 0) -> None:
+        self.ack_delay = ack_delay
+        self.topic_alias_maximum = topic_alias_maximum
+        self.sockets = 0
+        self.mqtt_connections = 0
+        self.open_connections = 0
+        self.publishes = 0
+        self.publish_bytes = 0
+        # Event-loop time of every PUBLISH when set to a list.
+        self.publish_times: list[float] | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self, port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    def _send_later(self, writer: asyncio.StreamWriter, packet: bytes) -> None:
+        # Simulates the broker round trip for acknowledgements.
+        if self.ack_delay <= 0:
+            writer.write(packet)
+        else:
+            asyncio.get_running_loop().call_later(self.ack_delay, lambda: writer.is_closing() or writer.write(packet))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sockets += 1
+        self._writers.add(writer)
+        connected = False
+        mqtt5 = False
+        try:
+            while True:
+                header = await reader.readexactly(1)
+                remaining, multiplier, length_bytes = 0, 1, 0
+                while True:
+                    byte = (await reader.readexactly(1))[0]
+                    length_bytes += 1
+                    remaining += (byte & 0x7F) * multiplier
+                    multiplier *= 128
+                    if not byte & 0x80:
+                        break
+                body = await reader.readexactly(remaining)
+                packet_type = header[0] >> 4
+                if packet_type == 3:
+                    self.publishes += 1
+                    self.publish_bytes += 1 + length_bytes + remaining
+                    if self.publish_times is not None:
+                        self.publish_times.append(asyncio.get_running_loop().time())
+                    if header[0] & 0x06:  # QoS > 0
+                        topic_length = int.from_bytes(body[:2], "big")
+                        packet_id = body[2 + topic_length : 4 + topic_length]
+                        ack = (b"\x40\x02" if header[0] & 0x06 == 0x02 else b"\x50\x02") + packet_id
+                        self._send_later(writer, ack)
+                        continue
+                elif packet_type == 6:  # PUBREL
+                    self._send_later(writer, b"\x70\x02" + body[:2])
+                elif packet_type == 1:  # CONNECT
+                    connected = True
+                    mqtt5 = body[6] == 5
+                    self.mqtt_connections += 1
+                    self.open_connections += 1
+                    if mqtt5:
+                        properties = b""
+                        if self.topic_alias_maximum:
+                            properties = b"\x22" + self.topic_alias_maximum.to_bytes(2, "big")
+                        writer.write(bytes([0x20, 3 + len(properties), 0, 0, len(properties)]) + properties)
+                    else:
+                        writer.write(b"\x20\x02\x00\x00")
+                elif packet_type == 8:  # SUBSCRIBE
+                    if mqtt5:
+                        writer.write(bytes([0x90, 4]) + body[:2] + b"\x00\x00")
+                    else:
+                        writer.write(bytes([0x90, 3]) + body[:2] + b"\x00")
+                elif packet_type == 10:  # UNSUBSCRIBE
+                    if mqtt5:
+                        writer.write(b"\xb0\x04" + body[:2] + b"\x00\x00")
+                    else:
+                        writer.write(b"\xb0\x02" + body[:2])
+                elif packet_type == 12:  # PINGREQ
+                    writer.write(b"\xd0\x00")
+                elif packet_type == 14:  # DISCONNECT
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if connected:
+                self.open_connections -= 1
+            self._writers.discard(writer)
+            writer.close()
@@ -0,0 +1,108 @@
+"""Benchmark: publish latency under bursty topics, FIFO queues vs ``publish_mode="coalesce"``.
+
+``--burst-topics`` topics update ``--burst-rate`` times per second each, while
+``--slow-topics`` other topics update once per second. The broker is simulated by a
+publish that takes ``--publish-ms`` per message on each of ``--workers`` workers, so the
+burst exceeds what it can take. Each value carries its creation time; the run reports the
+p50/p99 age of values when published, for slow and bursty topics, the peak queue depth
+and the number of superseded publishes.
+
+    python benchmarks/coalesce_burst.py --burst-topics 5 --burst-rate 500 --seconds 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+TICK_S = 0.01
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def message(asset: str, attribute: str, value: float) -> dict:
+    return {
+        "topic": "enterprise/site/area/line/",
+        "asset": asset,
+        "objectType": "energy-resource",
+        "objectId": "main",
+        "attributes": {"attribute": attribute, "data": {"value": value}},
+    }
+
+
+async def run(args: argparse.Namespace, mode: str, max_rate: float | None) -> None:
+    proxy = UnsMqttProxy(
+        "127.0.0.1",
+        process_name="bench",
+        instance_name="bench",
+        publish_concurrency=args.workers,
+        publish_mode=mode,  # type: ignore[arg-type]
+        coalesce_max_rate=max_rate,
+    )
+    loop = asyncio.get_running_loop()
+    ages: dict[str, list[float]] = {"burst": [], "slow": []}
+
+    async def publish_raw(topic: str, payload: str | bytes, **kwargs: object) -> None:
+        if topic.endswith("/topics"):
+            return
+        await asyncio.sleep(args.publish_ms / 1000)
+        created = json.loads(payload)["message"]["data"]["value"]
+        ages["burst" if "/burst-" in topic else "slow"].append(loop.time() - created)
+
+    proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    burst_per_tick = max(1, round(args.burst_rate * TICK_S))
+    slow_per_tick = max(1, round(args.slow_topics * TICK_S))
+    peak_depth = 0
+    ticks = int(args.seconds / TICK_S)
+    for tick in range(ticks):
+        started = loop.time()
+        for _ in range(burst_per_tick):
+            for topic in range(args.burst_topics):
+                await proxy.publish_mqtt_message(message("burst", f"burst-{topic}", loop.time()))
+        for index in range(slow_per_tick):
+            topic = (tick * slow_per_tick + index) % args.slow_topics
+            await proxy.publish_mqtt_message(message("slow", f"slow-{topic}", loop.time()))
+        depth = sum(queue.qsize() + len(getattr(queue, "_deferred", ())) for queue in proxy._publish_queues)
+        peak_depth = max(peak_depth, depth)
+        await asyncio.sleep(max(0.0, TICK_S - (loop.time() - started)))
+    await proxy.flush()
+    await proxy._stop_publish_workers()
+    await proxy.flush_produced_topics()
+    label = mode if max_rate is None else f"{mode} {max_rate:g}/s"
+    published = len(ages["burst"]) + len(ages["slow"])
+    print(
+        f"{label:<14} published {published:6d}  superseded {proxy.superseded_publishes():6d}  "
+        f"peak depth {peak_depth:6d}  slow age p50/p99 {statistics.median(ages['slow']) * 1000:7.1f}/"
+        f"{percentile(ages['slow'], 0.99) * 1000:7.1f} ms  burst age p99 {percentile(ages['burst'], 0.99) * 1000:7.1f} ms"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await run(args, "shared", None)
+    await run(args, "sharded", None)
+    await run(args, "coalesce", None)
+    await run(args, "coalesce", args.max_rate)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--burst-topics", type=int, default=5)
+    parser.add_argument("--burst-rate", type=float, default=500)
+    parser.add_argument("--slow-topics", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--publish-ms", type=float, default=4.0)
+    parser.add_argument("--max-rate", type=float, default=20)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: data gap while the broker a client is connected to restarts.
+
+Starts two in-process fake brokers from ``_fake_broker.py``, publishes a QoS 0
+message every ``--interval`` seconds and stops the broker the client is connected
+to; it comes back after ``--restart-after`` seconds. Reports the data gap (from
+the broker going down until either broker receives a publish again), with only
+that broker configured vs with both in the host list.
+
+    python benchmarks/failover.py --restart-after 5
+"""
+
+import argparse
+import asyncio
+import logging
+
+from _fake_broker import FakeBroker
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.topic_builder import TopicBuilder
+
+
+async def run(restart_after: float, interval: float, failover: bool) -> dict[str, float]:
+    primary, standby = FakeBroker(), FakeBroker()
+    primary_port = await primary.start()
+    standby_port = await standby.start()
+    times: list[float] = []
+    primary.publish_times = standby.publish_times = times
+    hosts = [f"127.0.0.1:{primary_port}"]
+    if failover:
+        hosts.append(f"127.0.0.1:{standby_port}")
+    client = UnsMqttClient(
+        hosts,
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "bench"),
+        enable_status=False,
+        reconnect_interval=0.5,
+        max_reconnect_interval=5.0,
+    )
+    await client.connect()
+
+    async def publish_loop() -> None:
+        while True:
+            try:
+                await client.publish_raw("raw/bench/", b"1")
+            except Exception:
+                pass
+            await asyncio.sleep(interval)
+
+    publisher = asyncio.create_task(publish_loop())
+    await asyncio.sleep(0.5)
+    loop = asyncio.get_running_loop()
+    stopped_at = loop.time()
+    await primary.stop()
+    restart = loop.call_later(restart_after, lambda: asyncio.ensure_future(primary.start(primary_port)))
+    while not times or times[-1] <= stopped_at:
+        await asyncio.sleep(interval)
+    gap = times[-1] - stopped_at
+    await asyncio.sleep(restart_after + 0.1)
+    restart.cancel()
+    publisher.cancel()
+    stats = client.connection_stats()
+    await client.close()
+    await primary.stop()
+    await standby.stop()
+    return {
+        "gap_s": gap,
+        "outage_s": stats.last_outage_s or 0.0,
+        "latency_ms": (stats.last_connect_latency_s or 0.0) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restart-after", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+    logging.getLogger("mqtt").setLevel(logging.CRITICAL)
+
+    for failover in (False, True):
+        result = asyncio.run(run(args.restart_after, args.interval, failover))
+        label = "host list" if failover else "one host"
+        print(
+            f"{label:<9}: data gap {result['gap_s']:6.2f} s, "
+            f"reported outage {result['outage_s']:6.2f} s, reconnect {result['latency_ms']:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
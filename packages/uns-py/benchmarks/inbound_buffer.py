@@ -0,0 +1,91 @@
+"""Benchmark: memory held by a slow subscriber, unbounded queue vs inbound buffer policies.
+
+Delivers ``--messages`` UNS data packets over 100 topics through a ``TopicDispatcher``
+to one subscription whose consumer takes one message per ``--consume-every`` delivered,
+and reports the final queue depth, drops and Python heap held (tracemalloc).
+
+    python benchmarks/inbound_buffer.py --messages 100000
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+
+import aiomqtt
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.packet import UnsPacket
+from uns_kit.core.topic_builder import TopicBuilder
+
+
+class _IdleConnection:
+    async def subscribe(self, *args: object, **kwargs: object) -> None:
+        return None
+
+    async def unsubscribe(self, *args: object, **kwargs: object) -> None:
+        return None
+
+    @property
+    def messages(self):
+        async def iterate():
+            await asyncio.Event().wait()
+            yield
+
+        return iterate()
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
+async def run(messages: int, consume_every: int, max_size: int | None, policy: str) -> dict[str, int]:
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "bench"),
+        enable_status=False,
+        inbound_max_size=max_size,
+        inbound_policy=policy,
+    )
+    client._client = _IdleConnection()  # type: ignore[assignment]
+    client._connected.set()
+    payloads = [UnsPacket.to_bytes(UnsPacket.data(value=index, uom="C")) for index in range(100)]
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    subscription = await client.dispatcher.subscribe("raw/#")
+    for index in range(messages):
+        topic = f"raw/line-{index % 100}/temperature"
+        await client.dispatcher.dispatch(aiomqtt.Message(topic, payloads[index % 100], 0, False, 0, None))
+        if index % consume_every == 0:
+            await subscription.__anext__()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    stats = subscription.stats()
+    await client.close()
+    return {"depth": stats.depth, "dropped": stats.dropped, "heap_bytes": held}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--consume-every", type=int, default=10)
+    parser.add_argument("--max-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("unbounded", None, "drop-oldest"),
+        ("drop-oldest", args.max_size, "drop-oldest"),
+        ("drop-newest", args.max_size, "drop-newest"),
+        ("latest-per-topic", args.max_size, "latest-per-topic"),
+    ]
+    for label, max_size, policy in cases:
+        result = asyncio.run(run(args.messages, args.consume_every, max_size, policy))
+        print(
+            f"{label:<17}: depth {result['depth']:7d}, dropped {result['dropped']:7d}, "
+            f"heap {result['heap_bytes'] / 1024:9.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark: memory and throughput of the store-and-forward outbox during an outage.
+
+Publishes ``--messages`` packets through a ``UnsMqttProxy`` whose broker is down,
+once with the default in-memory queue and once with ``outbox_path``, then brings
+the broker back and times the outbox replay. The broker is a stub ``publish_raw``.
+
+    python benchmarks/outbox.py --messages 100000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from uns_kit.core.packet import UnsPacket
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+PAYLOAD = UnsPacket.to_bytes(UnsPacket.data(value=42.5, uom="kW", time="2026-01-01T00:00:00.000Z"))
+
+
+async def run(messages: int, outbox_path: Path | None) -> None:
+    proxy = UnsMqttProxy("localhost", process_name="bench", instance_name="outbox", outbox_path=outbox_path)
+    broker_up = asyncio.Event()
+    published = 0
+
+    async def publish_raw(topic: str, payload: bytes, **kwargs: object) -> None:
+        nonlocal published
+        await broker_up.wait()
+        published += 1
+
+    async def ensure_connected() -> None:
+        await broker_up.wait()
+        proxy.client._connected.set()
+
+    proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    proxy.client._ensure_connected = ensure_connected  # type: ignore[method-assign]
+    proxy._ensure_outbox_replay_started()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for index in range(messages):
+        await proxy.publish_message(f"raw/line-{index % 50}/power/", PAYLOAD)
+    enqueue_s = time.perf_counter() - started
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    label = "outbox" if outbox_path is not None else "memory queue"
+    print(f"{label:<13} outage: {messages / enqueue_s:9.0f} msg/s accepted, {held / 1024 / 1024:7.1f} MiB held")
+
+    started = time.perf_counter()
+    broker_up.set()
+    await proxy.flush()
+    if outbox_path is not None:
+        while proxy.outbox_stats().backlog:  # type: ignore[union-attr]
+            await asyncio.sleep(0.01)
+    replay_s = time.perf_counter() - started
+    print(f"{'':<13} replay: {published / replay_s:9.0f} msg/s ({published} messages)")
+    await proxy.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.messages, None))
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args.messages, Path(directory) / "outbox.db"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark: payload size and encode/decode time per packet codec.
+
+Compares ``json.dumps(packet, separators=(",", ":"))`` / ``json.loads`` with
+the ``PacketCodec`` formats available in this environment (msgpack and cbor
+need the ``msgpack`` / ``cbor2`` packages).
+
+    python benchmarks/packet_codec.py --iterations 100000
+"""
+
+import argparse
+import importlib.util
+import json
+import timeit
+
+from uns_kit.core.packet import PacketCodec, UnsPacket
+
+TIME = "2026-01-01T00:00:00.000Z"
+
+
+def build_packets() -> dict[str, dict]:
+    data_packet = UnsPacket.data(value=42.5, uom="kW", time=TIME, data_group="metering")
+    table_packet = UnsPacket.table(
+        time=TIME,
+        data_group="metering",
+        columns={
+            f"column_{index}": {"type": "double", "value": index * 1.25, "uom": "kW"}
+            for index in range(20)
+        },
+    )
+    series_packet = UnsPacket.series(
+        [round(index * 0.001, 3) for index in range(1000)],
+        [1_767_225_600_000 + index for index in range(1000)],
+        uom="mm/s",
+        delta_encode=True,
+    )
+    return {
+        "data": {**data_packet, "sequenceId": 12, "interval": 1000},
+        "table": {**table_packet, "sequenceId": 12},
+        "series": {**series_packet, "sequenceId": 12},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    codecs = [PacketCodec("json")]
+    codecs += [PacketCodec("msgpack")] if importlib.util.find_spec("msgpack") else []
+    codecs += [PacketCodec("cbor")] if importlib.util.find_spec("cbor2") else []
+
+    for name, packet in build_packets().items():
+        iterations = args.iterations if name != "series" else max(1, args.iterations // 100)
+        baseline = json.dumps(packet, separators=(",", ":")).encode()
+        candidates = {
+            "json.dumps/json.loads": (
+                lambda: json.dumps(packet, separators=(",", ":")).encode(),
+                lambda: json.loads(baseline),
+                baseline,
+            )
+        }
+        for codec in codecs:
+            payload = codec.encode(packet)
+            assert codec.decode(payload) == packet, f"{codec.name} does not round-trip the {name} packet"
+            candidates[f"PacketCodec({codec.name!r})"] = (
+                lambda codec=codec: codec.encode(packet),
+                lambda codec=codec, payload=payload: codec.decode(payload),
+                payload,
+            )
+
+        print(f"{name} packet ({iterations} iterations)")
+        for label, (encode, decode, payload) in candidates.items():
+            encode_us = timeit.timeit(encode, number=iterations) / iterations * 1e6
+            decode_us = timeit.timeit(decode, number=iterations) / iterations * 1e6
+            print(
+                f"  {label:<24} {len(payload):7d} B ({len(payload) / len(baseline):4.0%})"
+                f"  encode {encode_us:8.2f} us  decode {decode_us:8.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
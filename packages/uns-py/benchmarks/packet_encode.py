@@ -0,0 +1,57 @@
+"""Micro-benchmark: UNS packet JSON encoding to MQTT payload bytes.
+
+Compares the previous ``UnsPacket.to_json(...).encode()`` path with the
+``PacketEncoder`` backends and checks that every backend emits identical bytes.
+
+    python benchmarks/packet_encode.py --iterations 200000
+"""
+
+import argparse
+import json
+import timeit
+
+from uns_kit.core.packet import PacketEncoder, UnsPacket, orjson
+
+TIME = "2026-01-01T00:00:00.000Z"
+
+
+def build_packets() -> dict[str, dict]:
+    data_packet = UnsPacket.data(value=42.5, uom="kW", time=TIME, data_group="metering")
+    table_packet = UnsPacket.table(
+        time=TIME,
+        data_group="metering",
+        columns={
+            f"column_{index}": {"type": "double", "value": index * 1.25, "uom": "kW"}
+            for index in range(20)
+        },
+    )
+    return {
+        "data": {**data_packet, "sequenceId": 12, "interval": 1000},
+        "table": {**table_packet, "sequenceId": 12},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    for name, packet in build_packets().items():
+        baseline = json.dumps(packet, separators=(",", ":")).encode()
+        candidates = {
+            "json.dumps().encode()": lambda: json.dumps(packet, separators=(",", ":")).encode(),
+        }
+        for backend in backends:
+            encoder = PacketEncoder(backend)  # type: ignore[arg-type]
+            assert encoder.encode(packet) == baseline, f"{backend} output differs for {name} packet"
+            candidates[f"PacketEncoder({backend!r})"] = lambda encoder=encoder: encoder.encode(packet)
+
+        print(f"{name} packet ({len(baseline)} bytes, {args.iterations} iterations)")
+        for label, func in candidates.items():
+            seconds = timeit.timeit(func, number=args.iterations)
+            print(f"  {label:<26} {seconds / args.iterations * 1e6:8.2f} us/packet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Micro-benchmark: decoding UNS packet payloads received from MQTT.
+
+Compares ``UnsPacket.parse(payload.decode())`` with ``UnsPacket.parse_view``
+in each validation mode, reading only ``data.value`` as a typical subscriber.
+
+    python benchmarks/packet_parse.py --iterations 200000
+"""
+
+import argparse
+import timeit
+
+from uns_kit.core.packet import UnsPacket
+
+TIME = "2026-01-01T00:00:00.000Z"
+
+
+def build_payloads() -> dict[str, bytes]:
+    data_packet = UnsPacket.data(value=42.5, uom="kW", time=TIME, data_group="metering")
+    table_packet = UnsPacket.table(
+        time=TIME,
+        data_group="metering",
+        columns={
+            f"column_{index}": {"type": "double", "value": index * 1.25, "uom": "kW"}
+            for index in range(20)
+        },
+    )
+    return {
+        "data": UnsPacket.to_bytes({**data_packet, "sequenceId": 12}),
+        "table": UnsPacket.to_bytes({**table_packet, "sequenceId": 12}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, payload in build_payloads().items():
+        if name == "data":
+            read_parsed = lambda packet: packet["message"]["data"]["value"]  # noqa: E731
+            read_view = lambda view: view.value  # noqa: E731
+        else:
+            read_parsed = lambda packet: packet["message"]["table"]["columns"]["column_3"]["value"]  # noqa: E731
+            read_view = lambda view: view.columns["column_3"]["value"]  # noqa: E731
+
+        expected = read_parsed(UnsPacket.parse(payload.decode()))
+        candidates = {"parse(payload.decode())": lambda: read_parsed(UnsPacket.parse(payload.decode()))}
+        for mode in ("strict", "lazy", "trusted"):
+            assert read_view(UnsPacket.parse_view(payload, validate=mode)) == expected
+            candidates[f"parse_view({mode!r})"] = lambda mode=mode: read_view(
+                UnsPacket.parse_view(memoryview(payload), validate=mode)
+            )
+
+        print(f"{name} packet ({len(payload)} bytes, {args.iterations} iterations)")
+        for label, func in candidates.items():
+            seconds = timeit.timeit(func, number=args.iterations)
+            print(f"  {label:<26} {seconds / args.iterations * 1e6:8.2f} us/packet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: heartbeat latency on a connection saturated by data publishes.
+
+``--publishers`` tasks publish QoS 0 data as fast as the connection takes it (as the
+publish workers of several proxies sharing one connection do), while a heartbeat task
+publishes an ``uns-infra/.../alive`` packet every ``--heartbeat-ms``. The connection is a
+stand-in for aiomqtt that writes one frame per ``--frame-ms`` in FIFO order, like a
+saturated socket, so a publish completes once every frame queued before it is written.
+Reports heartbeat publish latency (p50/p99/max) and data throughput; run it against the
+previous tree (``PYTHONPATH=...``) to compare.
+
+    python benchmarks/priority_lanes.py --publishers 128 --max-inflight 64 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.topic_builder import TopicBuilder
+
+
+class SaturatedLink:
+    """aiomqtt stand-in: publishes complete in order, one frame every `frame_s`."""
+
+    def __init__(self, frame_s: float) -> None:
+        self.frame_s = frame_s
+        self.frames = 0
+        self._queue: asyncio.Queue[asyncio.Future[None]] = asyncio.Queue()
+        self._writer = asyncio.ensure_future(self._write())
+
+    async def publish(self, topic: str, payload: bytes, *, qos: int = 0, retain: bool = False, properties: object = None) -> None:
+        written = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(written)
+        await written
+
+    async def _write(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_frame = loop.time()
+        while True:
+            written = await self._queue.get()
+            next_frame = max(next_frame + self.frame_s, loop.time())
+            await asyncio.sleep(next_frame - loop.time())
+            self.frames += 1
+            written.set_result(None)
+
+    async def __aexit__(self, *args: object) -> None:
+        self._writer.cancel()
+
+
+async def run(args: argparse.Namespace, max_inflight: int) -> None:
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "bench"),
+        enable_status=False,
+        max_inflight=max_inflight,
+    )
+    link = SaturatedLink(args.frame_ms / 1000)
+    client._client = link  # type: ignore[assignment]
+    client._connected.set()
+    stop = asyncio.Event()
+
+    async def publish_data(index: int) -> None:
+        while not stop.is_set():
+            await client.publish_raw(f"enterprise/site/line/asset-{index}/tag", b"x" * 64)
+
+    publishers = [asyncio.ensure_future(publish_data(index)) for index in range(args.publishers)]
+    await asyncio.sleep(0.2)
+    latencies = []
+    frames_before = link.frames
+    started = time.perf_counter()
+    while time.perf_counter() - started < args.seconds:
+        sent = time.perf_counter()
+        await client.publish_raw("uns-infra/uns-kit/0.0.1/bench/alive", b"1")
+        latencies.append(time.perf_counter() - sent)
+        await asyncio.sleep(args.heartbeat_ms / 1000)
+    elapsed = time.perf_counter() - started
+    frames = link.frames - frames_before
+    stop.set()
+    await asyncio.gather(*publishers)
+    await link.__aexit__()
+    ordered = sorted(latencies)
+    print(
+        f"max_inflight {max_inflight:3d}: heartbeat p50 {statistics.median(ordered) * 1000:6.1f} ms, "
+        f"p99 {ordered[int(len(ordered) * 0.99)] * 1000:6.1f} ms, max {ordered[-1] * 1000:6.1f} ms; "
+        f"{frames / elapsed:6.0f} frames/s"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for max_inflight in args.max_inflight:
+        await run(args, max_inflight)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publishers", type=int, default=128)
+    parser.add_argument("--frame-ms", type=float, default=1.0)
+    parser.add_argument("--heartbeat-ms", type=float, default=50.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--max-inflight", type=int, nargs="+", default=[64, 16])
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: UnsMqttProxy publish_message throughput, QoS 0.
+
+Enqueues ``--messages`` publishes through ``UnsMqttProxy.publish_message`` and waits
+for ``flush()``, against the in-process fake broker from ``_fake_broker.py``, with
+publish workers taking one queued item per wake-up (``publish_batch_size=1``) vs
+draining batches, and the shared queue vs one queue per worker picked by topic hash
+(``publish_mode="sharded"``, which keeps per-topic order). The ``--no-broker`` run
+swaps the socket write for a no-op to isolate the proxy's queue and pending-publish
+bookkeeping; ``--topics`` sets how many distinct topics the messages cycle through.
+
+    python benchmarks/proxy_publish.py --messages 50000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from _fake_broker import FakeBroker
+
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+PAYLOAD = b'{"message":{"data":{"value":42.5,"uom":"kW"}}}'
+
+
+async def run(messages: int, batch_size: int, mode: str, topic_count: int, port: int | None) -> float:
+    proxy = UnsMqttProxy(
+        "127.0.0.1",
+        port=port,
+        process_name="bench",
+        instance_name="bench",
+        publish_batch_size=batch_size,
+        publish_mode=mode,  # type: ignore[arg-type]
+    )
+    if port is None:
+
+        async def publish_raw(topic: str, payload: str | bytes, **kwargs: object) -> None:
+            return None
+
+        proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    else:
+        await proxy.client.connect()
+    topics = [f"raw/bench/{index}/" for index in range(topic_count)]
+    started = time.perf_counter()
+    for index in range(messages):
+        await proxy.publish_message(topics[index % topic_count], PAYLOAD)
+    await proxy.flush()
+    elapsed = time.perf_counter() - started
+    await proxy._stop_publish_workers()
+    await proxy.client.close()
+    return messages / elapsed
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    broker = FakeBroker()
+    port = await broker.start()
+    targets = [("no broker", None)] if args.no_broker else [("fake broker", port), ("no broker", None)]
+    for label, target in targets:
+        for mode, batch_size in (("shared", 1), ("shared", 64), ("sharded", 64)):
+            rate = await run(args.messages, batch_size, mode, args.topics, target)
+            print(f"{label:<11} {mode:<7} publish_batch_size={batch_size:<3} {rate:10.0f} msg/s")
+    await broker.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--no-broker", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("mqtt").setLevel(logging.CRITICAL)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
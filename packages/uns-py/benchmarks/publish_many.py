@@ -0,0 +1,89 @@
+"""Benchmark: scan-to-wire latency of one PLC scan, per-asset calls vs ``publish_many``.
+
+A scan is ``--assets`` assets with ``--tags`` data attributes each. It is published either
+with one ``UnsMqttProxy.publish_mqtt_message`` call per asset or with a single
+``publish_many`` call, and timed until ``flush()`` returns. The first scan, which also
+fills the topic registry, is reported separately from the steady-state median. By
+default publishes go to the in-process fake broker from ``_fake_broker.py``;
+``--no-broker`` swaps the socket write for a no-op.
+
+    python benchmarks/publish_many.py --assets 200 --tags 10 --scans 20
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from _fake_broker import FakeBroker
+
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+
+def build_scan(assets: int, tags: int, scan: int) -> list[dict]:
+    return [
+        {
+            "topic": "enterprise/site/area/line/",
+            "asset": f"asset-{asset}",
+            "objectType": "energy-resource",
+            "objectId": "main",
+            "attributes": [
+                {"attribute": f"tag-{tag}", "data": {"value": scan + tag * 0.5, "uom": "kW"}} for tag in range(tags)
+            ],
+        }
+        for asset in range(assets)
+    ]
+
+
+async def run(args: argparse.Namespace, bulk: bool, port: int | None) -> tuple[float, float]:
+    proxy = UnsMqttProxy("127.0.0.1", port=port, process_name="bench", instance_name="bench")
+    if port is None:
+
+        async def publish_raw(topic: str, payload: str | bytes, **kwargs: object) -> None:
+            return None
+
+        proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    else:
+        await proxy.client.connect()
+    latencies = []
+    for scan in range(args.scans + 1):
+        messages = build_scan(args.assets, args.tags, scan)
+        started = time.perf_counter()
+        if bulk:
+            await proxy.publish_many(messages)
+        else:
+            for message in messages:
+                await proxy.publish_mqtt_message(message)
+        await proxy.flush()
+        latencies.append(time.perf_counter() - started)
+    await proxy._stop_publish_workers()
+    await proxy.client.close()
+    return latencies[0], statistics.median(latencies[1:])
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    broker = FakeBroker()
+    port = await broker.start()
+    targets = [("no broker", None)] if args.no_broker else [("fake broker", port), ("no broker", None)]
+    tags = args.assets * args.tags
+    for label, target in targets:
+        for name, bulk in (("per asset", False), ("publish_many", True)):
+            first, median = await run(args, bulk, target)
+            print(f"{label:<11} {name:<12} {tags} tags: first scan {first * 1000:8.1f} ms, median {median * 1000:8.1f} ms")
+    await broker.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--scans", type=int, default=20)
+    parser.add_argument("--no-broker", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("mqtt").setLevel(logging.CRITICAL)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark: QoS 1 publish throughput over a high-latency link.
+
+Runs against the in-process fake broker with ``--rtt`` seconds of acknowledgement
+delay and compares awaiting every ``publish_raw`` in turn, N concurrent workers
+awaiting ``publish_raw`` (the previous proxy model) and ``publish_pipelined``
+with an in-flight window.
+
+    python benchmarks/publish_pipeline.py --messages 2000 --rtt 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from _fake_broker import FakeBroker
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.topic_builder import TopicBuilder
+
+PAYLOAD = b'{"message":{"data":{"value":42.5,"uom":"kW"}}}'
+
+
+async def connect(port: int, max_inflight: int) -> UnsMqttClient:
+    client = UnsMqttClient(
+        "127.0.0.1",
+        port=port,
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "bench"),
+        enable_status=False,
+        max_inflight=max_inflight,
+    )
+    await client.connect()
+    return client
+
+
+async def sequential(client: UnsMqttClient, messages: int) -> None:
+    for index in range(messages):
+        await client.publish_raw(f"raw/bench/{index % 100}/", PAYLOAD, qos=1)
+
+
+async def workers(client: UnsMqttClient, messages: int, concurrency: int) -> None:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(messages):
+        queue.put_nowait(index)
+
+    async def worker() -> None:
+        while not queue.empty():
+            index = queue.get_nowait()
+            await client.publish_raw(f"raw/bench/{index % 100}/", PAYLOAD, qos=1)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def pipelined(client: UnsMqttClient, messages: int) -> None:
+    for index in range(messages):
+        await client.publish_pipelined(f"raw/bench/{index % 100}/", PAYLOAD, qos=1)
+    await client.flush()
+
+
+async def run(args: argparse.Namespace) -> None:
+    broker = FakeBroker(ack_delay=args.rtt)
+    port = await broker.start()
+    cases = [
+        ("sequential publish_raw", 64, lambda client, n: sequential(client, n), max(1, args.messages // 50)),
+        ("32 workers publish_raw", 64, lambda client, n: workers(client, n, 32), args.messages),
+        ("publish_pipelined window=64", 64, pipelined, args.messages),
+        ("publish_pipelined window=512", 512, pipelined, args.messages),
+    ]
+    print(f"{args.messages} QoS 1 messages, {args.rtt * 1000:.0f} ms broker round trip")
+    for label, window, func, messages in cases:
+        client = await connect(port, window)
+        started = time.perf_counter()
+        await func(client, messages)
+        elapsed = time.perf_counter() - started
+        await client.close()
+        print(f"  {label:<30} {messages / elapsed:10.0f} msg/s ({messages} messages)")
+    await broker.stop()
+
+
+def main() -> None:
+    # aiomqtt warns about every additional pending QoS > 0 publish; that is the point here.
+    logging.getLogger("mqtt").setLevel(logging.ERROR)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2_000)
+    parser.add_argument("--rtt", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
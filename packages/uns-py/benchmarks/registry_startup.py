@@ -0,0 +1,86 @@
+"""Benchmark: startup cost of the produced-topic registry for many new topics.
+
+Registers ``--topics`` new topics one by one, as the first publishes after a start do,
+and times until the registry is flushed. Registry publishes go to a no-op that counts
+messages and bytes. Modes:
+
+- ``immediate``: ``registry_debounce=0``. Every new topic republishes the whole registry
+  (the previous behaviour, O(n^2) bytes). It only runs up to ``--immediate-max`` topics;
+  10k topics take minutes.
+- ``debounced``: the default 0.5 s window.
+- ``paged``: debounced, with ``registry_page_size=--page-size``.
+
+``--spread`` spreads the registrations over that many seconds, so the debounce window
+fires several times during startup.
+
+    python benchmarks/registry_startup.py --topics 10000 50000 --spread 2
+"""
+
+import argparse
+import asyncio
+import time
+
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+CHUNKS = 100
+
+
+async def run(count: int, debounce: float, page_size: int | None, spread: float) -> tuple[float, int, int]:
+    proxy = UnsMqttProxy(
+        "127.0.0.1",
+        process_name="bench",
+        instance_name="bench",
+        registry_debounce=debounce,
+        registry_page_size=page_size,
+    )
+    sent = [0, 0]
+
+    async def publish_raw(topic: str, payload: str | bytes, **kwargs: object) -> None:
+        sent[0] += 1
+        sent[1] += len(payload)
+
+    proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    started = time.perf_counter()
+    for index in range(count):
+        await proxy.register_unique_topic(
+            {
+                "topic": "enterprise/site/area/line/",
+                "asset": f"asset-{index // 10}",
+                "objectType": "energy-resource",
+                "objectId": "main",
+                "attribute": f"tag-{index % 10}",
+                "attributeType": "Data",
+                "description": f"tag {index % 10}",
+                "attributeNeedsPersistence": True,
+                "dataGroup": "",
+            }
+        )
+        if spread and (index + 1) % max(1, count // CHUNKS) == 0:
+            await asyncio.sleep(spread / CHUNKS)
+    await proxy.flush_produced_topics()
+    return time.perf_counter() - started, sent[0], sent[1]
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    modes = [("immediate", 0.0, None), ("debounced", 0.5, None), ("paged", 0.5, args.page_size)]
+    for count in args.topics:
+        for name, debounce, page_size in modes:
+            if name == "immediate" and count > args.immediate_max:
+                print(f"{count:6d} topics {name:<9}  skipped (above --immediate-max)")
+                continue
+            elapsed, messages, size = await run(count, debounce, page_size, args.spread)
+            print(f"{count:6d} topics {name:<9} {elapsed:8.2f} s  {messages:6d} publishes  {size / 1e6:10.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, nargs="+", default=[2_000, 10_000, 50_000])
+    parser.add_argument("--spread", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=1_000)
+    parser.add_argument("--immediate-max", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
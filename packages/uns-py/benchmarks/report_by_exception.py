@@ -0,0 +1,106 @@
+"""Benchmark: broker traffic of polled tags with and without report-by-exception.
+
+``--tags`` tags are polled every ``--poll-ms`` for ``--polls`` polls. Each tag is a slow
+random walk with sensor noise, rounded to two decimals, like a polled analog value; a
+tenth of the tags are string states that change rarely. Every poll is published with
+``publish_many`` and the socket write is a no-op that counts messages and bytes. Runs
+compare publishing every value against ``report_by_exception`` with ``--deadband-percent``
+and a heartbeat every ``--max-silence-ms``.
+
+    python benchmarks/report_by_exception.py --tags 1000 --polls 60 --deadband-percent 1
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+START_MS = 1_767_225_600_000
+
+
+def build_polls(args: argparse.Namespace) -> list[list[dict]]:
+    rng = random.Random(7)
+    levels = [rng.uniform(50, 150) for _ in range(args.tags)]
+    states = ["running"] * args.tags
+    polls = []
+    for poll in range(args.polls):
+        time_ms = START_MS + poll * args.poll_ms
+        attributes = []
+        for tag in range(args.tags):
+            if tag % 10 == 9:
+                if rng.random() < 0.01:
+                    states[tag] = "stopped" if states[tag] == "running" else "running"
+                attributes.append({"attribute": f"state-{tag}", "data": {"value": states[tag], "time": time_ms}})
+                continue
+            levels[tag] += rng.gauss(0, 0.2)
+            value = round(levels[tag] + rng.gauss(0, 0.1), 2)
+            attributes.append({"attribute": f"tag-{tag}", "data": {"value": value, "uom": "kW", "time": time_ms}})
+        polls.append(
+            [
+                {
+                    "topic": "enterprise/site/area/line/",
+                    "asset": f"asset-{index // 10}",
+                    "objectType": "energy-resource",
+                    "objectId": "main",
+                    "attributes": attributes[index : index + 10],
+                }
+                for index in range(0, args.tags, 10)
+            ]
+        )
+    return polls
+
+
+async def run(polls: list[list[dict]], report_by_exception: dict | None) -> tuple[int, int, float]:
+    proxy = UnsMqttProxy(
+        "127.0.0.1",
+        process_name="bench",
+        instance_name="bench",
+        report_by_exception=report_by_exception,
+    )
+    sent = [0, 0]
+
+    async def publish_raw(topic: str, payload: str | bytes, **kwargs: object) -> None:
+        if not topic.endswith("/topics"):
+            sent[0] += 1
+            sent[1] += len(payload)
+
+    proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    started = time.perf_counter()
+    for messages in polls:
+        await proxy.publish_many(messages)
+        await proxy.flush()
+    elapsed = time.perf_counter() - started
+    await proxy._stop_publish_workers()
+    await proxy.flush_produced_topics()
+    return sent[0], sent[1], elapsed
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    polls = build_polls(args)
+    values = args.tags * args.polls
+    settings = {"deadbandPercent": args.deadband_percent, "maxSilenceMs": args.max_silence_ms}
+    baseline = None
+    for name, report_by_exception in (("every value", None), ("by exception", settings)):
+        messages, size, elapsed = await run(polls, report_by_exception)
+        baseline = baseline or messages
+        print(
+            f"{name:<12} {values} values: {messages:7d} publishes ({messages / baseline:6.1%}), "
+            f"{size / 1e6:7.2f} MB, {elapsed / values * 1e6:5.1f} us/value"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tags", type=int, default=1_000)
+    parser.add_argument("--polls", type=int, default=60)
+    parser.add_argument("--poll-ms", type=int, default=1_000)
+    parser.add_argument("--deadband-percent", type=float, default=1.0)
+    parser.add_argument("--max-silence-ms", type=int, default=30_000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: publishing 1 kHz samples one packet each vs as series packets.
+
+Pushes the same samples through ``UnsMqttProxy.publish_mqtt_message`` (with
+the MQTT client stubbed out) as per-sample ``data`` packets and as ``series``
+packets with ISO and delta-encoded times, and reports CPU time and the bytes
+that would go on the wire.
+
+    python benchmarks/series_publish.py --samples 1000 --batches 20
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from uns_kit.core.packet import UnsPacket
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+START_MS = 1_767_225_600_000
+
+
+def mqtt_publish_size(topic: str, payload: bytes) -> int:
+    """PUBLISH packet size at QoS 0: fixed header, topic length prefix, topic, payload."""
+    remaining = 2 + len(topic.encode()) + len(payload)
+    length_bytes = 1 if remaining < 128 else 2 if remaining < 16_384 else 3
+    return 1 + length_bytes + remaining
+
+
+async def run(mode: str, samples: int, batches: int) -> tuple[float, int, int]:
+    proxy = UnsMqttProxy("localhost", process_name="bench", instance_name="bench", max_pending_publishes=0)
+    wire = {"bytes": 0, "messages": 0}
+
+    async def fake_publish_raw(topic: str, payload: bytes, *, qos: int = 0, retain: bool = False) -> None:
+        wire["bytes"] += mqtt_publish_size(topic, payload)
+        wire["messages"] += 1
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    def message(attribute: dict) -> dict:
+        return {
+            "topic": "plant/site/",
+            "asset": "line-1",
+            "objectType": "motor",
+            "objectId": "main",
+            "attributes": {"attribute": "vibration", **attribute},
+        }
+
+    started = time.perf_counter()
+    for batch in range(batches):
+        times = [START_MS + batch * samples + index for index in range(samples)]
+        values = [round(0.001 * index, 3) for index in range(samples)]
+        if mode == "data":
+            for sample_time, value in zip(times, values):
+                sample_datetime = datetime.fromtimestamp(sample_time / 1000, timezone.utc)
+                data = UnsPacket.data(value=value, uom="mm/s", time=sample_datetime)
+                await proxy.publish_mqtt_message(message({"data": data["message"]["data"]}))
+        else:
+            series = UnsPacket.series(values, times, uom="mm/s", delta_encode=mode == "series (delta ms)")
+            await proxy.publish_mqtt_message(message({"series": series["message"]["series"]}))
+        await proxy.flush()
+    elapsed = time.perf_counter() - started
+    await proxy._stop_publish_workers()
+    return elapsed, wire["bytes"], wire["messages"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=1000, help="samples per batch (1 s at 1 kHz)")
+    parser.add_argument("--batches", type=int, default=10)
+    args = parser.parse_args()
+
+    total = args.samples * args.batches
+    print(f"{total} samples in {args.batches} batches of {args.samples}")
+    baseline = None
+    for mode in ("data", "series (ISO times)", "series (delta ms)"):
+        elapsed, wire_bytes, messages = asyncio.run(run(mode, args.samples, args.batches))
+        baseline = baseline or (elapsed, wire_bytes)
+        print(
+            f"  {mode:<20} {elapsed / total * 1e6:8.2f} us/sample  {wire_bytes / total:7.1f} B/sample  "
+            f"{messages:6d} messages  cpu {baseline[0] / elapsed:5.1f}x  bytes {baseline[1] / wire_bytes:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
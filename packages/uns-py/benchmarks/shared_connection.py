@@ -0,0 +1,64 @@
+"""Benchmark: broker connections and memory for N proxies in one UnsProxyProcess.
+
+Starts the in-process fake broker from ``_fake_broker.py``, creates ``--proxies`` instance proxies with and without
+``share_connection`` and reports the broker connections opened plus the Python
+heap held afterwards (tracemalloc; includes the fake broker's per-socket state).
+
+    python benchmarks/shared_connection.py --proxies 50
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+
+from _fake_broker import FakeBroker
+
+from uns_kit.core.proxy_process import UnsProxyProcess
+
+
+async def run(proxies: int, share_connection: bool) -> dict[str, int]:
+    broker = FakeBroker()
+    port = await broker.start()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    process = UnsProxyProcess(
+        "127.0.0.1",
+        {"process_name": "bench", "port": port, "share_connection": share_connection},
+        activate_delay_s=3600,
+    )
+    await process.start()
+    for index in range(proxies):
+        await process.create_uns_mqtt_proxy("127.0.0.1", f"instance-{index}")
+    await asyncio.sleep(0.2)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    result = {
+        "sockets": broker.sockets,
+        "mqtt_connections": broker.mqtt_connections,
+        "open_connections": broker.open_connections,
+        "heap_bytes": held,
+    }
+    await process.stop(drain=False)
+    await broker.stop()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proxies", type=int, default=20)
+    args = parser.parse_args()
+
+    for share_connection in (False, True):
+        result = asyncio.run(run(args.proxies, share_connection))
+        label = "shared" if share_connection else "separate"
+        print(
+            f"{label:<9} {args.proxies} proxies: {result['open_connections']:4d} open MQTT connections, "
+            f"{result['sockets']:4d} sockets accepted, {result['heap_bytes'] / 1024:9.1f} KiB heap"
+        )
+
+
+if __name__ == "__main__":
+    main()
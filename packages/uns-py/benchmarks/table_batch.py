@@ -0,0 +1,81 @@
+"""Benchmark: per-row UnsPacket.table() vs UnsPacket.table_batch() for wide tables.
+
+    python benchmarks/table_batch.py --rows 20000 --columns 40
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from uns_kit.core.packet import UnsPacket
+
+
+def build_frame(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    data: dict[str, object] = {
+        "ts": pd.date_range("2026-01-01", periods=rows, freq="s", tz="UTC"),
+    }
+    for index in range(columns):
+        if index % 4 == 3:
+            data[f"counter_{index}"] = rng.integers(0, 1_000_000, rows)
+        else:
+            data[f"value_{index}"] = rng.random(rows) * 1000
+    return pd.DataFrame(data)
+
+
+def per_row(frame: pd.DataFrame, column_types: dict[str, str]) -> list[bytes]:
+    payloads: list[bytes] = []
+    names = [name for name in frame.columns if name != "ts"]
+    for row in frame.itertuples(index=False):
+        values = row._asdict()
+        packet = UnsPacket.table(
+            time=values["ts"].to_pydatetime(),
+            data_group="shift-report",
+            columns={
+                name: {"type": column_types[name], "value": values[name], "uom": "kW"}
+                for name in names
+            },
+        )
+        payloads.append(UnsPacket.to_bytes(packet))
+    return payloads
+
+
+def batched(frame: pd.DataFrame, uoms: dict[str, str]) -> list[bytes]:
+    return list(
+        UnsPacket.table_batch(frame, time_column="ts", uoms=uoms, data_group="shift-report")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--columns", type=int, default=40)
+    args = parser.parse_args()
+
+    frame = build_frame(args.rows, args.columns)
+    column_types = {
+        name: "long" if name.startswith("counter_") else "double"
+        for name in frame.columns
+        if name != "ts"
+    }
+    uoms = {name: "kW" for name in column_types}
+
+    started = time.perf_counter()
+    row_payloads = per_row(frame, column_types)
+    row_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_payloads = batched(frame, uoms)
+    batch_seconds = time.perf_counter() - started
+
+    assert row_payloads == batch_payloads, "table_batch output differs from the per-row path"
+    print(f"{args.rows} rows x {args.columns} columns")
+    print(f"  per-row UnsPacket.table   {args.rows / row_seconds:10.0f} rows/s")
+    print(f"  UnsPacket.table_batch     {args.rows / batch_seconds:10.0f} rows/s")
+    print(f"  speedup                   {row_seconds / batch_seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
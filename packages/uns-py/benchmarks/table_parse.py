@@ -0,0 +1,66 @@
+"""Micro-benchmark: parsing a 40-column table packet with the column-shape cache.
+
+Runs ``UnsPacket.parse`` with the shape cache disabled and enabled and checks
+that both produce the same packet.
+
+    python benchmarks/table_parse.py --iterations 20000
+"""
+
+import argparse
+import timeit
+
+from uns_kit.core.packet import (
+    TABLE_SHAPE_CACHE_SIZE,
+    UnsPacket,
+    set_table_shape_cache_size,
+    table_shape_cache_clear,
+    table_shape_cache_info,
+)
+
+TIME = "2026-01-01T00:00:00.000Z"
+
+
+def build_payload(columns: int) -> str:
+    packet = UnsPacket.table(
+        time=TIME,
+        data_group="metering",
+        columns={
+            f"column_{index}": {
+                "type": "double" if index % 4 else "symbol",
+                "value": index * 1.25 if index % 4 else f"S{index}",
+                "uom": "kW" if index % 4 else None,
+            }
+            for index in range(columns)
+        },
+    )
+    return UnsPacket.to_json(packet)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--columns", type=int, default=40)
+    args = parser.parse_args()
+
+    payload = build_payload(args.columns)
+    results = {}
+    for label, maxsize in (("shape cache disabled", 0), ("shape cache enabled", TABLE_SHAPE_CACHE_SIZE)):
+        set_table_shape_cache_size(maxsize)
+        table_shape_cache_clear()
+        parsed = UnsPacket.parse(payload)
+        seconds = timeit.timeit(lambda: UnsPacket.parse(payload), number=args.iterations)
+        results[label] = (parsed, seconds)
+
+    (uncached, uncached_seconds), (cached, cached_seconds) = results.values()
+    assert cached == uncached, "cached parse differs from full validation"
+    info = table_shape_cache_info()
+
+    print(f"{args.columns}-column table packet ({len(payload)} bytes, {args.iterations} iterations)")
+    for label, (_, seconds) in results.items():
+        print(f"  {label:<22} {seconds / args.iterations * 1e6:8.2f} us/packet")
+    print(f"  speedup                {uncached_seconds / cached_seconds:8.1f}x")
+    print(f"  cache hits={info.hits} misses={info.misses}")
+
+
+if __name__ == "__main__":
+    main()
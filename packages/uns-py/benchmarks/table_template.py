@@ -0,0 +1,64 @@
+"""Micro-benchmark: encoding fixed-schema table rows with a TableTemplate.
+
+Compares ``UnsPacket.to_bytes(UnsPacket.table(...))`` with
+``TableTemplate.encode`` on a 40-column row, checks both produce identical
+bytes and reports time and traced allocations per row.
+
+    python benchmarks/table_template.py --iterations 20000
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from uns_kit.core.packet import TableColumnPayload, TableTemplate, UnsPacket
+
+TIME = "2026-01-01T00:00:00.000Z"
+
+
+def peak_allocated_bytes(func) -> int:
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--columns", type=int, default=40)
+    args = parser.parse_args()
+
+    definitions = [
+        TableColumnPayload(name=f"column_{index}", type="double", value=None, uom="kW")
+        for index in range(args.columns)
+    ]
+    template = TableTemplate(definitions, data_group="metering")
+    values = tuple(index * 1.25 for index in range(args.columns))
+
+    def per_row_table() -> bytes:
+        columns = {
+            definition.name: {"type": definition.type, "value": value, "uom": definition.uom}
+            for definition, value in zip(definitions, values)
+        }
+        return UnsPacket.to_bytes(UnsPacket.table(time=TIME, data_group="metering", columns=columns))
+
+    def template_row() -> bytes:
+        return template.encode(values, time=TIME)
+
+    assert per_row_table() == template_row(), "template output differs from UnsPacket.table"
+
+    print(f"{args.columns}-column table row ({len(template_row())} bytes, {args.iterations} iterations)")
+    results = {}
+    for label, func in (("UnsPacket.table + to_bytes", per_row_table), ("TableTemplate.encode", template_row)):
+        seconds = timeit.timeit(func, number=args.iterations)
+        results[label] = seconds
+        peak = peak_allocated_bytes(func)
+        print(f"  {label:<28} {seconds / args.iterations * 1e6:8.2f} us/row  peak {peak / 1024:7.1f} KiB")
+    per_row, templated = results.values()
+    print(f"  speedup                      {per_row / templated:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: PUBLISH bytes per message with and without MQTT 5 topic aliases.
+
+Publishes small numeric data packets, shaped like ``examples/load_test.py`` output,
+to ``--topics`` UNS topics of ~100 bytes through the in-process fake broker and
+reports the PUBLISH frame bytes the broker received per message.
+
+    python benchmarks/topic_alias.py --messages 20000 --topics 200
+"""
+
+import argparse
+import asyncio
+
+from _fake_broker import FakeBroker
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.packet import UnsPacket
+from uns_kit.core.topic_builder import TopicBuilder
+
+
+def build_topics(count: int) -> list[str]:
+    return [
+        f"enterprise/plant-ljubljana/assembly-area/line-{index % 8:02d}/"
+        f"press-{index:04d}/energy-meter/main-feeder/active-power/"
+        for index in range(count)
+    ]
+
+
+async def run(port: int, broker: FakeBroker, args: argparse.Namespace, *, mqtt5: bool, topic_aliases: bool) -> tuple[float, int]:
+    client = UnsMqttClient(
+        "127.0.0.1",
+        port=port,
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "bench"),
+        enable_status=False,
+        mqtt5=mqtt5,
+        topic_aliases=topic_aliases,
+    )
+    await client.connect()
+    topics = build_topics(args.topics)
+    published_before, bytes_before = broker.publishes, broker.publish_bytes
+    for index in range(args.messages):
+        packet = UnsPacket.data(value=index % 1000 / 10, uom="kW", time="2026-01-01T00:00:00.000Z")
+        await client.publish_raw(topics[index % len(topics)], UnsPacket.to_bytes(packet))
+    while broker.publishes - published_before < args.messages:
+        await asyncio.sleep(0.01)
+    stats = client.topic_alias_stats()
+    await client.close()
+    frames = broker.publishes - published_before
+    return (broker.publish_bytes - bytes_before) / frames, stats.evictions if stats else 0
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    broker = FakeBroker(topic_alias_maximum=args.alias_maximum)
+    port = await broker.start()
+    topic_length = len(build_topics(1)[0])
+    print(
+        f"{args.messages} data packets over {args.topics} topics ({topic_length}-byte topics), "
+        f"broker topic-alias-maximum={args.alias_maximum}"
+    )
+    cases = [
+        ("MQTT 3.1.1", False, False),
+        ("MQTT 5", True, False),
+        ("MQTT 5 + topic aliases", True, True),
+    ]
+    for label, mqtt5, topic_aliases in cases:
+        per_message, evictions = await run(port, broker, args, mqtt5=mqtt5, topic_aliases=topic_aliases)
+        suffix = f", {evictions} alias evictions" if topic_aliases else ""
+        print(f"  {label:<24} {per_message:7.1f} bytes/message{suffix}")
+    await broker.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--alias-maximum", type=int, default=1024)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
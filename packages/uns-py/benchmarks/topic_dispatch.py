@@ -0,0 +1,56 @@
+"""Micro-benchmark: routing one inbound topic against many subscription filters.
+
+Compares a linear scan with ``matches_topic_filter`` against ``TopicTrie.match``
+for a growing number of registered filters (exact, ``+`` and ``#`` mixed).
+
+    python benchmarks/topic_dispatch.py --iterations 2000
+"""
+
+import argparse
+import timeit
+
+from uns_kit.core.topic_dispatcher import TopicTrie
+from uns_kit.core.topic_matcher import matches_topic_filter
+
+
+def build_filters(count: int) -> list[str]:
+    filters = []
+    for index in range(count):
+        site, line, asset = index % 10, (index // 10) % 20, index
+        kind = index % 3
+        if kind == 0:
+            filters.append(f"enterprise/site-{site}/line-{line}/asset-{asset}/temperature")
+        elif kind == 1:
+            filters.append(f"enterprise/site-{site}/line-{line}/asset-{asset}/+")
+        else:
+            filters.append(f"enterprise/site-{site}/line-{line}/asset-{asset}/#")
+    return filters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    topic = "enterprise/site-3/line-4/asset-43/temperature"
+    for count in (10, 100, 1_000, 10_000):
+        filters = build_filters(count)
+        trie: TopicTrie[str] = TopicTrie()
+        for topic_filter in filters:
+            trie.add(topic_filter, topic_filter)
+        linear = [topic_filter for topic_filter in filters if matches_topic_filter(topic_filter, topic)]
+        assert sorted(trie.match(topic)) == sorted(linear)
+
+        linear_s = timeit.timeit(
+            lambda: [topic_filter for topic_filter in filters if matches_topic_filter(topic_filter, topic)],
+            number=args.iterations,
+        )
+        trie_s = timeit.timeit(lambda: trie.match(topic), number=args.iterations)
+        print(
+            f"{count:6d} filters: linear {linear_s / args.iterations * 1e6:10.2f} us/message, "
+            f"trie {trie_s / args.iterations * 1e6:6.2f} us/message"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: proxy state growth when publishing to dynamically named objects.
+
+Publishes one data attribute for each of ``--objects`` distinct object ids (batch or coil
+ids that are never reused), with the socket write replaced by a no-op. It reports the
+traced memory held by the proxy afterwards, the reported ``state_stats()`` and the time per
+publish, without bounds and with ``state_max_entries=--max-entries``.
+
+    python benchmarks/topic_state.py --objects 200000 --max-entries 10000
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+
+async def run(objects: int, max_entries: int | None) -> None:
+    tracemalloc.start()
+    proxy = UnsMqttProxy(
+        "127.0.0.1",
+        process_name="bench",
+        instance_name="bench",
+        state_max_entries=max_entries,
+        registry_debounce=3600,
+    )
+
+    async def publish_raw(topic: str, payload: str | bytes, **kwargs: object) -> None:
+        return None
+
+    proxy.client.publish_raw = publish_raw  # type: ignore[method-assign]
+    # The produced-topic registry grows by design; only the per-topic publish state is measured.
+    proxy._produced_topics = {}
+    proxy.register_unique_topic = lambda topic_object: asyncio.sleep(0)  # type: ignore[method-assign]
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for index in range(objects):
+        await proxy.publish_mqtt_message(
+            {
+                "topic": "enterprise/site/area/line/",
+                "asset": "mill",
+                "objectType": "coil",
+                "objectId": f"coil-{index:08d}",
+                "attributes": {"attribute": "weight", "data": {"value": index * 0.5, "uom": "t"}},
+            }
+        )
+        if index % 1000 == 999:
+            await proxy.flush()
+    await proxy.flush()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    stats = proxy.state_stats()
+    await proxy._stop_publish_workers()
+    label = "unbounded" if max_entries is None else f"max {max_entries}"
+    print(
+        f"{label:<12} {objects} objects: held {held / 1e6:7.1f} MB, state {stats.entries:7d} entries "
+        f"~{stats.approx_bytes / 1e6:6.1f} MB, evicted {stats.evicted:7d}, {elapsed / objects * 1e6:5.1f} us/publish"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await run(args.objects, None)
+    await run(args.objects, args.max_entries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=200_000)
+    parser.add_argument("--max-entries", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
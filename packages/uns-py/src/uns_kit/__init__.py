@@ -33,6 +33,7 @@ from .core import (
     State,
     StatusMonitor,
     TablePayload,
+    TableTemplate,
     TopicBuilder,
     UnsClient,
     UnsMqttClient,
@@ -111,6 +112,7 @@ __all__ = [
     "UnsPacket",
     "DataPayload",
     "TablePayload",
+    "TableTemplate",
     "TopicBuilder",
     "UnsMqttClient",
     "StatusMonitor",
@@ -620,7 +620,7 @@ class UnsApiProxy(UnsProxy):
                         "statusTopic": f"{self.topic_builder.process_status_topic}{suffix}",
                     },
                 )
-                await self._client.publish_raw(f"{self.topic_builder.process_status_topic}{suffix}", UnsPacket.to_json(packet))
+                await self._client.publish_raw(f"{self.topic_builder.process_status_topic}{suffix}", UnsPacket.to_bytes(packet))
                 await self.event.emit(
                     "mqttProxyStatus",
                     {
@@ -630,7 +630,7 @@ class UnsApiProxy(UnsProxy):
                         "statusTopic": f"{self.instance_status_topic}{suffix}",
                     },
                 )
-                await self._client.publish_raw(f"{self.instance_status_topic}{suffix}", UnsPacket.to_json(packet))
+                await self._client.publish_raw(f"{self.instance_status_topic}{suffix}", UnsPacket.to_bytes(packet))
             await self._emit_data_catalog_offers()
             await asyncio.sleep(10)
 
@@ -15,8 +15,16 @@ __all__ = [
     "host_value_schema",
     "secret_value_schema",
     "UnsPacket",
+    "PacketEncoder",
+    "ParsedPacket",
+    "PacketCodec",
+    "get_packet_codec",
+    "detect_packet_codec",
+    "table_shape_cache_info",
+    "table_shape_cache_clear",
     "DataPayload",
     "TablePayload",
+    "TableTemplate",
     "isoformat",
     "RUNTIME_METADATA",
     "SecretResolverOptions",
@@ -24,6 +32,15 @@ __all__ = [
     "HostResolverOptions",
     "resolve_infisical_config",
     "UnsMqttClient",
+    "ConnectionStats",
+    "InboundBuffer",
+    "InboundBufferStats",
+    "PublishOutbox",
+    "OutboxStats",
+    "PublishLaneStats",
+    "ReportByException",
+    "ReportByExceptionStats",
+    "TopicStateStats",
     "StatusMonitor",
     "UnsMqttProxy",
     "MessageMode",
@@ -52,6 +69,9 @@ __all__ = [
     "EventEmitter",
     "TopicBuilder",
     "matches_topic_filter",
+    "TopicDispatcher",
+    "TopicSubscription",
+    "TopicTrie",
     "build_uns_identity_path",
     "build_uns_route_path",
     "configure_logger",
@@ -72,8 +92,16 @@ _LAZY_EXPORTS: dict[str, tuple[str, str]] = {
     "host_value_schema": ("uns_kit.core.config_schema", "host_value_schema"),
     "secret_value_schema": ("uns_kit.core.config_schema", "secret_value_schema"),
     "UnsPacket": ("uns_kit.core.packet", "UnsPacket"),
+    "PacketEncoder": ("uns_kit.core.packet", "PacketEncoder"),
+    "ParsedPacket": ("uns_kit.core.packet", "ParsedPacket"),
+    "PacketCodec": ("uns_kit.core.packet", "PacketCodec"),
+    "get_packet_codec": ("uns_kit.core.packet", "get_packet_codec"),
+    "detect_packet_codec": ("uns_kit.core.packet", "detect_packet_codec"),
+    "table_shape_cache_info": ("uns_kit.core.packet", "table_shape_cache_info"),
+    "table_shape_cache_clear": ("uns_kit.core.packet", "table_shape_cache_clear"),
     "DataPayload": ("uns_kit.core.packet", "DataPayload"),
     "TablePayload": ("uns_kit.core.packet", "TablePayload"),
+    "TableTemplate": ("uns_kit.core.packet", "TableTemplate"),
     "isoformat": ("uns_kit.core.packet", "isoformat"),
     "RUNTIME_METADATA": ("uns_kit.core.runtime_metadata", "RUNTIME_METADATA"),
     "SecretResolverOptions": ("uns_kit.core.secret_resolver", "SecretResolverOptions"),
@@ -81,6 +109,15 @@ _LAZY_EXPORTS: dict[str, tuple[str, str]] = {
     "HostResolverOptions": ("uns_kit.core.secret_resolver", "HostResolverOptions"),
     "resolve_infisical_config": ("uns_kit.core.secret_resolver", "resolve_infisical_config"),
     "UnsMqttClient": ("uns_kit.core.client", "UnsMqttClient"),
+    "ConnectionStats": ("uns_kit.core.client", "ConnectionStats"),
+    "InboundBuffer": ("uns_kit.core.inbound_buffer", "InboundBuffer"),
+    "InboundBufferStats": ("uns_kit.core.inbound_buffer", "InboundBufferStats"),
+    "PublishOutbox": ("uns_kit.core.outbox", "PublishOutbox"),
+    "OutboxStats": ("uns_kit.core.outbox", "OutboxStats"),
+    "PublishLaneStats": ("uns_kit.core.publish_lanes", "PublishLaneStats"),
+    "ReportByException": ("uns_kit.core.report_by_exception", "ReportByException"),
+    "ReportByExceptionStats": ("uns_kit.core.report_by_exception", "ReportByExceptionStats"),
+    "TopicStateStats": ("uns_kit.core.topic_state", "TopicStateStats"),
     "StatusMonitor": ("uns_kit.core.status_monitor", "StatusMonitor"),
     "UnsMqttProxy": ("uns_kit.core.uns_mqtt_proxy", "UnsMqttProxy"),
     "MessageMode": ("uns_kit.core.uns_mqtt_proxy", "MessageMode"),
@@ -109,6 +146,9 @@ _LAZY_EXPORTS: dict[str, tuple[str, str]] = {
     "EventEmitter": ("uns_kit.core.events", "EventEmitter"),
     "TopicBuilder": ("uns_kit.core.topic_builder", "TopicBuilder"),
     "matches_topic_filter": ("uns_kit.core.topic_matcher", "matches_topic_filter"),
+    "TopicDispatcher": ("uns_kit.core.topic_dispatcher", "TopicDispatcher"),
+    "TopicSubscription": ("uns_kit.core.topic_dispatcher", "TopicSubscription"),
+    "TopicTrie": ("uns_kit.core.topic_dispatcher", "TopicTrie"),
     "build_uns_identity_path": ("uns_kit.core.uns_path", "build_uns_identity_path"),
     "build_uns_route_path": ("uns_kit.core.uns_path", "build_uns_route_path"),
     "configure_logger": ("uns_kit.core.logger", "configure_logger"),
@@ -3,17 +3,80 @@ from __future__ import annotations
 import asyncio
 import contextlib
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
-import socket
-from typing import AsyncIterator, List, Optional
+import random
+import time as time_module
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 import uuid
 
 import aiomqtt
+from paho.mqtt.client import MQTT_CLEAN_START_FIRST_ONLY
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
-from .packet import UnsPacket
+from .inbound_buffer import DEFAULT_INBOUND_MAX_SIZE, InboundBuffer, InboundMetrics, InboundPolicy, validate_inbound_settings
+from .logger import get_logger
+from .packet import PacketCodecName, UnsPacket, get_packet_codec
+from .payload_compression import (
+    CONTENT_ENCODING_PROPERTY,
+    DEFAULT_COMPRESSION_THRESHOLD,
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
+    PayloadCompression,
+    PayloadCompressor,
+    decompress_payload,
+)
+from .publish_lanes import DEFAULT_CONTROL_RESERVE, PublishLanes, PublishLaneStats, publish_priority
+from .topic_alias import TopicAliasStats, TopicAliasTable
 from .topic_builder import TopicBuilder
+from .topic_dispatcher import TopicDispatcher
 
 MqttError = aiomqtt.MqttError
+logger = get_logger(__name__)
+
+DEFAULT_MAX_INFLIGHT = 64
+DEFAULT_MQTT_PORT = 1883
+DEFAULT_CONNECT_TIMEOUT = 2.0
+
+# Returns {metric-name: (value, uom)}; published under the status topic by the stats loop.
+StatsSource = Callable[[], Mapping[str, Tuple[float, Optional[str]]]]
+
+
+def parse_brokers(host: str | Sequence[str], port: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    Normalize a broker list to (host, port) pairs.
+
+    Accepts one host, a comma-separated string or a sequence of entries, each `host`,
+    `host:port` or `[ipv6]:port`; `port` (default 1883) applies to entries without one.
+    """
+    entries = [part.strip() for part in host.split(",")] if isinstance(host, str) else [str(part).strip() for part in host]
+    default_port = port if port is not None else DEFAULT_MQTT_PORT
+    brokers: List[Tuple[str, int]] = []
+    for entry in entries:
+        if not entry:
+            continue
+        name, entry_port = entry, default_port
+        if entry.startswith("["):
+            name, _, rest = entry[1:].partition("]")
+            if rest.startswith(":"):
+                entry_port = int(rest[1:])
+        elif entry.count(":") == 1:
+            name, _, port_text = entry.partition(":")
+            entry_port = int(port_text)
+        brokers.append((name, entry_port))
+    if not brokers:
+        raise ValueError("At least one MQTT broker host is required.")
+    return brokers
+
+
+@dataclass
+class ConnectionStats:
+    broker: Optional[str]
+    connects: int
+    failed_attempts: int
+    last_connect_latency_s: Optional[float]
+    last_outage_s: Optional[float]
+    total_outage_s: float
 
 
 class UnsMqttClient:
@@ -22,7 +85,7 @@ class UnsMqttClient:
 
     def __init__(
         self,
-        host: str,
+        host: str | Sequence[str],
         *,
         topic_builder: TopicBuilder,
         port: Optional[int] = None,
@@ -39,9 +102,28 @@ class UnsMqttClient:
         subscriber_active: Optional[bool] = None,
         stats_interval: float = 60.0,
         enable_status: bool = True,
+        mqtt5: bool = False,
+        packet_codec: PacketCodecName = "json",
+        compression: Optional[PayloadCompression] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        decompress_messages: bool = True,
+        sniff_compression: bool = False,
+        max_decompressed_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE,
+        shared_connection: Optional["UnsMqttClient"] = None,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        topic_aliases: bool = False,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        inbound_max_size: Optional[int] = DEFAULT_INBOUND_MAX_SIZE,
+        inbound_policy: InboundPolicy = "block",
+        control_reserve: int = DEFAULT_CONTROL_RESERVE,
     ):
-        self.host = host
-        self.port = port
+        # Brokers are tried in order on every connect attempt; `host`/`port` track the current one.
+        self.brokers = parse_brokers(host, port)
+        self.host, self.port = self.brokers[0]
+        self.connect_timeout = connect_timeout
+        validate_inbound_settings(inbound_max_size, inbound_policy)
+        self.inbound_max_size = inbound_max_size
+        self.inbound_policy = inbound_policy
         self.username = username if username not in ("", None) else None
         self.password = password if password not in ("", None) else None
         if client_id:
@@ -62,7 +144,38 @@ class UnsMqttClient:
         self.subscriber_active = subscriber_active
         self.stats_interval = stats_interval
         self.enable_status = enable_status
+        # With a shared connection this client is a channel over the owner's aiomqtt.Client:
+        # it keeps its own status topics, loops and counters but opens no socket of its own.
+        self.shared_connection = shared_connection
+        self.mqtt5 = shared_connection.mqtt5 if shared_connection is not None else mqtt5
+        self.packet_codec = get_packet_codec(packet_codec)
+        if compression is not None and not self.mqtt5:
+            # MQTT 3.1.1 has no property to mark the payload as compressed; receivers would get raw zlib/zstd bytes.
+            raise ValueError("Payload compression requires an MQTT 5 connection (mqtt5=True).")
+        self._compressor = (
+            PayloadCompressor(compression, threshold=compression_threshold) if compression is not None else None
+        )
+        self.decompress_messages = decompress_messages
+        # Guessing compression from magic bytes would rewrite third-party payloads that happen to match.
+        self.sniff_compression = sniff_compression
+        self.max_decompressed_size = max_decompressed_size
         self._client: Optional[aiomqtt.Client] = None
+        self._dispatcher: Optional[TopicDispatcher] = None
+        # QoS 1/2 publish pipeline: at most `inflight_window` unacknowledged publishes.
+        self.max_inflight = max(1, max_inflight)
+        self._inflight_window = self.max_inflight
+        # This client's pipelined publishes (for flush()); the window is counted and waited on
+        # by the connection owner, so channels sharing a connection share one window.
+        self._inflight_publishes: set[asyncio.Future[None]] = set()
+        self._connection_inflight = 0
+        self._inflight_released = asyncio.Event()
+        # Every publish takes a slot of the in-flight window; infra publishes (uns-infra/...) have
+        # `control_reserve` extra slots data cannot take and are admitted first.
+        self._publish_lanes = PublishLanes(self.max_inflight, control_reserve)
+        self._connack_properties: Optional[Properties] = None
+        # MQTT 5 only: QoS 0 publishes replace hot topics with aliases (see TopicAliasTable).
+        self.topic_aliases = topic_aliases
+        self._topic_alias_table: Optional[TopicAliasTable] = None
         self._status_task: Optional[asyncio.Task] = None
         self._stats_task: Optional[asyncio.Task] = None
         self._connected = asyncio.Event()
@@ -72,6 +185,19 @@ class UnsMqttClient:
         self._published_message_bytes = 0
         self._subscribed_message_count = 0
         self._subscribed_message_bytes = 0
+        self._stats_sources: List[StatsSource] = []
+        self._connects = 0
+        self._failed_connect_attempts = 0
+        self._last_connect_latency_s: Optional[float] = None
+        self._last_outage_s: Optional[float] = None
+        self._total_outage_s = 0.0
+        self._connection_epoch = 0
+        self._connection_lost_at: Optional[float] = None
+        self._stats_sources.append(self._connection_metrics)
+        self._inbound_metrics = InboundMetrics()
+        if shared_connection is None:
+            self._stats_sources.append(self._inbound_metrics.collect)
+            self._stats_sources.append(self._publish_lanes.collect)
 
         if self.instance_name:
             self.status_topic = self.topic_builder.instance_status_topic(self.instance_name)
@@ -103,7 +229,23 @@ class UnsMqttClient:
         UnsMqttClient._exception_handler_loop_id = loop_id
 
     async def _connect_once(self) -> None:
-        await self._probe_socket()
+        if self.shared_connection is not None:
+            await self._attach_shared_connection()
+            return
+        # Fail over within one attempt: the next broker is tried as soon as one is refused.
+        last_error: Optional[aiomqtt.MqttError] = None
+        for host, port in self.brokers:
+            try:
+                await self._connect_broker(host, port)
+                return
+            except aiomqtt.MqttError as exc:
+                self._failed_connect_attempts += 1
+                logger.debug("MQTT broker %s:%s unavailable: %s", host, port, exc)
+                last_error = exc
+        assert last_error is not None
+        raise last_error
+
+    async def _connect_broker(self, host: str, port: int) -> None:
         will = aiomqtt.Will(
             topic=f"{self.status_topic}alive",
             payload=b"",
@@ -122,8 +264,8 @@ class UnsMqttClient:
 
         # aiomqtt supports async connect/disconnect directly.
         kwargs = {
-            "hostname": self.host,
-            "port": self.port,
+            "hostname": host,
+            "port": port,
             "username": self.username,
             "password": self.password,
             # aiomqtt uses `identifier` for MQTT clientId.
@@ -133,29 +275,117 @@ class UnsMqttClient:
         }
         if tls_context is not None:
             kwargs["tls_context"] = tls_context
-        # aiomqtt v2.x supports clean_session; keep a fallback for API changes.
-        kwargs["clean_session"] = self.clean_session
-        try:
-            client = aiomqtt.Client(**kwargs)
-        except TypeError:
-            kwargs.pop("clean_session", None)
+        kwargs["max_inflight_messages"] = self.max_inflight
+        # aiomqtt's incoming queue stays unbounded: when full it discards messages without telling
+        # anyone, so the inbound buffers (which count their drops) are the only limit.
+        if self.mqtt5:
+            # MQTT 5 replaces clean session with clean start.
+            kwargs["protocol"] = aiomqtt.ProtocolVersion.V5
+            kwargs["clean_start"] = MQTT_CLEAN_START_FIRST_ONLY if self.clean_session else False
             client = aiomqtt.Client(**kwargs)
+        else:
+            # aiomqtt v2.x supports clean_session; keep a fallback for API changes.
+            kwargs["clean_session"] = self.clean_session
+            try:
+                client = aiomqtt.Client(**kwargs)
+            except TypeError:
+                kwargs.pop("clean_session", None)
+                client = aiomqtt.Client(**kwargs)
+        paho_client = getattr(client, "_client", None)
+        if paho_client is not None:
+            # Bounds the TCP connect (paho otherwise waits up to `keepalive`), which replaces
+            # the separate probe socket this client used to open first.
+            paho_client.connect_timeout = self.connect_timeout
+        self._capture_connack_properties(client)
+        self._watch_connection_lost(client)
 
         # aiomqtt does not expose connect()/disconnect() methods; the client is
         # an async context manager.
         await client.__aenter__()
         self._client = client
+        self.host, self.port = host, port
+        self._apply_receive_maximum()
+        # Aliases are per connection: the broker forgets them on disconnect.
+        topic_alias_maximum = getattr(self._connack_properties, "TopicAliasMaximum", 0) if self.mqtt5 else 0
+        self._topic_alias_table = TopicAliasTable(topic_alias_maximum or 0)
         self._connected.set()
 
-    async def _probe_socket(self) -> None:
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: socket.create_connection((self.host, self.port or 1883), timeout=2),
-            )
-        except Exception as exc:
-            raise aiomqtt.MqttError(f"Cannot reach MQTT broker at {self.host}:{self.port or 1883}") from exc
+    def _capture_connack_properties(self, client: aiomqtt.Client) -> None:
+        # aiomqtt drops the CONNACK properties; wrap its paho on_connect callback to keep them.
+        self._connack_properties = None
+        paho_client = getattr(client, "_client", None)
+        on_connect = getattr(paho_client, "on_connect", None)
+        if on_connect is None:
+            return
+
+        def capture(*args: Any) -> None:
+            if len(args) >= 5:
+                self._connack_properties = args[4]
+            on_connect(*args)
+
+        paho_client.on_connect = capture
+
+    def _watch_connection_lost(self, client: aiomqtt.Client) -> None:
+        # aiomqtt leaves publishes that paho had queued waiting for its 10 s timeout after the
+        # socket drops; notice the loss right away so the next publish fails over.
+        paho_client = getattr(client, "_client", None)
+        on_disconnect = getattr(paho_client, "on_disconnect", None)
+        if on_disconnect is None:
+            return
+
+        def watch(*args: Any) -> None:
+            try:
+                on_disconnect(*args)
+            finally:
+                self._handle_connection_lost(client)
+
+        paho_client.on_disconnect = watch
+
+    def _handle_connection_lost(self, client: aiomqtt.Client) -> None:
+        if client is not self._client:
+            return
+        self._connected.clear()
+        self._connection_epoch += 1
+        self._connection_lost_at = time_module.monotonic()
+        # Wake the stranded publishes; publish_raw re-sends them on the next connection.
+        for confirmation in list(getattr(client, "_pending_publishes", {}).values()):
+            confirmation.set()
+
+    def _apply_receive_maximum(self) -> None:
+        receive_maximum = getattr(self._connack_properties, "ReceiveMaximum", None)
+        window = self.max_inflight
+        if isinstance(receive_maximum, int) and receive_maximum > 0:
+            window = min(window, receive_maximum)
+        # paho keeps its own window at `max_inflight` (it cannot change on a live connection);
+        # the pipeline never exceeds the smaller broker limit.
+        self._inflight_window = window
+        self._inflight_released.set()
+        self._publish_lanes.set_data_capacity(window)
+
+    async def _attach_shared_connection(self) -> None:
+        owner = self.shared_connection
+        assert owner is not None
+        if self._client is not None and owner._client is self._client:
+            # The shared connection failed under this channel; let the owner reconnect it.
+            owner._connected.clear()
+        await owner._ensure_connected()
+        if owner._closing or owner._client is None:
+            raise aiomqtt.MqttError("Shared MQTT connection is closed")
+        self._client = owner._client
+        self._connected.set()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    @property
+    def connection_epoch(self) -> int:
+        """Number of connections lost so far (of the owner for channel clients); changes on every disconnect."""
+        return (self.shared_connection or self)._connection_epoch
+
+    async def wait_connected(self) -> None:
+        """Return once connected, (re)connecting first or joining the reconnect in progress."""
+        await self._ensure_connected()
 
     async def _ensure_connected(self) -> None:
         if self._connected.is_set():
@@ -164,10 +394,20 @@ class UnsMqttClient:
             if self._connected.is_set():
                 return
             self._install_exception_handler()
-            backoff = self.reconnect_interval
+            # The outage runs from the moment a live connection dropped (or reconnecting began).
+            outage_started = self._connection_lost_at or time_module.monotonic()
+            attempt = 0
             while not self._closing:
+                attempt_started = time_module.monotonic()
                 try:
                     await self._connect_once()
+                    connected_at = time_module.monotonic()
+                    self._connection_lost_at = None
+                    self._connects += 1
+                    self._last_connect_latency_s = connected_at - attempt_started
+                    if self._connects > 1:
+                        self._last_outage_s = connected_at - outage_started
+                        self._total_outage_s += self._last_outage_s
                     if self.enable_status:
                         if not self._status_task or self._status_task.done():
                             self._status_task = asyncio.create_task(self._publish_status_loop())
@@ -177,8 +417,9 @@ class UnsMqttClient:
                             self._stats_task.add_done_callback(self._handle_task_error)
                     return
                 except aiomqtt.MqttError:
-                    await asyncio.sleep(backoff)
-                    backoff = min(backoff * 2, self.max_reconnect_interval)
+                    # Full jitter keeps a fleet of clients from reconnecting in lockstep.
+                    await asyncio.sleep(random.uniform(0, min(self.max_reconnect_interval, self.reconnect_interval * 2**attempt)))
+                    attempt += 1
 
     def _handle_task_error(self, task: asyncio.Task) -> None:
         try:
@@ -188,6 +429,30 @@ class UnsMqttClient:
         except Exception:
             self._connected.clear()
 
+    def connection_stats(self) -> ConnectionStats:
+        """Connect latency and outage durations; an outage lasts from losing the connection until reconnected."""
+        return ConnectionStats(
+            broker=f"{self.host}:{self.port}" if self._connects else None,
+            connects=self._connects,
+            failed_attempts=self._failed_connect_attempts,
+            last_connect_latency_s=self._last_connect_latency_s,
+            last_outage_s=self._last_outage_s,
+            total_outage_s=self._total_outage_s,
+        )
+
+    def _connection_metrics(self) -> Dict[str, Tuple[float, Optional[str]]]:
+        if self.shared_connection is not None or self._last_connect_latency_s is None:
+            return {}
+        return {
+            "connect-latency": (round(self._last_connect_latency_s * 1000, 1), "ms"),
+            "reconnect-count": (max(0, self._connects - 1), None),
+            "outage-duration": (round(self._total_outage_s, 3), "s"),
+        }
+
+    def add_stats_source(self, source: StatsSource) -> None:
+        """Publish extra metrics with the periodic message counters."""
+        self._stats_sources.append(source)
+
     async def connect(self) -> None:
         await self._ensure_connected()
 
@@ -201,76 +466,265 @@ class UnsMqttClient:
             self._stats_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._stats_task
-        if self._client:
+        if self._dispatcher is not None:
+            await self._dispatcher.close()
+        if self._client and self.shared_connection is None:
             with contextlib.suppress(Exception):
                 await self._client.__aexit__(None, None, None)
         self._connected.clear()
 
-    async def publish_raw(self, topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+    @property
+    def packet_content_type(self) -> Optional[str]:
+        """MQTT 5 content-type sent with packets, or None for the default JSON codec / MQTT 3.1.1."""
+        if not self.mqtt5 or self.packet_codec.name == "json":
+            return None
+        return self.packet_codec.content_type
+
+    def encode_packet(self, packet: dict) -> bytes:
+        return self.packet_codec.encode(packet)
+
+    async def publish_raw(
+        self,
+        topic: str,
+        payload: str | bytes,
+        *,
+        qos: int = 0,
+        retain: bool = False,
+        content_type: Optional[str] = None,
+    ) -> None:
         await self._ensure_connected()
+        payload_bytes = payload.encode() if isinstance(payload, str) else payload
+        content_encoding = None
+        if self._compressor is not None:
+            compressed = self._compressor.compress(payload_bytes)
+            if compressed is not None:
+                payload_bytes = compressed
+                content_encoding = self._compressor.algorithm
+        properties = self._publish_properties(content_type, content_encoding)
+        owner = self.shared_connection or self
+        lanes = owner._publish_lanes
+        priority = publish_priority(topic)
         for attempt in range(2):
+            if attempt:
+                # Reconnect without holding a lane slot, so publishes waiting out an outage don't take them all.
+                await self._ensure_connected()
+            started = time_module.monotonic()
+            if not lanes.try_acquire(priority):
+                await lanes.acquire(priority)
             try:
+                if not attempt:
+                    # Head-of-line delay: time spent waiting for a lane slot, not the write or the ack.
+                    lanes.record_delay(priority, time_module.monotonic() - started)
                 assert self._client
-                payload_bytes = payload.encode() if isinstance(payload, str) else payload
-                self._published_message_count += 1
-                self._published_message_bytes += len(payload_bytes)
-                await self._client.publish(topic, payload_bytes, qos=qos, retain=retain)
-                return
+                wire_topic, wire_properties = topic, properties
+                if qos == 0 and self.topic_aliases:
+                    # QoS 1/2 publishes may be held back in paho's in-flight queue, so an
+                    # alias-only frame could overtake the one binding the alias; keep them unaliased.
+                    alias_table = self._alias_table
+                    if alias_table is not None:
+                        wire_topic, alias = alias_table.resolve(topic)
+                        if alias is not None:
+                            wire_properties = self._publish_properties(content_type, content_encoding, alias)
+                epoch = owner._connection_epoch
+                await self._client.publish(wire_topic, payload_bytes, qos=qos, retain=retain, properties=wire_properties)
+                if owner._connection_epoch != epoch:
+                    # Woken by the disconnect: a QoS 0 frame may still have been in paho's socket buffer.
+                    raise aiomqtt.MqttError("Connection lost before the publish was confirmed")
             except aiomqtt.MqttError:
                 self._connected.clear()
-                if attempt == 0:
-                    await self._ensure_connected()
-                else:
+                if attempt:
                     raise
+                continue
+            finally:
+                lanes.release(priority)
+            self._published_message_count += 1
+            self._published_message_bytes += len(payload_bytes)
+            return
 
-    async def publish_packet(self, topic: str, packet: dict, *, qos: int = 0, retain: bool = False) -> None:
-        payload = UnsPacket.to_json(packet)
-        await self.publish_raw(topic, payload, qos=qos, retain=retain)
+    @property
+    def inflight_window(self) -> int:
+        """Unacknowledged QoS 1/2 publishes allowed: `max_inflight`, capped by the broker's receive-maximum."""
+        if self.shared_connection is not None:
+            return self.shared_connection.inflight_window
+        return self._inflight_window
 
-    @asynccontextmanager
-    async def messages(self, topics: str | List[str]) -> AsyncIterator[AsyncIterator[aiomqtt.Message]]:
-        await self._ensure_connected()
-        assert self._client
-        # aiomqtt exposes a single async iterator at `client.messages` (not a context manager).
-        # Messages yielded are already filtered by the active subscriptions.
-        messages = self._client.messages
+    def publish_lane_stats(self) -> Dict[str, PublishLaneStats]:
+        """Slots, waiting publishes and head-of-line delays of the control and data publish lanes."""
+        return (self.shared_connection or self)._publish_lanes.stats()
+
+    @property
+    def inflight_count(self) -> int:
+        """Pipelined publishes of this client awaiting their ack (the window spans the whole connection)."""
+        return len(self._inflight_publishes)
+
+    async def publish_pipelined(
+        self,
+        topic: str,
+        payload: str | bytes,
+        *,
+        qos: int = 1,
+        retain: bool = False,
+        content_type: Optional[str] = None,
+    ) -> asyncio.Future[None]:
+        """
+        Send a publish without waiting for the broker acknowledgement.
+
+        Waits only for a free slot in the in-flight window and returns a future that resolves
+        on PUBACK (QoS 1) / PUBCOMP (QoS 2), or fails with the publish error. Throughput is then
+        bounded by the window size instead of one round trip per message.
+        """
+        owner = self.shared_connection or self
+        while owner._connection_inflight >= owner._inflight_window:
+            owner._inflight_released.clear()
+            await owner._inflight_released.wait()
+        future = asyncio.ensure_future(
+            self.publish_raw(topic, payload, qos=qos, retain=retain, content_type=content_type)
+        )
+        owner._connection_inflight += 1
+        self._inflight_publishes.add(future)
+        future.add_done_callback(self._release_inflight_publish)
+        return future
 
+    def _release_inflight_publish(self, future: asyncio.Future[None]) -> None:
+        owner = self.shared_connection or self
+        self._inflight_publishes.discard(future)
+        owner._connection_inflight -= 1
+        owner._inflight_released.set()
+        if not future.cancelled():
+            # Failures are reported through the returned future; keep unobserved ones quiet.
+            future.exception()
+
+    async def flush(self, *, timeout: Optional[float] = None) -> None:
+        """Wait until every pipelined publish has been acknowledged (or failed)."""
+        deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+        while self._inflight_publishes:
+            remaining = None if deadline is None else deadline - asyncio.get_running_loop().time()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("Timed out waiting for in-flight MQTT publishes to be acknowledged.")
+            await asyncio.wait(set(self._inflight_publishes), timeout=remaining)
+
+    @property
+    def _alias_table(self) -> Optional[TopicAliasTable]:
+        if self.shared_connection is not None:
+            return self.shared_connection._topic_alias_table
+        return self._topic_alias_table
+
+    def topic_alias_stats(self) -> Optional[TopicAliasStats]:
+        """Alias table state of the current connection, or None before the first connect."""
+        table = self._alias_table
+        return table.stats() if table is not None else None
+
+    def _publish_properties(
+        self,
+        content_type: Optional[str],
+        content_encoding: Optional[str],
+        topic_alias: Optional[int] = None,
+    ) -> Optional[Properties]:
+        if not self.mqtt5 or (content_type is None and content_encoding is None and topic_alias is None):
+            return None
+        properties = Properties(PacketTypes.PUBLISH)
+        if topic_alias is not None:
+            properties.TopicAlias = topic_alias
+        if content_type is not None:
+            properties.ContentType = content_type
+        if content_encoding is not None:
+            # Payload format 0: unspecified bytes, the broker must not treat it as UTF-8.
+            properties.PayloadFormatIndicator = 0
+            properties.UserProperty = [(CONTENT_ENCODING_PROPERTY, content_encoding)]
+        return properties
+
+    def _decompress_message(self, msg: aiomqtt.Message) -> None:
+        payload = msg.payload
+        if not isinstance(payload, (bytes, bytearray)) or not payload:
+            return
+        content_encoding = None
+        for key, value in getattr(msg.properties, "UserProperty", None) or ():
+            if key == CONTENT_ENCODING_PROPERTY:
+                content_encoding = value
         try:
-            if isinstance(topics, str):
-                await self._client.subscribe(topics)
-            else:
-                for t in topics:
-                    await self._client.subscribe(t)
+            msg.payload = decompress_payload(
+                bytes(payload), content_encoding, sniff=self.sniff_compression, max_size=self.max_decompressed_size
+            )
+        except Exception as exc:
+            logger.warning("Could not decompress %s payload on %s: %s", content_encoding, msg.topic, exc)
 
-            async def wrapped() -> AsyncIterator[aiomqtt.Message]:
-                try:
-                    async for msg in messages:
-                        self._subscribed_message_count += 1
-                        self._subscribed_message_bytes += len(msg.payload or b"")
-                        yield msg
-                except aiomqtt.MqttError:
-                    self._connected.clear()
-                    return
-                except asyncio.CancelledError:
-                    return
+    async def publish_packet(self, topic: str, packet: dict, *, qos: int = 0, retain: bool = False) -> None:
+        payload = self.encode_packet(packet)
+        await self.publish_raw(topic, payload, qos=qos, retain=retain, content_type=self.packet_content_type)
 
-            yield wrapped()
+    @property
+    def dispatcher(self) -> TopicDispatcher:
+        """Topic dispatcher of the underlying connection (shared with the owner for channel clients)."""
+        if self.shared_connection is not None:
+            return self.shared_connection.dispatcher
+        if self._dispatcher is None:
+            self._dispatcher = TopicDispatcher(self)
+        return self._dispatcher
+
+    def _prepare_message(self, msg: aiomqtt.Message) -> None:
+        if self.decompress_messages:
+            self._decompress_message(msg)
+
+    def _new_inbound_buffer(self, max_size: Optional[int] = None, policy: Optional[InboundPolicy] = None) -> InboundBuffer:
+        # Buffers report to the connection owner, which publishes the inbound-* stats.
+        owner = self.shared_connection or self
+        return InboundBuffer(
+            max_size if max_size is not None else self.inbound_max_size,
+            policy or self.inbound_policy,
+            metrics=owner._inbound_metrics,
+        )
+
+    @asynccontextmanager
+    async def messages(
+        self,
+        topics: str | List[str],
+        *,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+    ) -> AsyncIterator[AsyncIterator[aiomqtt.Message]]:
+        # Each call gets its own subscription on the connection dispatcher, so concurrent
+        # callers all see their messages and leaving one context keeps the others' filters.
+        # On a shared connection the channel's own inbound settings apply, and a slow consumer
+        # holds up only this channel.
+        try:
+            subscription = await self.dispatcher.subscribe(
+                topics,
+                max_size=max_size if max_size is not None else self.inbound_max_size,
+                policy=policy or self.inbound_policy,
+                channel=self if self.shared_connection is not None else None,
+            )
         except aiomqtt.MqttError:
             self._connected.clear()
             raise
+
+        async def wrapped() -> AsyncIterator[aiomqtt.Message]:
+            try:
+                async for msg in subscription:
+                    self._subscribed_message_count += 1
+                    self._subscribed_message_bytes += len(msg.payload or b"")
+                    yield msg
+            except asyncio.CancelledError:
+                return
+
+        try:
+            yield wrapped()
         finally:
-            # Best-effort unsubscribe; failure isn't fatal (e.g. disconnect while shutting down).
-            with contextlib.suppress(Exception):
-                await self._client.unsubscribe(topics)
+            await subscription.close()
 
-    async def resilient_messages(self, topics: str | List[str]) -> AsyncIterator[aiomqtt.Message]:
+    async def resilient_messages(
+        self,
+        topics: str | List[str],
+        *,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+    ) -> AsyncIterator[aiomqtt.Message]:
         """
         Async generator that keeps the subscription alive across disconnects.
         """
         while not self._closing:
             await self._ensure_connected()
             try:
-                async with self.messages(topics) as msgs:
+                async with self.messages(topics, max_size=max_size, policy=policy) as msgs:
                     async for msg in msgs:
                         yield msg
             except aiomqtt.MqttError:
@@ -296,14 +750,14 @@ class UnsMqttClient:
                     time = datetime.now(timezone.utc)
                     alive_packet = UnsPacket.data(value=1, uom="bit", time=time)
                     uptime_packet = UnsPacket.data(value=uptime_minutes, uom="min", time=time)
-                    await self.publish_raw(alive_topic, UnsPacket.to_json(alive_packet), qos=0, retain=False)
-                    await self.publish_raw(uptime_topic, UnsPacket.to_json(uptime_packet), qos=0, retain=False)
+                    await self.publish_raw(alive_topic, UnsPacket.to_bytes(alive_packet), qos=0, retain=False)
+                    await self.publish_raw(uptime_topic, UnsPacket.to_bytes(uptime_packet), qos=0, retain=False)
                     if self.publisher_active is not None:
                         publisher_packet = UnsPacket.data(value=1 if self.publisher_active else 0, uom="bit", time=time)
-                        await self.publish_raw(publisher_topic, UnsPacket.to_json(publisher_packet), qos=0, retain=False)
+                        await self.publish_raw(publisher_topic, UnsPacket.to_bytes(publisher_packet), qos=0, retain=False)
                     if self.subscriber_active is not None:
                         subscriber_packet = UnsPacket.data(value=1 if self.subscriber_active else 0, uom="bit", time=time)
-                        await self.publish_raw(subscriber_topic, UnsPacket.to_json(subscriber_packet), qos=0, retain=False)
+                        await self.publish_raw(subscriber_topic, UnsPacket.to_bytes(subscriber_packet), qos=0, retain=False)
                 except aiomqtt.MqttError:
                     self._connected.clear()
                 except Exception:
@@ -333,14 +787,18 @@ class UnsMqttClient:
                         uom="kB",
                         time=time,
                     )
-                    await self.publish_raw(published_count_topic, UnsPacket.to_json(published_count_packet), qos=0, retain=False)
-                    await self.publish_raw(published_bytes_topic, UnsPacket.to_json(published_bytes_packet), qos=0, retain=False)
-                    await self.publish_raw(subscribed_count_topic, UnsPacket.to_json(subscribed_count_packet), qos=0, retain=False)
-                    await self.publish_raw(subscribed_bytes_topic, UnsPacket.to_json(subscribed_bytes_packet), qos=0, retain=False)
+                    await self.publish_raw(published_count_topic, UnsPacket.to_bytes(published_count_packet), qos=0, retain=False)
+                    await self.publish_raw(published_bytes_topic, UnsPacket.to_bytes(published_bytes_packet), qos=0, retain=False)
+                    await self.publish_raw(subscribed_count_topic, UnsPacket.to_bytes(subscribed_count_packet), qos=0, retain=False)
+                    await self.publish_raw(subscribed_bytes_topic, UnsPacket.to_bytes(subscribed_bytes_packet), qos=0, retain=False)
                     self._published_message_count = 0
                     self._published_message_bytes = 0
                     self._subscribed_message_count = 0
                     self._subscribed_message_bytes = 0
+                    for source in self._stats_sources:
+                        for name, (value, uom) in source().items():
+                            packet = UnsPacket.data(value=value, uom=uom, time=time)
+                            await self.publish_raw(f"{self.status_topic}{name}", UnsPacket.to_bytes(packet), qos=0, retain=False)
                 except aiomqtt.MqttError:
                     self._connected.clear()
                 except Exception:
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Deque, Dict, Literal, Optional, Tuple
+
+import aiomqtt
+
+from .packet import _decode_packet_payload
+
+InboundPolicy = Literal["block", "drop-oldest", "drop-newest", "latest-per-topic"]
+INBOUND_POLICIES: Tuple[str, ...] = ("block", "drop-oldest", "drop-newest", "latest-per-topic")
+DEFAULT_INBOUND_MAX_SIZE = 10_000
+# Decoding a payload for its packet time costs as much as the consumer's own parse; sample.
+DEFAULT_LAG_SAMPLE_EVERY = 32
+
+
+def validate_inbound_settings(max_size: Optional[int], policy: str) -> None:
+    if policy not in INBOUND_POLICIES:
+        raise ValueError(f"Unsupported inbound policy '{policy}'; expected one of {', '.join(INBOUND_POLICIES)}.")
+    if max_size is not None and max_size <= 0:
+        raise ValueError("Inbound max_size must be positive (or None for unbounded).")
+
+
+def packet_lag(message: aiomqtt.Message) -> Optional[float]:
+    """Seconds between the packet `time` (data or table) of a UNS message and now, if it has one."""
+    try:
+        content_type = getattr(message.properties, "ContentType", None)
+        packet = _decode_packet_payload(message.payload, content_type)
+        body = packet["message"]
+        payload = body.get("data") or body.get("table")
+        sent = payload["time"]
+    except Exception:
+        return None
+    now = datetime.now(timezone.utc)
+    if isinstance(sent, (int, float)) and not isinstance(sent, bool):
+        return now.timestamp() - sent / 1000
+    if not isinstance(sent, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(sent.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (now - parsed).total_seconds()
+
+
+@dataclass(frozen=True)
+class InboundBufferStats:
+    depth: int
+    max_size: Optional[int]
+    policy: str
+    received: int
+    dropped: int
+    lag_s: Optional[float]
+
+
+class InboundMetrics:
+    """
+    Inbound buffer metrics of one connection, published with the client status stats.
+
+    Depth is summed over the open buffers; drops and the largest sampled lag cover the
+    interval since the previous `collect()`, like the other message counters.
+    """
+
+    def __init__(self) -> None:
+        self.buffers: "weakref.WeakSet[InboundBuffer]" = weakref.WeakSet()
+        self.dropped = 0
+        self.max_lag_s: Optional[float] = None
+
+    def record_lag(self, lag_s: float) -> None:
+        if self.max_lag_s is None or lag_s > self.max_lag_s:
+            self.max_lag_s = lag_s
+
+    def collect(self) -> Dict[str, Tuple[float, Optional[str]]]:
+        buffers = [buffer for buffer in list(self.buffers) if not buffer.closed]
+        if not buffers and not self.dropped:
+            return {}
+        metrics: Dict[str, Tuple[float, Optional[str]]] = {
+            "inbound-queue-depth": (sum(len(buffer) for buffer in buffers), None),
+            "inbound-dropped": (self.dropped, None),
+        }
+        if self.max_lag_s is not None:
+            metrics["inbound-lag"] = (round(self.max_lag_s * 1000, 1), "ms")
+        self.dropped = 0
+        self.max_lag_s = None
+        return metrics
+
+
+class InboundBuffer:
+    """
+    Bounded buffer between the MQTT read loop and one consumer.
+
+    Messages are put from the event loop and taken either by an async consumer (`get()`) or
+    by a thread (`get_sync()`). When `max_size` messages are waiting, `policy` decides:
+
+    - ``"block"``: `put()` returns an awaitable that completes once there is room, so the
+      read loop waits for the consumer. Nothing is dropped; what arrives meanwhile waits in
+      aiomqtt's unbounded incoming queue, so the broker is not slowed down.
+    - ``"drop-oldest"``: the oldest waiting message is discarded.
+    - ``"drop-newest"``: the incoming message is discarded.
+    - ``"latest-per-topic"``: only the newest waiting message of each topic is kept (a newer
+      message replaces it in place); a new topic beyond `max_size` discards the oldest one.
+
+    Discarded and replaced messages count as dropped. Every `lag_sample_every`-th message
+    taken is decoded to sample the end-to-end lag from its packet `time`.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = DEFAULT_INBOUND_MAX_SIZE,
+        policy: InboundPolicy = "block",
+        *,
+        metrics: Optional[InboundMetrics] = None,
+        lag_sample_every: int = DEFAULT_LAG_SAMPLE_EVERY,
+    ) -> None:
+        validate_inbound_settings(max_size, policy)
+        self.max_size = max_size
+        self.policy = policy
+        self.closed = False
+        self._fifo: Deque[aiomqtt.Message] = deque()
+        self._latest: Dict[str, aiomqtt.Message] = {}
+        self._lock = threading.Lock()
+        self._sync_ready = threading.Condition(self._lock)
+        self._ready = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics = metrics
+        self._lag_sample_every = max(1, lag_sample_every)
+        self._taken = 0
+        self._received = 0
+        self._dropped = 0
+        self._lag_s: Optional[float] = None
+        if metrics is not None:
+            metrics.buffers.add(self)
+
+    def __len__(self) -> int:
+        return len(self._fifo) + len(self._latest)
+
+    def put(self, message: aiomqtt.Message) -> Optional[Awaitable[None]]:
+        """Offer a message (event loop only); returns an awaitable only when a "block" buffer is full."""
+        with self._lock:
+            if self.closed:
+                return None
+            self._received += 1
+            if self.policy == "latest-per-topic":
+                topic = str(message.topic)
+                latest = self._latest
+                if topic in latest:
+                    self._drop()
+                elif self.max_size is not None and len(latest) >= self.max_size:
+                    del latest[next(iter(latest))]
+                    self._drop()
+                latest[topic] = message
+            else:
+                if self.max_size is not None and len(self._fifo) >= self.max_size:
+                    if self.policy == "drop-newest":
+                        self._drop()
+                        return None
+                    if self.policy == "block":
+                        self._received -= 1
+                        return self._put_when_ready(message)
+                    self._fifo.popleft()
+                    self._drop()
+                self._fifo.append(message)
+            self._wake_consumers()
+        return None
+
+    async def _put_when_ready(self, message: aiomqtt.Message) -> None:
+        self._loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.closed:
+                    return
+                if len(self._fifo) < (self.max_size or 0):
+                    self._received += 1
+                    self._fifo.append(message)
+                    self._wake_consumers()
+                    return
+                self._not_full.clear()
+            await self._not_full.wait()
+
+    async def get(self) -> Optional[aiomqtt.Message]:
+        """Next message, or None once the buffer is closed and drained."""
+        while True:
+            with self._lock:
+                if self._fifo or self._latest:
+                    message = self._take(threadsafe=False)
+                    break
+                if self.closed:
+                    return None
+                self._ready.clear()
+            await self._ready.wait()
+        self._sample_lag(message)
+        return message
+
+    def get_sync(self) -> Optional[aiomqtt.Message]:
+        """Blocking `get()` for a consumer thread."""
+        with self._sync_ready:
+            self._sync_ready.wait_for(lambda: self.closed or bool(self._fifo or self._latest))
+            if not (self._fifo or self._latest):
+                return None
+            message = self._take(threadsafe=True)
+        self._sample_lag(message)
+        return message
+
+    def close(self) -> None:
+        """Stop accepting messages (event loop only); consumers still drain what is queued."""
+        with self._lock:
+            self.closed = True
+            self._sync_ready.notify_all()
+            self._ready.set()
+            self._not_full.set()
+
+    def stats(self) -> InboundBufferStats:
+        return InboundBufferStats(
+            depth=len(self),
+            max_size=self.max_size,
+            policy=self.policy,
+            received=self._received,
+            dropped=self._dropped,
+            lag_s=self._lag_s,
+        )
+
+    def _drop(self) -> None:
+        self._dropped += 1
+        if self._metrics is not None:
+            self._metrics.dropped += 1
+
+    def _wake_consumers(self) -> None:
+        self._ready.set()
+        self._sync_ready.notify()
+
+    def _take(self, *, threadsafe: bool) -> aiomqtt.Message:
+        if self._latest:
+            return self._latest.pop(next(iter(self._latest)))
+        message = self._fifo.popleft()
+        if self.policy == "block" and not self._not_full.is_set():
+            if not threadsafe:
+                self._not_full.set()
+            elif self._loop is not None:
+                self._loop.call_soon_threadsafe(self._not_full.set)
+        return message
+
+    def _sample_lag(self, message: aiomqtt.Message) -> None:
+        taken = self._taken
+        self._taken = taken + 1
+        if taken % self._lag_sample_every:
+            return
+        lag_s = packet_lag(message)
+        if lag_s is None:
+            return
+        self._lag_s = lag_s
+        if self._metrics is not None:
+            self._metrics.record_lag(lag_s)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+DEFAULT_OUTBOX_MAX_BYTES = 256 * 1024 * 1024
+# Appends buffered beyond this are written right away, on the caller's thread.
+MAX_PENDING_APPENDS = 1024
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    id: int
+    topic: str
+    payload: bytes
+    content_type: Optional[str]
+    created_at: float
+
+
+@dataclass(frozen=True)
+class OutboxStats:
+    backlog: int
+    backlog_bytes: int
+    oldest_age_s: float
+    dropped: int
+    replayed: int
+
+
+class PublishOutbox:
+    """
+    Durable FIFO of MQTT publishes backed by an SQLite database in WAL mode.
+
+    Entries are appended while the broker is unreachable and removed once replayed, so a
+    restart resumes where the previous process stopped. `append()` only buffers in memory;
+    `flush()` (called by `peek()` and `close()`, or from a worker thread) writes the buffered
+    entries in one transaction, so an outage does not cost one commit per publish. Disk
+    usage is bounded by `max_bytes` of payload: when an append would exceed it, the oldest
+    entries are dropped (and counted in `stats().dropped`). Commits use `synchronous=NORMAL`,
+    which survives a process crash; a power loss may lose the last few transactions.
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int = DEFAULT_OUTBOX_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("Outbox max_bytes must be positive.")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Appended entries not written yet (topic, payload, content type, created at).
+        self._pending: List[Tuple[str, bytes, Optional[str], float]] = []
+        self._pending_bytes = 0
+        self._pending_lock = threading.Lock()
+        # Entries taken from `_pending` by a running flush and not committed yet.
+        self._flushing = 0
+        self._flushing_bytes = 0
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "topic TEXT NOT NULL, "
+            "payload BLOB NOT NULL, "
+            "content_type TEXT, "
+            "created_at REAL NOT NULL)"
+        )
+        count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM outbox").fetchone()
+        self._backlog = int(count)
+        self._backlog_bytes = int(size)
+        self._dropped = 0
+        self._replayed = 0
+
+    def __len__(self) -> int:
+        return self._backlog + self._flushing + len(self._pending)
+
+    @property
+    def backlog_bytes(self) -> int:
+        return self._backlog_bytes + self._flushing_bytes + self._pending_bytes
+
+    @property
+    def pending(self) -> int:
+        """Appended entries waiting for `flush()`."""
+        return len(self._pending)
+
+    def append(self, topic: str, payload: str | bytes, *, content_type: Optional[str] = None) -> None:
+        data = payload.encode() if isinstance(payload, str) else bytes(payload)
+        with self._pending_lock:
+            self._pending.append((topic, data, content_type, time.time()))
+            self._pending_bytes += len(data)
+
+    def flush(self) -> int:
+        """Write the appended entries in one transaction; returns how many were written."""
+        with self._lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                self._flushing, self._flushing_bytes = len(batch), self._pending_bytes
+                self._pending_bytes = 0
+            if not batch:
+                return 0
+            counters = (self._backlog, self._backlog_bytes, self._dropped)
+            try:
+                self._db.execute("BEGIN")
+                for topic, data, content_type, created_at in batch:
+                    self._make_room(len(data))
+                    self._db.execute(
+                        "INSERT INTO outbox (topic, payload, content_type, created_at) VALUES (?, ?, ?, ?)",
+                        (topic, data, content_type, created_at),
+                    )
+                    self._backlog += 1
+                    self._backlog_bytes += len(data)
+                self._db.execute("COMMIT")
+            except BaseException:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+                self._backlog, self._backlog_bytes, self._dropped = counters
+                with self._pending_lock:
+                    self._pending[:0] = batch
+                    self._pending_bytes += self._flushing_bytes
+                raise
+            finally:
+                self._flushing = self._flushing_bytes = 0
+        return len(batch)
+
+    def peek(self, limit: int = 100) -> List[OutboxEntry]:
+        """Oldest `limit` entries, in append order."""
+        self.flush()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, topic, payload, content_type, created_at FROM outbox ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [OutboxEntry(row[0], row[1], bytes(row[2]), row[3], row[4]) for row in rows]
+
+    def remove_through(self, entry_id: int) -> int:
+        """Delete every entry up to and including `entry_id` after it was replayed."""
+        with self._lock:
+            count, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM outbox WHERE id <= ?",
+                (entry_id,),
+            ).fetchone()
+            self._db.execute("DELETE FROM outbox WHERE id <= ?", (entry_id,))
+            self._backlog -= count
+            self._backlog_bytes -= size
+            self._replayed += count
+        return int(count)
+
+    def stats(self) -> OutboxStats:
+        with self._lock:
+            row = self._db.execute("SELECT created_at FROM outbox ORDER BY id LIMIT 1").fetchone()
+            with self._pending_lock:
+                oldest = row[0] if row else self._pending[0][3] if self._pending else None
+            return OutboxStats(
+                backlog=len(self),
+                backlog_bytes=self.backlog_bytes,
+                oldest_age_s=max(0.0, time.time() - oldest) if oldest is not None else 0.0,
+                dropped=self._dropped,
+                replayed=self._replayed,
+            )
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+    def _make_room(self, size: int) -> None:
+        excess = self._backlog_bytes + size - self.max_bytes
+        while excess > 0 and self._backlog > 0:
+            rows = self._db.execute("SELECT id, LENGTH(payload) FROM outbox ORDER BY id LIMIT 256").fetchall()
+            last_id = None
+            for entry_id, length in rows:
+                last_id = entry_id
+                excess -= length
+                self._backlog -= 1
+                self._backlog_bytes -= length
+                self._dropped += 1
+                if excess <= 0:
+                    break
+            self._db.execute("DELETE FROM outbox WHERE id <= ?", (last_id,))
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
 from dataclasses import asdict, dataclass, is_dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import math
 import re
+import sys
+import threading
+import time as time_module
 from typing import Any, Dict, Literal, Optional, TypeAlias, cast
 import json
+from json.encoder import encode_basestring_ascii
 
 from .logger import get_logger
 
+try:  # Optional accelerated JSON backend.
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 log = get_logger(__name__)
 
 DataValue: TypeAlias = str | int | float
@@ -60,12 +72,83 @@ CANONICAL_COLUMN_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
 RESERVED_COLUMN_NAMES = {"__proto__", "prototype", "constructor"}
 SUPPORTED_LEGACY_PACKET_VERSION_RE = re.compile(r"^1\.\d+\.\d+(?:[-+].*)?$")
 
+PacketEncoderBackend: TypeAlias = Literal["auto", "json", "orjson"]
+PacketValidation: TypeAlias = Literal["strict", "lazy", "trusted"]
+PacketCodecName: TypeAlias = Literal["json", "msgpack", "cbor"]
+PACKET_CONTENT_TYPES: Dict[str, str] = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "cbor": "application/cbor",
+}
+_PACKET_VALIDATION_MODES = ("strict", "lazy", "trusted")
+
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+# orjson output differs from the stdlib encoder for non-ASCII text, DEL, floats
+# in exponent notation (1e16 vs 1e+16), floats in [1e-5, 1e-4) (0.00005 vs
+# 5e-05) and NaN/Infinity (emitted as null). Any output that may contain one of
+# those is re-encoded with the stdlib.
+_ORJSON_FLOAT_MISMATCH_RE = re.compile(rb"e[0-9-]|(?<![0-9.])0\.0000[1-9]")
+_ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME)
+    if orjson is not None
+    else 0
+)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+_ONE_MS = timedelta(milliseconds=1)
+# Epoch second and "YYYY-MM-DDTHH:MM:SS." prefix of the last formatted or parsed time.
+# Packet times mostly fall in the current second, so formatting is an f-string and
+# parsing an int() of the milliseconds. The tuple is replaced as a whole (thread-safe).
+_iso_second: tuple[int, str] = (0, "1970-01-01T00:00:00.")
+
 
 def isoformat(dt: datetime) -> str:
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    dt = dt.astimezone(timezone.utc)
-    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    return _iso_from_epoch_ms((dt - _EPOCH) // _ONE_MS)
+
+
+def _now_epoch_ms() -> int:
+    return time_module.time_ns() // 1_000_000
+
+
+def _iso_from_epoch_ms(value: int) -> str:
+    global _iso_second
+    second, millis = divmod(value, 1000)
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = (_EPOCH + timedelta(seconds=second)).strftime("%Y-%m-%dT%H:%M:%S.")
+        _iso_second = (second, prefix)
+    return f"{prefix}{millis:03d}Z"
+
+
+def _epoch_ms_from_iso(value: str) -> int:
+    global _iso_second
+    second, prefix = _iso_second
+    canonical = len(value) == 24 and value[19] == "." and value[23] == "Z"
+    if canonical and value.startswith(prefix) and value[20:23].isdigit():
+        return second * 1000 + int(value[20:23])
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    epoch_ms = (parsed - _EPOCH) // _ONE_MS
+    if canonical:
+        _iso_second = (epoch_ms // 1000, value[:20])
+    return epoch_ms
+
+
+def _time_string(value: Optional[datetime | str | int]) -> str:
+    """Packet time for a datetime, ISO string or epoch ms; now when None."""
+    if value is None:
+        return _iso_from_epoch_ms(_now_epoch_ms())
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return _iso_from_epoch_ms(value)
+    return isoformat(value)
 
 
 @dataclass
@@ -189,6 +272,67 @@ def _validate_named_column_payload(
         raise ValueError(f"{path}.uom must be a string when provided")
 
 
+def _epoch_ms(value: datetime | str | int) -> int:
+    if isinstance(value, bool):
+        raise ValueError("times must be datetimes, ISO strings or epoch ms")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return _epoch_ms_from_iso(value)
+    if not isinstance(value, datetime):
+        raise ValueError("times must be datetimes, ISO strings or epoch ms")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _ONE_MS
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _validate_series_payload(payload: Dict[str, Any]) -> str:
+    """Validate a ``message.series`` payload and return its valueType."""
+    values = payload.get("values")
+    if not isinstance(values, list) or len(values) == 0:
+        raise ValueError("series.values must be a non-empty array")
+    value_type = _value_type(values[0]) if _is_data_value(values[0]) else None
+    for value in values:
+        if not _is_data_value(value) or _value_type(value) != value_type:
+            raise ValueError("series.values must all be strings or all be numbers")
+
+    if "times" in payload:
+        if "startTime" in payload or "timeDeltas" in payload:
+            raise ValueError(
+                "series must carry either times or startTime/timeDeltas, not both"
+            )
+        times = payload["times"]
+        if not isinstance(times, list) or not all(isinstance(t, str) for t in times):
+            raise ValueError("series.times must be an array of ISO strings")
+    else:
+        if not _is_int(payload.get("startTime")):
+            raise ValueError("series.startTime must be epoch milliseconds")
+        times = payload.get("timeDeltas")
+        if not isinstance(times, list) or not all(_is_int(t) for t in times):
+            raise ValueError("series.timeDeltas must be an array of integers")
+    if len(times) != len(values):
+        raise ValueError("series times and values must have the same length")
+    return cast(str, value_type)
+
+
+def _series_times(payload: Dict[str, Any]) -> list[str]:
+    if "times" in payload:
+        return list(payload["times"])
+    times: list[str] = []
+    current = payload["startTime"]
+    for delta in payload["timeDeltas"]:
+        current += delta
+        times.append(_iso_from_epoch_ms(current))
+    return times
+
+
+_SERIES_SAMPLE_KEYS = {"values", "times", "startTime", "timeDeltas", "valueType"}
+
+
 def _validate_column_name(name: Any, *, require_canonical: bool) -> str:
     if not isinstance(name, str) or not name.strip():
         raise ValueError("table.columns keys must be non-empty strings")
@@ -295,6 +439,788 @@ def _prune_none(payload: Dict[str, Any]) -> None:
             payload.pop(key, None)
 
 
+_BATCH_NUMBER_TYPES = {"byte", "short", "int", "long", "float", "double"}
+_NUMPY_INT_QUESTDB_TYPES = {
+    "int8": "byte",
+    "int16": "short",
+    "int32": "int",
+    "int64": "long",
+    "uint8": "short",
+    "uint16": "int",
+    "uint32": "long",
+    "uint64": "long",
+}
+
+
+BatchColumnEncoding: TypeAlias = Literal["number", "boolean", "string", "generic"]
+
+
+@dataclass
+class _BatchColumn:
+    name: str
+    values: list[Any]
+    questdb_type: Optional[str]
+    encoding: BatchColumnEncoding = "generic"
+
+
+def _format_json_number(value: int | float) -> str:
+    if isinstance(value, float) and not math.isfinite(value):
+        return _JSON_ENCODER.encode(value)
+    return repr(value)
+
+
+def _format_json_table_value(value: Any) -> str:
+    if not _is_table_value(value):
+        raise ValueError("table column values must be string, number, boolean, or null")
+    return _JSON_ENCODER.encode(value)
+
+
+def _format_json_numbers(values: list[Any]) -> list[Optional[str]]:
+    """Format a numeric column, column-wise through orjson when the output matches."""
+    if orjson is not None and values:
+        try:
+            encoded = orjson.dumps(values)
+        except TypeError:
+            encoded = None
+        if encoded is not None and _ORJSON_FLOAT_MISMATCH_RE.search(encoded) is None:
+            tokens: list[Optional[str]] = list(encoded[1:-1].decode().split(","))
+            null_count = values.count(None)
+            # orjson writes non-finite floats as null; only trust it when every
+            # null token stands for a missing value.
+            if tokens.count("null") == null_count:
+                if null_count:
+                    tokens = [None if token == "null" else token for token in tokens]
+                return tokens
+    return [None if value is None else _format_json_number(value) for value in values]
+
+
+def _format_batch_values(column: _BatchColumn) -> list[Optional[str]]:
+    values = column.values
+    if column.encoding == "number":
+        return _format_json_numbers(values)
+    if column.encoding == "boolean":
+        return [
+            None if value is None else "true" if value else "false" for value in values
+        ]
+    if column.encoding == "string":
+        return [
+            None if value is None else encode_basestring_ascii(value)
+            for value in values
+        ]
+    return [
+        None if value is None else _format_json_table_value(value) for value in values
+    ]
+
+
+def _questdb_type_for_python_values(values: list[Any]) -> Optional[str]:
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return "boolean"
+        if isinstance(value, int):
+            return "long"
+        if isinstance(value, float):
+            return "double"
+        if isinstance(value, datetime):
+            return "timestamp"
+        return "varchar"
+    return None
+
+
+def _python_batch_column(name: str, values: list[Any]) -> _BatchColumn:
+    questdb_type = _questdb_type_for_python_values(values)
+    if questdb_type == "timestamp":
+        iso_values = [None if value is None else isoformat(value) for value in values]
+        return _BatchColumn(name, iso_values, questdb_type, "string")
+    return _BatchColumn(name, values, questdb_type)
+
+
+def _timestamp_batch_column(name: str, values: Any) -> _BatchColumn:
+    import numpy as np
+
+    strings = np.datetime_as_string(values.astype("datetime64[ms]"), unit="ms")
+    iso_values = [None if text == "NaT" else f"{text}Z" for text in strings.tolist()]
+    return _BatchColumn(name, iso_values, "timestamp", "string")
+
+
+def _float_batch_column(name: str, array: Any, itemsize: int) -> _BatchColumn:
+    import numpy as np
+
+    values = array.astype(object)
+    values[np.isnan(array)] = None
+    questdb_type = "float" if itemsize == 4 else "double"
+    return _BatchColumn(name, values.tolist(), questdb_type, "number")
+
+
+def _numpy_batch_column(name: str, array: Any) -> _BatchColumn:
+    kind = array.dtype.kind
+    if kind == "M":
+        return _timestamp_batch_column(name, array)
+    if kind == "f":
+        return _float_batch_column(name, array, array.dtype.itemsize)
+    if kind in ("i", "u"):
+        questdb_type = _NUMPY_INT_QUESTDB_TYPES.get(array.dtype.name, "long")
+        return _BatchColumn(name, array.tolist(), questdb_type, "number")
+    if kind == "b":
+        return _BatchColumn(name, array.tolist(), "boolean", "boolean")
+    if kind in ("U", "S"):
+        return _BatchColumn(name, array.astype(str).tolist(), "varchar", "string")
+    return _python_batch_column(name, array.tolist())
+
+
+def _pandas_batch_column(name: str, series: Any, pd: Any) -> _BatchColumn:
+    dtype = series.dtype
+    if dtype.kind == "M":
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        return _timestamp_batch_column(name, series.to_numpy())
+    values = series.to_numpy(dtype=object, na_value=None).tolist()
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _BatchColumn(name, values, "symbol")
+    if dtype.kind == "f":
+        questdb_type = "float" if dtype.itemsize == 4 else "double"
+        return _BatchColumn(name, values, questdb_type, "number")
+    if dtype.kind in ("i", "u"):
+        questdb_type = _NUMPY_INT_QUESTDB_TYPES.get(dtype.name.lower(), "long")
+        return _BatchColumn(name, values, questdb_type, "number")
+    if dtype.kind == "b":
+        return _BatchColumn(name, values, "boolean", "boolean")
+    return _python_batch_column(name, values)
+
+
+def _arrow_batch_column(name: str, column: Any, pa: Any) -> _BatchColumn:
+    column_type = column.type
+    if pa.types.is_timestamp(column_type) or pa.types.is_date(column_type):
+        array = column.cast(pa.timestamp("ms")).to_numpy(zero_copy_only=False)
+        return _timestamp_batch_column(name, array)
+    if pa.types.is_floating(column_type):
+        array = column.to_numpy(zero_copy_only=False)
+        return _float_batch_column(name, array, column_type.bit_width // 8)
+    values = column.to_pylist()
+    if pa.types.is_dictionary(column_type):
+        return _BatchColumn(name, values, "symbol")
+    if pa.types.is_integer(column_type):
+        questdb_type = _NUMPY_INT_QUESTDB_TYPES.get(str(column_type), "long")
+        return _BatchColumn(name, values, questdb_type, "number")
+    if pa.types.is_boolean(column_type):
+        return _BatchColumn(name, values, "boolean", "boolean")
+    if pa.types.is_string(column_type) or pa.types.is_large_string(column_type):
+        return _BatchColumn(name, values, "varchar", "string")
+    return _python_batch_column(name, values)
+
+
+def _batch_columns(frame: Any) -> list[_BatchColumn]:
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(frame, pd.DataFrame):
+        return [
+            _pandas_batch_column(str(name), frame[name], pd) for name in frame.columns
+        ]
+
+    pa = sys.modules.get("pyarrow")
+    if pa is not None and isinstance(frame, (pa.Table, pa.RecordBatch)):
+        return [
+            _arrow_batch_column(name, frame.column(index), pa)
+            for index, name in enumerate(frame.schema.names)
+        ]
+
+    if isinstance(frame, Mapping):
+        np = sys.modules.get("numpy")
+        columns: list[_BatchColumn] = []
+        for name, values in frame.items():
+            if np is not None and isinstance(values, np.ndarray):
+                columns.append(_numpy_batch_column(str(name), values))
+            else:
+                columns.append(_python_batch_column(str(name), list(values)))
+        return columns
+
+    raise TypeError(
+        "table_batch() expects a pandas DataFrame, a pyarrow Table/RecordBatch, "
+        "or a mapping of column names to sequences"
+    )
+
+
+def _batch_time_values(column: _BatchColumn) -> list[str]:
+    times: list[str] = []
+    for value in column.values:
+        if isinstance(value, str):
+            times.append(value)
+        elif isinstance(value, datetime):
+            times.append(isoformat(value))
+        else:
+            raise ValueError(
+                f"time column '{column.name}' must contain ISO strings or datetimes"
+            )
+    return times
+
+
+def _table_column_fragment(name: str, questdb_type: Any, uom: Any) -> str:
+    """Validate a column definition and render the JSON around its value.
+
+    The value's position is marked with a NUL character.
+    """
+    _validate_column_name(name, require_canonical=True)
+    if not is_questdb_type(questdb_type):
+        raise ValueError(
+            f"table.columns.{name}.type must be a valid QuestDB type literal"
+        )
+    if uom is not None and not isinstance(uom, str):
+        raise ValueError(f"table.columns.{name}.uom must be a string when provided")
+    return (
+        f"{encode_basestring_ascii(name)}:"
+        f'{{"type":{encode_basestring_ascii(questdb_type)},"value":\x00'
+        + ("}" if uom is None else f',"uom":{encode_basestring_ascii(uom)}}}')
+    )
+
+
+def _table_packet_head() -> str:
+    return (
+        f'{{"version":{encode_basestring_ascii(UnsPacket.version)},'
+        '"message":{"table":{"time":'
+    )
+
+
+def _table_packet_tail(
+    data_group: Optional[str],
+    extra: Dict[str, Any],
+    created_at: Optional[datetime | str],
+    expires_at: Optional[datetime | str],
+) -> str:
+    """Render the JSON that follows ``columns`` in a table packet."""
+    payload_tail: Dict[str, Any] = {"dataGroup": data_group}
+    _normalize_payload_fields(payload_tail, extra)
+    _prune_none(payload_tail)
+    message_tail: Dict[str, Any] = {}
+    if created_at is not None:
+        message_tail["createdAt"] = (
+            created_at if isinstance(created_at, str) else isoformat(created_at)
+        )
+    if expires_at is not None:
+        message_tail["expiresAt"] = (
+            expires_at if isinstance(expires_at, str) else isoformat(expires_at)
+        )
+    return (
+        "".join(
+            f",{encode_basestring_ascii(key)}:{_JSON_ENCODER.encode(value)}"
+            for key, value in payload_tail.items()
+        )
+        + "}"
+        + "".join(
+            f",{encode_basestring_ascii(key)}:{_JSON_ENCODER.encode(value)}"
+            for key, value in message_tail.items()
+        )
+        + "}}"
+    )
+
+
+def _iter_table_batch(
+    head: str,
+    times: list[str],
+    columns: list[tuple[str, list[Optional[str]]]],
+    tail: str,
+) -> Iterator[bytes]:
+    # Rows without nulls are rendered with one %-format call; rows that have
+    # null cells leave those columns out and are joined cell by cell.
+    row_template = (
+        head.replace("%", "%%")
+        + '%s,"columns":{'
+        + ",".join(
+            fragment.replace("%", "%%").replace("\x00", "%s") for fragment, _ in columns
+        )
+        + "}"
+        + tail.replace("%", "%%")
+    )
+    fragments = [fragment.split("\x00") for fragment, _ in columns]
+    values = [column_values for _, column_values in columns]
+    null_rows: set[int] = set()
+    for column_values in values:
+        if None in column_values:
+            null_rows.update(
+                index for index, value in enumerate(column_values) if value is None
+            )
+
+    for index, row in enumerate(zip(times, *values)):
+        if index not in null_rows:
+            yield (row_template % row).encode()
+            continue
+        cells = [
+            f"{prefix}{value}{suffix}"
+            for (prefix, suffix), value in zip(fragments, row[1:])
+            if value is not None
+        ]
+        if cells:
+            yield f'{head}{row[0]},"columns":{{{",".join(cells)}}}{tail}'.encode()
+
+
+def _validate_packet_envelope(packet: Any) -> Dict[str, Any]:
+    if not isinstance(packet, dict):
+        raise ValueError("packet must be an object")
+    version = packet.get("version")
+    if not isinstance(version, str) or not (
+        version == UnsPacket.version
+        or SUPPORTED_LEGACY_PACKET_VERSION_RE.fullmatch(version)
+    ):
+        raise ValueError(f"unsupported or missing packet version '{version}'")
+    message = packet.get("message")
+    if not isinstance(message, dict):
+        raise ValueError("packet.message must be an object")
+    return message
+
+
+def _normalize_parsed_data(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        raise ValueError("message.data must be an object when provided")
+    data = dict(data)
+    _validate_data_payload(data)
+    data["valueType"] = _value_type(data["value"])
+    return data
+
+
+TABLE_SHAPE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class TableShapeCacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _TableShapeCache:
+    """LRU of table column shapes (names, types, uoms) that already passed validation."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._shapes: OrderedDict[tuple, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, shape: tuple) -> bool:
+        with self._lock:
+            if shape in self._shapes:
+                self._shapes.move_to_end(shape)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def add(self, shape: tuple) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._shapes[shape] = None
+            while len(self._shapes) > self.maxsize:
+                self._shapes.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._shapes) > max(maxsize, 0):
+                self._shapes.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> TableShapeCacheInfo:
+        with self._lock:
+            return TableShapeCacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._shapes)
+            )
+
+
+_TABLE_SHAPE_CACHE = _TableShapeCache(TABLE_SHAPE_CACHE_SIZE)
+
+
+def table_shape_cache_info() -> TableShapeCacheInfo:
+    """Hit/miss counters of the column-shape cache used when parsing table packets."""
+    return _TABLE_SHAPE_CACHE.info()
+
+
+def table_shape_cache_clear() -> None:
+    _TABLE_SHAPE_CACHE.clear()
+
+
+def set_table_shape_cache_size(maxsize: int) -> None:
+    """Bound the column-shape cache; ``0`` disables it."""
+    _TABLE_SHAPE_CACHE.resize(maxsize)
+
+
+_TABLE_VALUE_TYPES = (str, int, float, bool)
+
+
+def _table_shape(columns: Any) -> tuple[Optional[tuple], bool]:
+    """Fingerprint the names, types and uoms of ``columns``.
+
+    Returns the shape (``None`` when the columns cannot take the cached path:
+    not a non-empty dict/list of plain ``type``/``value``/``uom`` column dicts)
+    and whether every value is a non-null table value.
+    """
+    if isinstance(columns, dict):
+        legacy = False
+        items: Any = columns.items()
+    elif isinstance(columns, list):
+        legacy = True
+        items = enumerate(columns)
+    else:
+        return None, False
+    shape: list[Any] = [legacy]
+    values_valid = True
+    for key, column in items:
+        if type(column) is not dict:
+            return None, False
+        uom = column.get("uom")
+        expected_size = 2 if uom is None else 3
+        if legacy:
+            key = column.get("name")
+            expected_size += 1
+        if len(column) != expected_size or "value" not in column:
+            return None, False
+        if type(column["value"]) not in _TABLE_VALUE_TYPES:
+            values_valid = False
+        shape.append((key, column.get("type"), uom))
+    if len(shape) == 1:
+        return None, False
+    return tuple(shape), values_valid
+
+
+def _copy_known_table_columns(columns: Any) -> Dict[str, Dict[str, Any]]:
+    if isinstance(columns, dict):
+        return {name: dict(column) for name, column in columns.items()}
+    normalized: Dict[str, Dict[str, Any]] = {}
+    for column in columns:
+        column = dict(column)
+        normalized[column.pop("name")] = column
+    return normalized
+
+
+def _normalize_parsed_table(table: Any) -> Dict[str, Any]:
+    if not isinstance(table, dict):
+        raise ValueError("message.table must be an object when provided")
+    table = dict(table)
+    columns = table.get("columns")
+    try:
+        shape, values_valid = _table_shape(columns)
+        if shape is not None and shape in _TABLE_SHAPE_CACHE and values_valid:
+            # Names, types and uoms were validated for an earlier packet of
+            # the same shape and the values were type-checked by _table_shape.
+            table["columns"] = _copy_known_table_columns(columns)
+            return table
+    except TypeError:
+        # Unhashable column metadata; validate the long way.
+        shape = None
+
+    legacy_column_array = isinstance(columns, list)
+    if "columns" in table:
+        table["columns"] = _normalize_table_columns(
+            table["columns"],
+            legacy_names_may_be_noncanonical=True,
+        )
+    _validate_table_payload(
+        table,
+        require_canonical_names=not legacy_column_array,
+    )
+    if shape is not None:
+        _TABLE_SHAPE_CACHE.add(shape)
+    return table
+
+
+def _normalize_series(series: Any) -> Dict[str, Any]:
+    if not isinstance(series, dict):
+        raise ValueError("message.series must be an object when provided")
+    series = dict(series)
+    series["valueType"] = _validate_series_payload(series)
+    return series
+
+
+def _loads_payload(payload: bytes | bytearray | memoryview | str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity literals and integers above 64 bits,
+            # which json.loads accepts; let the stdlib decide.
+            pass
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    return json.loads(payload)
+
+
+_UNSET: Any = object()
+
+
+class ParsedPacket:
+    """Read-only view over a decoded UNS packet.
+
+    ``data``, ``table`` and ``series`` are normalized and validated on first
+    access (see ``UnsPacket.parse_view``); in ``"trusted"`` mode they are the
+    decoded objects as-is.
+    """
+
+    __slots__ = ("_packet", "_message", "_validate", "_data", "_table", "_series")
+
+    def __init__(self, packet: Dict[str, Any], validate: PacketValidation) -> None:
+        self._packet = packet
+        self._message: Dict[str, Any] = packet.get("message") or {}
+        self._validate = validate
+        self._data: Optional[Dict[str, Any]] = _UNSET
+        self._table: Optional[Dict[str, Any]] = _UNSET
+        self._series: Optional[Dict[str, Any]] = _UNSET
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._packet.get("version")
+
+    @property
+    def message(self) -> Dict[str, Any]:
+        """The decoded message object; ``data``/``table`` inside it are not normalized."""
+        return self._message
+
+    @property
+    def data(self) -> Optional[Dict[str, Any]]:
+        return self._load_data()
+
+    @property
+    def table(self) -> Optional[Dict[str, Any]]:
+        return self._load_table()
+
+    @property
+    def series(self) -> Optional[Dict[str, Any]]:
+        return self._load_series()
+
+    def _load_data(self) -> Optional[Dict[str, Any]]:
+        if self._data is _UNSET:
+            data = self._message.get("data")
+            if data is not None and self._validate != "trusted":
+                data = _normalize_parsed_data(data)
+            self._data = data
+        return self._data
+
+    def _load_table(self) -> Optional[Dict[str, Any]]:
+        if self._table is _UNSET:
+            table = self._message.get("table")
+            if table is not None and self._validate != "trusted":
+                table = _normalize_parsed_table(table)
+            self._table = table
+        return self._table
+
+    def _load_series(self) -> Optional[Dict[str, Any]]:
+        if self._series is _UNSET:
+            series = self._message.get("series")
+            if series is not None and self._validate != "trusted":
+                series = _normalize_series(series)
+            self._series = series
+        return self._series
+
+    def samples(self) -> list[tuple[str, DataValue]]:
+        """``(time, value)`` pairs of a series packet; empty for other packets."""
+        series = self.series
+        if series is None:
+            return []
+        return list(zip(_series_times(series), series["values"]))
+
+    @property
+    def value(self) -> Optional[DataValue]:
+        data = self.data
+        return None if data is None else data.get("value")
+
+    @property
+    def value_type(self) -> Optional[str]:
+        data = self.data
+        if data is None:
+            return None
+        value_type = data.get("valueType")
+        return value_type if value_type is not None else _value_type(data["value"])
+
+    @property
+    def uom(self) -> Optional[str]:
+        data = self.data
+        return None if data is None else data.get("uom")
+
+    @property
+    def time(self) -> Optional[str]:
+        data = self.data
+        if data is not None:
+            return data.get("time")
+        table = self.table
+        return None if table is None else table.get("time")
+
+    @property
+    def data_group(self) -> Optional[str]:
+        payload = self.data
+        if payload is None:
+            payload = self.table
+        return None if payload is None else payload.get("dataGroup")
+
+    @property
+    def columns(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        table = self.table
+        return None if table is None else table.get("columns")
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return self._message.get("createdAt")
+
+    @property
+    def expires_at(self) -> Optional[str]:
+        return self._message.get("expiresAt")
+
+    def validate(self) -> ParsedPacket:
+        """Normalize and validate ``data``, ``table`` and ``series`` now instead of on first access."""
+        self._load_data()
+        self._load_table()
+        self._load_series()
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the packet in the shape returned by ``UnsPacket.parse()``."""
+        message = dict(self._message)
+        if self.data is not None:
+            message["data"] = self.data
+        if self.table is not None:
+            message["table"] = self.table
+        if self.series is not None:
+            message["series"] = self.series
+        return {**self._packet, "message": message}
+
+
+class PacketEncoder:
+    """Serializes UNS packets straight to compact UTF-8 JSON bytes.
+
+    The output is byte-identical to ``UnsPacket.to_json(packet).encode()`` for
+    every backend. ``"auto"`` uses orjson when it is installed and falls back to
+    the stdlib encoder otherwise.
+    """
+
+    def __init__(self, backend: PacketEncoderBackend = "auto") -> None:
+        if backend not in ("auto", "json", "orjson"):
+            raise ValueError(f"Unsupported packet encoder backend '{backend}'")
+        if backend == "orjson" and orjson is None:
+            raise RuntimeError(
+                "orjson packet encoding is not available. Install it with `pip install orjson`."
+            )
+        self.backend: Literal["json", "orjson"] = (
+            "orjson" if backend != "json" and orjson is not None else "json"
+        )
+
+    def encode(self, packet: Dict[str, Any]) -> bytes:
+        if self.backend == "orjson":
+            try:
+                encoded = orjson.dumps(packet, option=_ORJSON_OPTIONS)
+            except TypeError:
+                encoded = None
+            if encoded is not None and _orjson_matches_stdlib(encoded):
+                return encoded
+        return _JSON_ENCODER.encode(packet).encode()
+
+
+def _orjson_matches_stdlib(encoded: bytes) -> bool:
+    return (
+        encoded.isascii()
+        and b"\x7f" not in encoded
+        and b"null" not in encoded
+        and _ORJSON_FLOAT_MISMATCH_RE.search(encoded) is None
+    )
+
+
+_DEFAULT_PACKET_ENCODER = PacketEncoder()
+
+
+class PacketCodec:
+    """Serializes UNS packets to MQTT payload bytes in one wire format.
+
+    ``"json"`` is the default text format. ``"msgpack"`` and ``"cbor"`` carry
+    the same packet structure in binary form and need the ``msgpack`` or
+    ``cbor2`` package. ``content_type`` is the MQTT 5 content-type that
+    advertises the format to subscribers.
+    """
+
+    def __init__(self, name: PacketCodecName = "json") -> None:
+        if name not in PACKET_CONTENT_TYPES:
+            raise ValueError(f"Unsupported packet codec '{name}'")
+        self.name: PacketCodecName = name
+        self.content_type = PACKET_CONTENT_TYPES[name]
+        self._module: Any = None
+        if name == "msgpack":
+            try:
+                import msgpack
+            except ImportError as exc:
+                raise RuntimeError(
+                    "msgpack packet codec is not available. Install it with `pip install msgpack`."
+                ) from exc
+            self._module = msgpack
+        elif name == "cbor":
+            try:
+                import cbor2
+            except ImportError as exc:
+                raise RuntimeError(
+                    "cbor packet codec is not available. Install it with `pip install cbor2`."
+                ) from exc
+            self._module = cbor2
+
+    def encode(self, packet: Dict[str, Any]) -> bytes:
+        if self.name == "msgpack":
+            return self._module.packb(packet, use_bin_type=True)
+        if self.name == "cbor":
+            return self._module.dumps(packet)
+        return _DEFAULT_PACKET_ENCODER.encode(packet)
+
+    def decode(self, payload: bytes | bytearray | memoryview | str) -> Any:
+        if self.name == "msgpack":
+            return self._module.unpackb(payload, raw=False)
+        if self.name == "cbor":
+            if isinstance(payload, memoryview):
+                payload = payload.tobytes()
+            return self._module.loads(payload)
+        return _loads_payload(payload)
+
+
+_PACKET_CODECS: Dict[str, PacketCodec] = {}
+
+
+def get_packet_codec(name: PacketCodecName) -> PacketCodec:
+    """Return a shared ``PacketCodec`` instance for ``name``."""
+    codec = _PACKET_CODECS.get(name)
+    if codec is None:
+        codec = _PACKET_CODECS[name] = PacketCodec(name)
+    return codec
+
+
+def detect_packet_codec(
+    payload: bytes | bytearray | memoryview | str,
+    content_type: Optional[str] = None,
+) -> PacketCodecName:
+    """Pick the codec of a payload from its MQTT 5 content-type or its first byte."""
+    if content_type:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        for name, known_type in PACKET_CONTENT_TYPES.items():
+            if media_type == known_type:
+                return cast(PacketCodecName, name)
+    if isinstance(payload, str) or len(payload) == 0:
+        return "json"
+    # A packet is a map: fixmap/map16/map32 in MessagePack, major type 5 in
+    # CBOR. Neither lead byte can start a JSON document.
+    lead = payload[0]
+    if 0x80 <= lead <= 0x8F or lead in (0xDE, 0xDF):
+        return "msgpack"
+    if 0xA0 <= lead <= 0xBB or lead == 0xBF:
+        return "cbor"
+    return "json"
+
+
+def _decode_packet_payload(
+    payload: bytes | bytearray | memoryview | str, content_type: Optional[str]
+) -> Any:
+    codec_name = detect_packet_codec(payload, content_type)
+    if codec_name == "json":
+        return _loads_payload(payload)
+    return get_packet_codec(codec_name).decode(payload)
+
+
 class UnsPacket:
     version: str = "2.0.0"
 
@@ -302,17 +1228,13 @@ class UnsPacket:
     def data(
         value: DataValue,
         uom: Optional[str] = None,
-        time: Optional[datetime | str] = None,
+        time: Optional[datetime | str | int] = None,
         data_group: Optional[str] = None,
         created_at: Optional[datetime | str] = None,
         expires_at: Optional[datetime | str] = None,
         **extra: Any,
     ) -> Dict[str, Any]:
-        resolved_time = (
-            time
-            if isinstance(time, str)
-            else isoformat(time or datetime.now(timezone.utc))
-        )
+        resolved_time = _time_string(time)
         payload = {
             "value": value,
             "uom": uom,
@@ -342,7 +1264,7 @@ class UnsPacket:
             list[TableColumnPayload | Dict[str, Any]]
             | Dict[str, TableColumnPayload | Dict[str, Any]]
         ] = None,
-        time: Optional[datetime | str] = None,
+        time: Optional[datetime | str | int] = None,
         data_group: Optional[str] = None,
         created_at: Optional[datetime | str] = None,
         expires_at: Optional[datetime | str] = None,
@@ -351,11 +1273,7 @@ class UnsPacket:
         if table is None:
             if columns is None:
                 raise ValueError("table() requires either table dict or columns")
-            resolved_time = (
-                time
-                if isinstance(time, str)
-                else isoformat(time or datetime.now(timezone.utc))
-            )
+            resolved_time = _time_string(time)
             payload: Dict[str, Any] = {
                 "time": resolved_time,
                 "columns": columns,
@@ -364,11 +1282,7 @@ class UnsPacket:
         else:
             payload = dict(table)
             if "time" not in payload:
-                payload["time"] = (
-                    time
-                    if isinstance(time, str)
-                    else isoformat(time or datetime.now(timezone.utc))
-                )
+                payload["time"] = _time_string(time)
             if data_group is not None and "dataGroup" not in payload:
                 payload["dataGroup"] = data_group
 
@@ -388,58 +1302,225 @@ class UnsPacket:
             )
         return {"version": UnsPacket.version, "message": message}
 
+    @staticmethod
+    def series(
+        values: Sequence[DataValue],
+        times: Sequence[datetime | str | int],
+        *,
+        uom: Optional[str] = None,
+        data_group: Optional[str] = None,
+        delta_encode: bool = False,
+        created_at: Optional[datetime | str] = None,
+        expires_at: Optional[datetime | str] = None,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        """Build a packet carrying many samples of one attribute in ``message.series``.
+
+        ``times`` may be datetimes, ISO strings or epoch milliseconds. They are
+        sent as ISO strings, or with ``delta_encode=True`` as ``startTime``
+        (epoch ms) plus per-sample ``timeDeltas`` in ms.
+        """
+        payload: Dict[str, Any] = {"values": list(values)}
+        if delta_encode:
+            epoch_times = [_epoch_ms(value) for value in times]
+            start_time = epoch_times[0] if epoch_times else 0
+            payload["startTime"] = start_time
+            payload["timeDeltas"] = [
+                current - previous
+                for previous, current in zip([start_time, *epoch_times], epoch_times)
+            ]
+        else:
+            payload["times"] = [
+                value
+                if isinstance(value, str)
+                else _iso_from_epoch_ms(value)
+                if _is_int(value)
+                else isoformat(cast(datetime, value))
+                for value in times
+            ]
+        payload["uom"] = uom
+        payload["dataGroup"] = data_group
+        _normalize_payload_fields(payload, extra)
+        _prune_none(payload)
+        payload["valueType"] = _validate_series_payload(payload)
+        message: Dict[str, Any] = {"series": payload}
+        if created_at is not None:
+            message["createdAt"] = (
+                created_at if isinstance(created_at, str) else isoformat(created_at)
+            )
+        if expires_at is not None:
+            message["expiresAt"] = (
+                expires_at if isinstance(expires_at, str) else isoformat(expires_at)
+            )
+        return {"version": UnsPacket.version, "message": message}
+
+    @staticmethod
+    def expand_series(packet: Dict[str, Any]) -> list[Dict[str, Any]]:
+        """Split a series packet into one data packet per sample."""
+        message = packet.get("message") or {}
+        series = message.get("series")
+        if not isinstance(series, dict):
+            raise ValueError("packet.message.series must be an object")
+        value_type = _validate_series_payload(series)
+        shared = {
+            key: value
+            for key, value in series.items()
+            if key not in _SERIES_SAMPLE_KEYS
+        }
+        envelope = {
+            key: value
+            for key, value in message.items()
+            if key in ("createdAt", "expiresAt")
+        }
+        return [
+            {
+                "version": packet.get("version", UnsPacket.version),
+                "message": {
+                    "data": {
+                        "value": value,
+                        "time": time,
+                        **shared,
+                        "valueType": value_type,
+                    },
+                    **envelope,
+                },
+            }
+            for time, value in zip(_series_times(series), series["values"])
+        ]
+
+    @staticmethod
+    def table_batch(
+        frame: Any,
+        *,
+        column_types: Optional[Mapping[str, str]] = None,
+        uoms: Optional[Mapping[str, str]] = None,
+        time_column: Optional[str] = None,
+        time: Optional[datetime | str | int] = None,
+        data_group: Optional[str] = None,
+        created_at: Optional[datetime | str] = None,
+        expires_at: Optional[datetime | str] = None,
+        **extra: Any,
+    ) -> Iterator[bytes]:
+        """Encode every row of a DataFrame, Arrow table or column mapping as a table packet.
+
+        Column names, types and uoms are validated once per batch and values are
+        converted column-wise, so each yielded payload is byte-identical to
+        ``UnsPacket.to_bytes(UnsPacket.table(...))`` for the same row. QuestDB
+        types are inferred from the column dtypes unless given in ``column_types``.
+        Null cells are left out of their row; rows without any value are skipped.
+        """
+        batch_columns = _batch_columns(frame)
+        if len({len(column.values) for column in batch_columns}) > 1:
+            raise ValueError("table_batch() columns must all have the same length")
+        column_types = column_types or {}
+        uoms = uoms or {}
+
+        time_values: Optional[list[str]] = None
+        columns: list[tuple[str, list[Optional[str]]]] = []
+        for column in batch_columns:
+            if time_column is not None and column.name == time_column:
+                time_values = _batch_time_values(column)
+                continue
+            questdb_type = column_types.get(column.name, column.questdb_type)
+            if questdb_type is None:
+                raise ValueError(
+                    f"table.columns.{column.name}.type could not be inferred; "
+                    "pass it in column_types"
+                )
+            fragment = _table_column_fragment(
+                column.name, questdb_type, uoms.get(column.name)
+            )
+            columns.append((fragment, _format_batch_values(column)))
+
+        if time_column is not None and time_values is None:
+            raise ValueError(
+                f"time_column '{time_column}' is not a column of the batch"
+            )
+        if not columns:
+            raise ValueError("table.columns must be a non-empty object")
+        if time_values is None:
+            resolved_time = _time_string(time)
+            time_values = [resolved_time] * len(batch_columns[0].values)
+
+        head = _table_packet_head()
+        tail = _table_packet_tail(data_group, extra, created_at, expires_at)
+        return _iter_table_batch(
+            head,
+            [encode_basestring_ascii(value) for value in time_values],
+            columns,
+            tail,
+        )
+
     @staticmethod
     def to_json(packet: Dict[str, Any]) -> str:
-        return json.dumps(packet, separators=(",", ":"))
+        return _JSON_ENCODER.encode(packet)
 
     @staticmethod
-    def parse(packet_str: str) -> Optional[Dict[str, Any]]:
-        try:
-            packet = json.loads(packet_str)
-            if not isinstance(packet, dict):
-                raise ValueError("packet must be an object")
-            version = packet.get("version")
-            if not isinstance(version, str) or not (
-                version == UnsPacket.version
-                or SUPPORTED_LEGACY_PACKET_VERSION_RE.fullmatch(version)
-            ):
-                raise ValueError(f"unsupported or missing packet version '{version}'")
-            message = packet.get("message")
-            if not isinstance(message, dict):
-                raise ValueError("packet.message must be an object")
+    def to_bytes(
+        packet: Dict[str, Any], encoder: Optional[PacketEncoder] = None
+    ) -> bytes:
+        return (encoder or _DEFAULT_PACKET_ENCODER).encode(packet)
+
+    @staticmethod
+    def parse(
+        packet_str: str | bytes, *, content_type: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Parse and validate a packet.
 
+        ``bytes`` payloads may be JSON, MessagePack or CBOR; the codec is taken
+        from the MQTT 5 ``content_type`` when given, otherwise detected from the
+        payload.
+        """
+        try:
+            if isinstance(packet_str, str):
+                packet = json.loads(packet_str)
+            else:
+                packet = _decode_packet_payload(packet_str, content_type)
+            message = _validate_packet_envelope(packet)
             normalized_message = dict(message)
             data = normalized_message.get("data")
-            if isinstance(data, dict):
-                data = dict(data)
-                _validate_data_payload(data)
-                data["valueType"] = _value_type(data["value"])
-                normalized_message["data"] = data
-            elif data is not None:
-                raise ValueError("message.data must be an object when provided")
-
+            if data is not None:
+                normalized_message["data"] = _normalize_parsed_data(data)
             table = normalized_message.get("table")
-            if isinstance(table, dict):
-                table = dict(table)
-                legacy_column_array = isinstance(table.get("columns"), list)
-                if "columns" in table:
-                    table["columns"] = _normalize_table_columns(
-                        table["columns"],
-                        legacy_names_may_be_noncanonical=True,
-                    )
-                _validate_table_payload(
-                    table,
-                    require_canonical_names=not legacy_column_array,
-                )
-                normalized_message["table"] = table
-            elif table is not None:
-                raise ValueError("message.table must be an object when provided")
-
+            if table is not None:
+                normalized_message["table"] = _normalize_parsed_table(table)
+            series = normalized_message.get("series")
+            if series is not None:
+                normalized_message["series"] = _normalize_series(series)
             return {**packet, "message": normalized_message}
         except Exception as exc:
             log.error("Could not parse UNS packet: %s", exc)
             return None
 
+    @staticmethod
+    def parse_view(
+        payload: bytes | bytearray | memoryview | str,
+        *,
+        validate: PacketValidation = "lazy",
+        content_type: Optional[str] = None,
+    ) -> Optional[ParsedPacket]:
+        """Decode an MQTT payload into a ``ParsedPacket`` without copying it to ``str``.
+
+        ``validate="strict"`` checks the whole packet up front like ``parse()``,
+        ``"lazy"`` checks the envelope now and ``data``/``table``/``series`` on
+        first access, and ``"trusted"`` skips validation for payloads produced
+        by uns-kit.
+        The codec is detected like in ``parse()``. Returns ``None`` when the
+        payload cannot be decoded or fails validation.
+        """
+        if validate not in _PACKET_VALIDATION_MODES:
+            raise ValueError(f"Unsupported packet validation mode '{validate}'")
+        try:
+            packet = _decode_packet_payload(payload, content_type)
+            if validate == "trusted":
+                return ParsedPacket(packet, validate)
+            _validate_packet_envelope(packet)
+            parsed = ParsedPacket(packet, validate)
+            return parsed.validate() if validate == "strict" else parsed
+        except Exception as exc:
+            log.error("Could not parse UNS packet: %s", exc)
+            return None
+
     @staticmethod
     def from_message(message: Dict[str, Any]) -> Dict[str, Any]:
         msg = dict(message)
@@ -461,4 +1542,117 @@ class UnsPacket:
             msg["table"] = table
         elif table is not None:
             raise ValueError("message.table must be an object when provided")
+
+        series = msg.get("series")
+        if series is not None:
+            msg["series"] = _normalize_series(series)
         return {"version": UnsPacket.version, "message": msg}
+
+
+def _format_table_row_value(value: Any) -> Optional[str]:
+    value_type = type(value)
+    if value_type is float:
+        return _format_json_number(value)
+    if value_type is int:
+        return repr(value)
+    if value_type is str:
+        return encode_basestring_ascii(value)
+    if value_type is bool:
+        return "true" if value else "false"
+    if value is None:
+        return None
+    return _format_json_table_value(value)
+
+
+class TableTemplate:
+    """Fixed table schema that encodes rows of values straight to packet bytes.
+
+    Column names, types and uoms are validated once and the JSON around each
+    value is rendered up front, so ``encode`` only formats the values. The
+    output is byte-identical to ``UnsPacket.to_bytes(UnsPacket.table(...))``.
+    ``None`` values leave their column out of the row.
+    """
+
+    __slots__ = ("names", "_head", "_tail", "_extra", "_fragments", "_row_template")
+
+    def __init__(
+        self,
+        columns: Sequence[TableColumnPayload | Dict[str, Any]]
+        | Mapping[str, TableColumnPayload | Dict[str, Any]],
+        *,
+        data_group: Optional[str] = None,
+        **extra: Any,
+    ) -> None:
+        if isinstance(columns, Mapping):
+            definitions = [
+                (name, _coerce_object(column)) for name, column in columns.items()
+            ]
+        else:
+            definitions = []
+            for index, column in enumerate(columns):
+                definition = _coerce_object(column)
+                name = definition.get("name")
+                if not isinstance(name, str):
+                    raise ValueError(
+                        f"table.columns[{index}].name must be a non-empty string"
+                    )
+                definitions.append((name, definition))
+        if not definitions:
+            raise ValueError("table.columns must be a non-empty array or object")
+
+        names = [name for name, _ in definitions]
+        if len(set(names)) != len(names):
+            raise ValueError("table.columns contains duplicate column names")
+        fragments = [
+            _table_column_fragment(name, definition.get("type"), definition.get("uom"))
+            for name, definition in definitions
+        ]
+
+        self.names: tuple[str, ...] = tuple(names)
+        self._extra: Dict[str, Any] = {"data_group": data_group, **extra}
+        self._head = _table_packet_head()
+        self._tail = _table_packet_tail(data_group, extra, None, None)
+        self._fragments = [tuple(fragment.split("\x00")) for fragment in fragments]
+        self._row_template = (
+            self._head.replace("%", "%%")
+            + '%s,"columns":{'
+            + ",".join(
+                fragment.replace("%", "%%").replace("\x00", "%s")
+                for fragment in fragments
+            )
+            + "}%s"
+        )
+
+    def encode(
+        self,
+        values: Sequence[TableValue],
+        *,
+        time: Optional[datetime | str | int] = None,
+        created_at: Optional[datetime | str] = None,
+        expires_at: Optional[datetime | str] = None,
+    ) -> bytes:
+        """Encode one row; ``values`` follow the order of ``names``."""
+        if len(values) != len(self._fragments):
+            raise ValueError(
+                f"table row has {len(values)} values, template expects {len(self._fragments)}"
+            )
+        resolved_time = encode_basestring_ascii(_time_string(time))
+        if created_at is None and expires_at is None:
+            tail = self._tail
+        else:
+            extra = dict(self._extra)
+            tail = _table_packet_tail(
+                extra.pop("data_group"), extra, created_at, expires_at
+            )
+
+        formatted = [_format_table_row_value(value) for value in values]
+        if None not in formatted:
+            return (self._row_template % (resolved_time, *formatted, tail)).encode()
+        cells = [
+            f"{prefix}{value}{suffix}"
+            for (prefix, suffix), value in zip(self._fragments, formatted)
+            if value is not None
+        ]
+        if not cells:
+            raise ValueError("table row must contain at least one non-null value")
+        return f'{self._head}{resolved_time},"columns":{{{",".join(cells)}}}{tail}'.encode()
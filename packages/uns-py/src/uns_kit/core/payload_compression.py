@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any, Literal, Optional, TypeAlias
+
+PayloadCompression: TypeAlias = Literal["zlib", "zstd"]
+
+# MQTT 5 has no content-encoding property; compressed payloads carry this user property.
+CONTENT_ENCODING_PROPERTY = "content-encoding"
+DEFAULT_COMPRESSION_THRESHOLD = 4096
+# Inbound payloads are rejected when they would inflate beyond this (decompression bombs).
+DEFAULT_MAX_DECOMPRESSED_SIZE = 16 * 1024 * 1024
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+_zstd_module: Any = None
+
+
+def _load_zstd() -> Any:
+    global _zstd_module
+    if _zstd_module is not None:
+        return _zstd_module
+    try:
+        from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+
+        _zstd_module = zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "zstd payload compression is not available. Install it with `pip install zstandard`."
+        ) from exc
+    _zstd_module = zstandard
+    return zstandard
+
+
+def _zstd_compress(module: Any, payload: bytes, level: Optional[int]) -> bytes:
+    if module.__name__ == "zstandard":
+        return module.ZstdCompressor(level=3 if level is None else level).compress(payload)
+    return module.compress(payload, level=level)
+
+
+def _zstd_decompress(module: Any, payload: bytes, max_size: int) -> bytes:
+    if module.__name__ == "zstandard":
+        # Streamed: a one-shot decompress allocates whatever size the frame header claims.
+        with module.ZstdDecompressor().stream_reader(payload) as reader:
+            return _check_size(reader.read(max_size + 1), max_size)
+    decompressor = module.ZstdDecompressor()
+    return _check_size(decompressor.decompress(payload, max_length=max_size + 1), max_size)
+
+
+def _zlib_decompress(payload: bytes, max_size: int) -> bytes:
+    decompressor = zlib.decompressobj()
+    data = _check_size(decompressor.decompress(payload, max_size + 1), max_size)
+    if not decompressor.eof:
+        raise zlib.error("Error -5 while decompressing data: incomplete or truncated stream")
+    return data
+
+
+def _check_size(data: bytes, max_size: int) -> bytes:
+    if len(data) > max_size:
+        raise ValueError(f"Decompressed payload exceeds {max_size} bytes")
+    return data
+
+
+class PayloadCompressor:
+    """Compresses MQTT payloads of at least ``threshold`` bytes with zlib or zstd."""
+
+    def __init__(
+        self,
+        algorithm: PayloadCompression = "zlib",
+        *,
+        threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        level: Optional[int] = None,
+    ) -> None:
+        if algorithm not in ("zlib", "zstd"):
+            raise ValueError(f"Unsupported payload compression '{algorithm}'")
+        self.algorithm: PayloadCompression = algorithm
+        self.threshold = max(0, threshold)
+        self.level = level
+        self._zstd = _load_zstd() if algorithm == "zstd" else None
+
+    def compress(self, payload: bytes) -> Optional[bytes]:
+        """Return the compressed payload, or None when it is below the threshold or does not shrink."""
+        if len(payload) < self.threshold:
+            return None
+        if self.algorithm == "zstd":
+            compressed = _zstd_compress(self._zstd, payload, self.level)
+        else:
+            compressed = zlib.compress(payload, -1 if self.level is None else self.level)
+        return compressed if len(compressed) < len(payload) else None
+
+
+def sniff_payload_compression(payload: bytes) -> Optional[PayloadCompression]:
+    """Guess the compression of a payload from its zlib header or zstd frame magic."""
+    if payload[:4] == _ZSTD_MAGIC:
+        return "zstd"
+    if len(payload) >= 2 and payload[0] == 0x78 and (payload[0] * 256 + payload[1]) % 31 == 0:
+        return "zlib"
+    return None
+
+
+def decompress_payload(
+    payload: bytes,
+    content_encoding: Optional[str] = None,
+    *,
+    sniff: bool = False,
+    max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE,
+) -> bytes:
+    """Undo ``PayloadCompressor.compress``.
+
+    With ``content_encoding`` (from the MQTT 5 user property) the payload must
+    decompress. Without it the payload is returned unchanged, unless ``sniff``
+    guesses the algorithm from the payload (for MQTT 3.1.1 publishers); then
+    anything that fails to decompress is returned unchanged. Output beyond
+    ``max_size`` bytes raises ``ValueError`` either way.
+    """
+    algorithm = content_encoding or (sniff_payload_compression(payload) if sniff else None)
+    if algorithm is None:
+        return payload
+    try:
+        if algorithm == "zlib":
+            return _zlib_decompress(payload, max_size)
+        if algorithm == "zstd":
+            return _zstd_decompress(_load_zstd(), payload, max_size)
+    except ValueError:
+        raise
+    except Exception:
+        if content_encoding is not None:
+            raise
+        return payload
+    if content_encoding is not None:
+        raise ValueError(f"Unsupported payload content-encoding '{content_encoding}'")
+    return payload
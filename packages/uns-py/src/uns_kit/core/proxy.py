@@ -1,22 +1,46 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from .client import UnsMqttClient
 from .events import EventEmitter
+from .logger import get_logger
 from .packet import isoformat
 
+logger = get_logger(__name__)
+
+DEFAULT_REGISTRY_DEBOUNCE_S = 0.5
+
 
 class UnsProxy:
     """
     Base proxy that tracks produced topics and periodically publishes the registry.
+
+    New topics are published to the retained `<status>/topics` registry at most once per
+    `registry_debounce` seconds (0 publishes on every new topic), and only when the
+    serialized registry changed since the last publish on the current connection. The
+    whole registry is still republished every 60 seconds. With
+    `registry_page_size`, the registry is split into retained pages `<status>/topics/<n>`
+    of that many entries, and `<status>/topics` holds `{"pages", "pageSize", "count"}`.
+    Topics are only ever appended, so a new topic republishes just the last page.
     """
 
-    def __init__(self, client: UnsMqttClient, instance_status_topic: str, instance_name: str) -> None:
+    def __init__(
+        self,
+        client: UnsMqttClient,
+        instance_status_topic: str,
+        instance_name: str,
+        *,
+        registry_debounce: float = DEFAULT_REGISTRY_DEBOUNCE_S,
+        registry_page_size: Optional[int] = None,
+    ) -> None:
+        if registry_page_size is not None and registry_page_size <= 0:
+            raise ValueError("registry_page_size must be positive (or None for a single registry message).")
         self._client = client
         self._instance_status_topic = instance_status_topic
         self._instance_name = instance_name
@@ -32,6 +56,14 @@ class UnsProxy:
         self._produced_api_catchall: Dict[str, Dict[str, Any]] = {}
         self._publish_task: Optional[asyncio.Task] = None
         self._running = False
+        self._registry_debounce = max(0.0, registry_debounce)
+        self._registry_page_size = registry_page_size
+        self._registry_timer: Optional[asyncio.TimerHandle] = None
+        self._registry_task: Optional[asyncio.Task[None]] = None
+        # Index of the first topic added since the last publish; None when the registry is unchanged.
+        self._registry_dirty_from: Optional[int] = None
+        self._registry_digests: Dict[str, bytes] = {}
+        self._registry_epoch: Optional[int] = None
 
     async def start(self) -> None:
         if self._running:
@@ -47,39 +79,115 @@ class UnsProxy:
                 await self._publish_task
             except asyncio.CancelledError:
                 pass
+        if self._registry_dirty_from is not None and self._client.is_connected:
+            await self.flush_produced_topics()
+        else:
+            self._cancel_registry_emit()
+
+    async def flush_produced_topics(self) -> None:
+        """Publish pending registry changes now instead of at the end of the debounce window."""
+        self._cancel_registry_emit()
+        await self._emit_produced_topics()
+
+    def _cancel_registry_emit(self) -> None:
+        if self._registry_timer is not None:
+            self._registry_timer.cancel()
+            self._registry_timer = None
+        if self._registry_task is not None and not self._registry_task.done():
+            self._registry_task.cancel()
+        self._registry_task = None
 
     async def _publish_loop(self) -> None:
         while self._running:
-            await self._emit_produced_topics()
+            await self._republish_produced_topics()
             await asyncio.sleep(60)
 
+    async def _republish_produced_topics(self) -> None:
+        # The periodic publish sends the whole registry again, repairing a retained registry
+        # that was cleared or overwritten on the broker; only the debounced updates skip it.
+        if self._produced_topics:
+            self._registry_digests.clear()
+            self._registry_dirty_from = 0
+        await self._emit_produced_topics()
+
+    def _start_registry_emit(self) -> None:
+        self._registry_timer = None
+        self._registry_task = asyncio.create_task(self._emit_debounced())
+
+    async def _emit_debounced(self) -> None:
+        try:
+            await self._emit_produced_topics()
+        except Exception as exc:
+            logger.error("Error publishing the produced topics registry: %s", exc)
+        finally:
+            if self._registry_task is asyncio.current_task():
+                self._registry_task = None
+
     async def _emit_produced_topics(self) -> None:
         if not self._produced_topics:
             return
-        await self.event.emit(
-            "unsProxyProducedTopics",
-            {
-                "producedTopics": list(self._produced_topics.values()),
-                "statusTopic": f"{self._instance_status_topic}topics",
-            },
-        )
-        payload = json.dumps(list(self._produced_topics.values()), separators=(",", ":"))
-        await self._client.publish_raw(
-            f"{self._instance_status_topic}topics",
-            payload,
-            retain=True,
-        )
+        dirty_from = self._registry_dirty_from
+        epoch = self._client.connection_epoch
+        if epoch != self._registry_epoch:
+            # The broker may have lost the retained registry with the connection; publish it all again.
+            self._registry_epoch = epoch
+            self._registry_digests.clear()
+            dirty_from = 0
+        if dirty_from is None:
+            return
+        self._registry_dirty_from = None
+        topics = list(self._produced_topics.values())
+        status_topic = f"{self._instance_status_topic}topics"
+        await self.event.emit("unsProxyProducedTopics", {"producedTopics": topics, "statusTopic": status_topic})
+        page_size = self._registry_page_size
+        try:
+            if page_size is None:
+                await self._publish_registry_part(status_topic, topics)
+                return
+            for start in range(dirty_from // page_size * page_size, len(topics), page_size):
+                await self._publish_registry_part(f"{status_topic}/{start // page_size}", topics[start : start + page_size])
+            pages = -(-len(topics) // page_size)
+            await self._publish_registry_part(status_topic, {"pages": pages, "pageSize": page_size, "count": len(topics)})
+        except BaseException:
+            # Retry the unpublished part with the next emit.
+            self._registry_dirty_from = dirty_from
+            raise
+
+    async def _publish_registry_part(self, topic: str, content: Any) -> None:
+        payload = json.dumps(content, separators=(",", ":"))
+        digest = hashlib.blake2b(payload.encode(), digest_size=16).digest()
+        if self._registry_digests.get(topic) == digest:
+            return
+        await self._client.publish_raw(topic, payload, retain=True)
+        self._registry_digests[topic] = digest
 
     async def register_unique_topic(self, topic_object: Dict[str, Any]) -> None:
-        asset = topic_object.get("asset") or ""
-        object_type = topic_object.get("objectType") or ""
-        object_id = topic_object.get("objectId") or ""
-        attribute = topic_object.get("attribute") or ""
-        full_topic = f"{topic_object.get('topic', '')}{asset}/{object_type}/{object_id}/{attribute}"
-        if full_topic not in self._produced_topics:
-            topic_object.setdefault("timestamp", isoformat(datetime.now(timezone.utc)))
-            self._produced_topics[full_topic] = topic_object
+        await self.register_unique_topics([topic_object])
+
+    async def register_unique_topics(self, topic_objects: Iterable[Dict[str, Any]]) -> None:
+        """Register the new topics among `topic_objects` and publish the registry once if any were added."""
+        produced_topics = self._produced_topics
+        first_added = len(produced_topics)
+        added = False
+        for topic_object in topic_objects:
+            asset = topic_object.get("asset") or ""
+            object_type = topic_object.get("objectType") or ""
+            object_id = topic_object.get("objectId") or ""
+            attribute = topic_object.get("attribute") or ""
+            full_topic = f"{topic_object.get('topic', '')}{asset}/{object_type}/{object_id}/{attribute}"
+            if full_topic not in produced_topics:
+                topic_object.setdefault("timestamp", isoformat(datetime.now(timezone.utc)))
+                produced_topics[full_topic] = topic_object
+                added = True
+        if not added:
+            return
+        if self._registry_dirty_from is None:
+            self._registry_dirty_from = first_added
+        if self._registry_debounce == 0:
             await self._emit_produced_topics()
+        elif self._registry_timer is None:
+            # A timer rather than a sleeping task, so an abandoned proxy leaves no pending task behind.
+            self._registry_timer = asyncio.get_running_loop().call_later(self._registry_debounce, self._start_registry_emit)
 
     async def _emit_produced_api_endpoints(self) -> None:
         await self.event.emit(
@@ -8,11 +8,17 @@ from typing import Any, List, Mapping, Optional
 from ..api.proxy import ApiProxyOptions, UnsApiProxy
 from ..cron.proxy import CronProxyOptions, CronScheduleInput, UnsCronProxy
 from ..version import __version__
-from .client import UnsMqttClient
+from .client import DEFAULT_MAX_INFLIGHT, UnsMqttClient, parse_brokers
+from .inbound_buffer import DEFAULT_INBOUND_MAX_SIZE, InboundPolicy
+from .outbox import DEFAULT_OUTBOX_MAX_BYTES
+from .packet import PacketCodecName
+from .payload_compression import DEFAULT_COMPRESSION_THRESHOLD, PayloadCompression
+from .publish_lanes import DEFAULT_CONTROL_RESERVE
+from .proxy import DEFAULT_REGISTRY_DEBOUNCE_S
 from .runtime_metadata import RUNTIME_METADATA
 from .status_monitor import StatusMonitor
 from .topic_builder import TopicBuilder
-from .uns_mqtt_proxy import UnsMqttProxy
+from .uns_mqtt_proxy import DEFAULT_PUBLISH_BATCH_SIZE, PublishMode, UnsMqttProxy
 
 
 def _pick(mapping: Mapping[str, Any], snake: str, camel: str) -> Any:
@@ -40,7 +46,28 @@ class UnsParameters:
     clean: Optional[bool] = None
     reconnect_period: Optional[int] = None
     publish_concurrency: Optional[int] = None
+    publish_batch_size: Optional[int] = None
+    publish_mode: Optional[PublishMode] = None
+    coalesce_max_rate: Optional[float] = None
     max_pending_publishes: Optional[int] = None
+    mqtt5: Optional[bool] = None
+    packet_codec: Optional[PacketCodecName] = None
+    compression: Optional[PayloadCompression] = None
+    compression_threshold: Optional[int] = None
+    publish_qos: Optional[int] = None
+    max_inflight: Optional[int] = None
+    control_reserve: Optional[int] = None
+    outbox_path: Optional[str] = None
+    outbox_max_bytes: Optional[int] = None
+    outbox_replay_rate: Optional[float] = None
+    topic_aliases: Optional[bool] = None
+    inbound_max_size: Optional[int] = None
+    inbound_policy: Optional[InboundPolicy] = None
+    registry_debounce: Optional[float] = None
+    registry_page_size: Optional[int] = None
+    report_by_exception: Optional[Mapping[str, Any]] = None
+    state_max_entries: Optional[int] = None
+    state_ttl: Optional[float] = None
 
     @staticmethod
     def from_mapping(mapping: Mapping[str, Any]) -> "UnsParameters":
@@ -54,7 +81,28 @@ class UnsParameters:
             clean=mapping.get("clean"),
             reconnect_period=_pick(mapping, "reconnect_period", "reconnectPeriod"),
             publish_concurrency=_pick(mapping, "publish_concurrency", "publishConcurrency"),
+            publish_batch_size=_pick(mapping, "publish_batch_size", "publishBatchSize"),
+            publish_mode=_pick(mapping, "publish_mode", "publishMode"),
+            coalesce_max_rate=_pick(mapping, "coalesce_max_rate", "coalesceMaxRate"),
             max_pending_publishes=_pick(mapping, "max_pending_publishes", "maxPendingPublishes"),
+            mqtt5=mapping.get("mqtt5"),
+            packet_codec=_pick(mapping, "packet_codec", "packetCodec"),
+            compression=mapping.get("compression"),
+            compression_threshold=_pick(mapping, "compression_threshold", "compressionThreshold"),
+            publish_qos=_pick(mapping, "publish_qos", "publishQos"),
+            max_inflight=_pick(mapping, "max_inflight", "maxInflight"),
+            control_reserve=_pick(mapping, "control_reserve", "controlReserve"),
+            outbox_path=_pick(mapping, "outbox_path", "outboxPath"),
+            outbox_max_bytes=_pick(mapping, "outbox_max_bytes", "outboxMaxBytes"),
+            outbox_replay_rate=_pick(mapping, "outbox_replay_rate", "outboxReplayRate"),
+            topic_aliases=_pick(mapping, "topic_aliases", "topicAliases"),
+            inbound_max_size=_pick(mapping, "inbound_max_size", "inboundMaxSize"),
+            inbound_policy=_pick(mapping, "inbound_policy", "inboundPolicy"),
+            registry_debounce=_pick(mapping, "registry_debounce", "registryDebounce"),
+            registry_page_size=_pick(mapping, "registry_page_size", "registryPageSize"),
+            report_by_exception=_pick(mapping, "report_by_exception", "reportByException"),
+            state_max_entries=_pick(mapping, "state_max_entries", "stateMaxEntries"),
+            state_ttl=_pick(mapping, "state_ttl", "stateTtl"),
         )
 
 
@@ -71,6 +119,11 @@ class UnsProcessParameters:
     reconnect_period: Optional[int] = None
     package_name: Optional[str] = None
     package_version: Optional[str] = None
+    # Multiplex instance proxies over the process connection. They then share one read loop:
+    # a proxy's full "block" subscription queues up to `inbound_max_size` more of that proxy's
+    # messages (in memory) before it pauses the others, and the process client's own
+    # subscriptions still pause delivery for every proxy.
+    share_connection: Optional[bool] = None
 
     @staticmethod
     def from_mapping(mapping: Mapping[str, Any]) -> "UnsProcessParameters":
@@ -89,6 +142,7 @@ class UnsProcessParameters:
             reconnect_period=_pick(mapping, "reconnect_period", "reconnectPeriod"),
             package_name=_pick(mapping, "package_name", "packageName"),
             package_version=_pick(mapping, "package_version", "packageVersion"),
+            share_connection=_pick(mapping, "share_connection", "shareConnection"),
         )
 
 
@@ -258,16 +312,25 @@ class UnsProxyProcess:
             if params.reconnect_period is not None
             else 2.0
         )
+        port = _resolve_port(params.port if params.port is not None else self.process_parameters.port)
+        username = params.username if params.username is not None else self.process_parameters.username
+        password = params.password if params.password is not None else self.process_parameters.password
+        tls = _resolve_tls(params.mqtt_ssl if params.mqtt_ssl is not None else self.process_parameters.mqtt_ssl)
+        shared_connection = (
+            self._client
+            if self._can_share_connection(resolved_host, port, username, password, tls, params)
+            else None
+        )
         proxy = UnsMqttProxy(
             resolved_host,
             process_name=self.process_name,
             instance_name=instance_name,
             package_name=self.process_parameters.package_name,
             package_version=self.process_parameters.package_version,
-            port=_resolve_port(params.port if params.port is not None else self.process_parameters.port),
-            username=params.username if params.username is not None else self.process_parameters.username,
-            password=params.password if params.password is not None else self.process_parameters.password,
-            tls=_resolve_tls(params.mqtt_ssl if params.mqtt_ssl is not None else self.process_parameters.mqtt_ssl),
+            port=port,
+            username=username,
+            password=password,
+            tls=tls,
             client_id=resolved_client_id,
             keepalive=params.keepalive if params.keepalive is not None else (self.process_parameters.keepalive or 60),
             clean_session=params.clean if params.clean is not None else (
@@ -275,12 +338,68 @@ class UnsProxyProcess:
             ),
             reconnect_interval=reconnect_interval_s,
             publish_concurrency=params.publish_concurrency if params.publish_concurrency is not None else 32,
+            publish_batch_size=params.publish_batch_size or DEFAULT_PUBLISH_BATCH_SIZE,
+            publish_mode=params.publish_mode or "shared",
+            coalesce_max_rate=params.coalesce_max_rate,
             max_pending_publishes=params.max_pending_publishes,
+            # Topic aliases and the content-encoding property of compressed payloads are MQTT 5 features.
+            mqtt5=bool(params.mqtt5 or params.topic_aliases or params.compression),
+            packet_codec=params.packet_codec or "json",
+            compression=params.compression,
+            compression_threshold=(
+                params.compression_threshold
+                if params.compression_threshold is not None
+                else DEFAULT_COMPRESSION_THRESHOLD
+            ),
+            shared_connection=shared_connection,
+            publish_qos=params.publish_qos or 0,
+            max_inflight=params.max_inflight if params.max_inflight is not None else DEFAULT_MAX_INFLIGHT,
+            control_reserve=params.control_reserve if params.control_reserve is not None else DEFAULT_CONTROL_RESERVE,
+            outbox_path=params.outbox_path,
+            outbox_max_bytes=params.outbox_max_bytes or DEFAULT_OUTBOX_MAX_BYTES,
+            outbox_replay_rate=params.outbox_replay_rate,
+            topic_aliases=bool(params.topic_aliases),
+            inbound_max_size=params.inbound_max_size or DEFAULT_INBOUND_MAX_SIZE,
+            inbound_policy=params.inbound_policy or "block",
+            registry_debounce=(
+                params.registry_debounce if params.registry_debounce is not None else DEFAULT_REGISTRY_DEBOUNCE_S
+            ),
+            registry_page_size=params.registry_page_size,
+            report_by_exception=params.report_by_exception,
+            state_max_entries=params.state_max_entries,
+            state_ttl=params.state_ttl,
         )
         await proxy.connect()
         self._proxies.append(proxy)
         return proxy
 
+    def _can_share_connection(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        tls: bool,
+        params: UnsParameters,
+    ) -> bool:
+        # Proxies ride on the process connection only when they would open an identical one;
+        # an explicit client id or protocol/session override (incl. MQTT 5 topic aliases and compression) still gets its own socket.
+        if not self.process_parameters.share_connection:
+            return False
+        client = self._client
+        return (
+            parse_brokers(host, port) == client.brokers
+            and (username or None) == client.username
+            and (password or None) == client.password
+            and tls == client.tls
+            and not params.client_id
+            and not params.mqtt5
+            and not params.topic_aliases
+            and not params.compression
+            and params.clean is None
+            and params.keepalive is None
+        )
+
     async def createUnsMqttProxy(
         self,
         mqttHost: str,
@@ -3,13 +3,15 @@ from __future__ import annotations
 import asyncio
 import concurrent.futures
 import contextlib
-import queue
 import threading
 from contextlib import AbstractContextManager
-from collections.abc import Coroutine
+from collections.abc import Coroutine, Sequence
+from datetime import datetime
 from typing import Any, Callable, Iterator, Mapping, Optional, TypeVar
 
+from .inbound_buffer import DEFAULT_INBOUND_MAX_SIZE, InboundBuffer, InboundBufferStats, InboundPolicy
 from .proxy_process import UnsMqttProxy, UnsParameters, UnsProcessParameters, UnsProxyProcess
+from .packet import TableTemplate, TableValue
 from .uns_mqtt_proxy import MessageMode
 
 T = TypeVar("T")
@@ -60,14 +62,29 @@ class _LoopThread:
 
 
 class _SyncSubscriptionIterator(Iterator[Any]):
-    _SENTINEL = object()
-
-    def __init__(self, client: Any, loop_thread: _LoopThread, topics: str | list[str], *, resilient: bool) -> None:
+    def __init__(
+        self,
+        client: Any,
+        loop_thread: _LoopThread,
+        topics: str | list[str],
+        *,
+        resilient: bool,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+    ) -> None:
         self._client = client
         self._loop_thread = loop_thread
         self._topics = topics
         self._resilient = resilient
-        self._queue: queue.Queue[Any] = queue.Queue()
+        self._max_size = max_size
+        self._policy = policy
+        # The client subscription gets the same limit and policy and reports the inbound-* metrics;
+        # this hand-off to the consumer thread is bounded alike but not registered, so nothing counts twice.
+        # A full "block" buffer holds the pump, and behind it the subscription and the MQTT read loop.
+        self._buffer = InboundBuffer(
+            max_size if max_size is not None else getattr(client, "inbound_max_size", DEFAULT_INBOUND_MAX_SIZE),
+            policy or getattr(client, "inbound_policy", "block"),
+        )
         self._closed = False
         self._task = self._loop_thread.run(self._create_task())
 
@@ -77,26 +94,32 @@ class _SyncSubscriptionIterator(Iterator[Any]):
     async def _pump_messages(self) -> None:
         try:
             async def emit_message(message: Any) -> None:
-                self._queue.put(message)
+                waiter = self._buffer.put(message)
+                if waiter is not None:
+                    await waiter
 
+            limits = {"max_size": self._max_size, "policy": self._policy}
             if self._resilient:
-                async for message in self._client.resilient_messages(self._topics):  # type: ignore[attr-defined]
+                async for message in self._client.resilient_messages(self._topics, **limits):  # type: ignore[attr-defined]
                     await emit_message(message)
             else:
-                async with self._client.messages(self._topics) as messages:  # type: ignore[attr-defined]
+                async with self._client.messages(self._topics, **limits) as messages:  # type: ignore[attr-defined]
                     async for message in messages:
                         await emit_message(message)
         except asyncio.CancelledError:
             pass
         finally:
-            self._queue.put(self._SENTINEL)
+            self._buffer.close()
 
     def __next__(self) -> Any:
-        item = self._queue.get()
-        if item is self._SENTINEL:
+        item = self._buffer.get_sync()
+        if item is None:
             raise StopIteration
         return item
 
+    def stats(self) -> InboundBufferStats:
+        return self._buffer.stats()
+
     def close(self) -> None:
         if self._closed:
             return
@@ -113,8 +136,17 @@ class _SyncSubscriptionIterator(Iterator[Any]):
 
 
 class SyncMessagesContext(AbstractContextManager["_SyncSubscriptionIterator"]):
-    def __init__(self, client: Any, loop_thread: _LoopThread, topics: str | list[str], *, resilient: bool = False) -> None:
-        self._iterator = _SyncSubscriptionIterator(client, loop_thread, topics, resilient=resilient)
+    def __init__(
+        self,
+        client: Any,
+        loop_thread: _LoopThread,
+        topics: str | list[str],
+        *,
+        resilient: bool = False,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+    ) -> None:
+        self._iterator = _SyncSubscriptionIterator(client, loop_thread, topics, resilient=resilient, max_size=max_size, policy=policy)
 
     def __enter__(self) -> _SyncSubscriptionIterator:
         return self._iterator
@@ -167,6 +199,17 @@ class UnsMqttProxySync:
     def publish_packet(self, topic: str, packet: dict[str, Any], *, timeout: Optional[float] = None) -> None:
         self._loop_thread.run(self._proxy.publish_packet(topic, packet), timeout=timeout)
 
+    def publish_table_row(
+        self,
+        template: TableTemplate,
+        topic: str,
+        values: Sequence[TableValue],
+        *,
+        time: Optional[datetime | str | int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self._loop_thread.run(self._proxy.publish_table_row(template, topic, values, time=time), timeout=timeout)
+
     def publish_mqtt_message(
         self,
         mqtt_message: dict[str, Any],
@@ -176,6 +219,15 @@ class UnsMqttProxySync:
     ) -> None:
         self._loop_thread.run(self._proxy.publish_mqtt_message(mqtt_message, mode), timeout=timeout)
 
+    def publish_many(
+        self,
+        mqtt_messages: Sequence[dict[str, Any]],
+        mode: MessageMode = MessageMode.RAW,
+        *,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self._loop_thread.run(self._proxy.publish_many(mqtt_messages, mode), timeout=timeout)
+
     def drain_publishes(self, *, timeout: Optional[float] = None) -> None:
         self._loop_thread.run(self._proxy.drain_publishes(timeout=timeout), timeout=timeout)
 
@@ -198,11 +250,23 @@ class UnsMqttProxySync:
     ) -> None:
         self._loop_thread.run(self._proxy.close(drain=drain, timeout=timeout), timeout=timeout)
 
-    def messages(self, topics: str | list[str]) -> SyncMessagesContext:
-        return SyncMessagesContext(self.client, self._loop_thread, topics, resilient=False)
+    def messages(
+        self,
+        topics: str | list[str],
+        *,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+    ) -> SyncMessagesContext:
+        return SyncMessagesContext(self.client, self._loop_thread, topics, resilient=False, max_size=max_size, policy=policy)
 
-    def resilient_messages(self, topics: str | list[str]) -> Iterator[Any]:
-        return _SyncSubscriptionIterator(self.client, self._loop_thread, topics, resilient=True)
+    def resilient_messages(
+        self,
+        topics: str | list[str],
+        *,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+    ) -> Iterator[Any]:
+        return _SyncSubscriptionIterator(self.client, self._loop_thread, topics, resilient=True, max_size=max_size, policy=policy)
 
     def subscribe(
         self,
@@ -210,8 +274,12 @@ class UnsMqttProxySync:
         *,
         on_message: Callable[[Any], Any],
         resilient: bool = True,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
     ) -> SyncSubscription:
-        iterator = _SyncSubscriptionIterator(self.client, self._loop_thread, topics, resilient=resilient)
+        iterator = _SyncSubscriptionIterator(
+            self.client, self._loop_thread, topics, resilient=resilient, max_size=max_size, policy=policy
+        )
         return SyncSubscription(iterator, on_message)
 
 
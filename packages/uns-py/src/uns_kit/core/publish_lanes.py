@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Literal, Optional, Tuple
+
+PublishPriority = Literal["control", "data"]
+PUBLISH_PRIORITIES: Tuple[PublishPriority, ...] = ("control", "data")
+# Infra traffic (status, stats, topic registry, endpoints) is published under this prefix.
+CONTROL_TOPIC_PREFIX = "uns-infra/"
+DEFAULT_CONTROL_RESERVE = 4
+
+
+def publish_priority(topic: str) -> PublishPriority:
+    return "control" if topic.startswith(CONTROL_TOPIC_PREFIX) else "data"
+
+
+@dataclass(frozen=True)
+class PublishLaneStats:
+    priority: str
+    in_use: int
+    waiting: int
+    publishes: int
+    max_delay_s: float
+    total_delay_s: float
+
+
+class _Lane:
+    __slots__ = ("in_use", "waiters", "publishes", "total_delay_s", "max_delay_s", "interval_max_delay_s")
+
+    def __init__(self) -> None:
+        self.in_use = 0
+        self.waiters: Deque[asyncio.Future[None]] = deque()
+        self.publishes = 0
+        self.total_delay_s = 0.0
+        self.max_delay_s = 0.0
+        self.interval_max_delay_s: Optional[float] = None
+
+
+class PublishLanes:
+    """
+    Admission of the publishes of one connection, in two priority classes.
+
+    Data publishes may have `data_capacity` publishes on their way at once (QoS 0 until
+    written to the socket, QoS 1/2 until acknowledged); control publishes (status, stats,
+    registry) may use those slots too, plus `reserved` slots of their own, so they always
+    find one. Waiting control publishes are admitted before waiting data, and QoS 0 data is
+    capped like the rest. `record_delay()` collects the head-of-line delay (the wait for a slot) of each class; `collect()` reports the largest since the previous
+    call, like the other client status stats.
+    """
+
+    def __init__(self, data_capacity: int, reserved: int = DEFAULT_CONTROL_RESERVE) -> None:
+        if reserved < 0:
+            raise ValueError("Control reserve must not be negative.")
+        self.reserved = reserved
+        self.data_capacity = max(1, data_capacity)
+        self._lanes: Dict[str, _Lane] = {priority: _Lane() for priority in PUBLISH_PRIORITIES}
+        self._waiting = 0
+
+    def try_acquire(self, priority: PublishPriority) -> bool:
+        """Take a slot without waiting if one is free and nobody of the class is queued."""
+        lane = self._lanes[priority]
+        if lane.waiters or not self._has_room(priority):
+            return False
+        lane.in_use += 1
+        return True
+
+    async def acquire(self, priority: PublishPriority) -> None:
+        if self.try_acquire(priority):
+            return
+        lane = self._lanes[priority]
+        waiter = asyncio.get_running_loop().create_future()
+        lane.waiters.append(waiter)
+        self._waiting += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just before the cancellation: hand the slot on.
+                self.release(priority)
+            else:
+                with contextlib.suppress(ValueError):
+                    lane.waiters.remove(waiter)
+                    self._waiting -= 1
+            raise
+
+    def release(self, priority: PublishPriority) -> None:
+        self._lanes[priority].in_use -= 1
+        if self._waiting:
+            self._admit_waiters()
+
+    def set_data_capacity(self, data_capacity: int) -> None:
+        self.data_capacity = max(1, data_capacity)
+        self._admit_waiters()
+
+    def record_delay(self, priority: PublishPriority, delay_s: float) -> None:
+        lane = self._lanes[priority]
+        lane.publishes += 1
+        lane.total_delay_s += delay_s
+        if delay_s > lane.max_delay_s:
+            lane.max_delay_s = delay_s
+        if lane.interval_max_delay_s is None or delay_s > lane.interval_max_delay_s:
+            lane.interval_max_delay_s = delay_s
+
+    def stats(self) -> Dict[str, PublishLaneStats]:
+        return {
+            priority: PublishLaneStats(
+                priority=priority,
+                in_use=lane.in_use,
+                waiting=len(lane.waiters),
+                publishes=lane.publishes,
+                max_delay_s=lane.max_delay_s,
+                total_delay_s=lane.total_delay_s,
+            )
+            for priority, lane in self._lanes.items()
+        }
+
+    def collect(self) -> Dict[str, Tuple[float, Optional[str]]]:
+        metrics: Dict[str, Tuple[float, Optional[str]]] = {}
+        for priority, lane in self._lanes.items():
+            if lane.interval_max_delay_s is not None:
+                metrics[f"publish-delay-{priority}"] = (round(lane.interval_max_delay_s * 1000, 1), "ms")
+                lane.interval_max_delay_s = None
+        return metrics
+
+    def _has_room(self, priority: PublishPriority) -> bool:
+        control, data = self._lanes["control"], self._lanes["data"]
+        if priority == "data":
+            return data.in_use < self.data_capacity
+        return control.in_use + data.in_use < self.data_capacity + self.reserved
+
+    def _admit_waiters(self) -> None:
+        for priority in PUBLISH_PRIORITIES:
+            lane = self._lanes[priority]
+            while lane.waiters and self._has_room(priority):
+                waiter = lane.waiters.popleft()
+                self._waiting -= 1
+                if waiter.done():
+                    continue
+                lane.in_use += 1
+                waiter.set_result(None)
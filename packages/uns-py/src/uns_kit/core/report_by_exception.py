@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .topic_state import TopicStateStore
+
+
+@dataclass(frozen=True)
+class ReportByException:
+    """
+    Report-by-exception settings of a data attribute.
+
+    A value is published when it differs from the last *published* value by more than
+    every configured deadband: `deadband` is absolute, `deadband_percent` is relative to
+    the last published value (any change from 0 publishes). Without deadbands any change
+    publishes. String values (states, modes) publish when they change, and a changed uom
+    always publishes. Changes arriving less than `min_interval_ms` after the last
+    publish are held back until a later value arrives.
+
+    `max_silence_ms` (defaulting to the attribute's `expectedIntervalMs`) forces a
+    heartbeat: an unchanged value is republished at the last poll that keeps the gap
+    between publishes within it, assuming a steady poll rate.
+    """
+
+    deadband: Optional[float] = None
+    deadband_percent: Optional[float] = None
+    min_interval_ms: int = 0
+    max_silence_ms: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.deadband is not None and self.deadband < 0:
+            raise ValueError("Report-by-exception deadband must not be negative.")
+        if self.deadband_percent is not None and self.deadband_percent < 0:
+            raise ValueError("Report-by-exception deadband_percent must not be negative.")
+        if self.min_interval_ms < 0:
+            raise ValueError("Report-by-exception min_interval_ms must not be negative.")
+        if self.max_silence_ms is not None and self.max_silence_ms < self.min_interval_ms:
+            raise ValueError("Report-by-exception max_silence_ms must not be below min_interval_ms.")
+
+    @classmethod
+    def from_value(cls, value: Any) -> Optional["ReportByException"]:
+        """Settings from an instance, a mapping (snake_case or camelCase keys), True (defaults) or None/False (off)."""
+        if value is None or value is False:
+            return None
+        if value is True:
+            return cls()
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, Mapping):
+            raise ValueError("reportByException must be a mapping, a boolean or None.")
+        return cls(
+            deadband=value.get("deadband"),
+            deadband_percent=_pick(value, "deadband_percent", "deadbandPercent"),
+            min_interval_ms=_pick(value, "min_interval_ms", "minIntervalMs") or 0,
+            max_silence_ms=_pick(value, "max_silence_ms", "maxSilenceMs"),
+        )
+
+
+def _pick(mapping: Mapping[str, Any], snake: str, camel: str) -> Any:
+    if snake in mapping:
+        return mapping.get(snake)
+    return mapping.get(camel)
+
+
+@dataclass(frozen=True)
+class ReportByExceptionStats:
+    topics: int
+    published: int
+    suppressed: int
+    heartbeats: int
+
+
+class _Reported:
+    """Last published value of one topic and the time of the last poll."""
+
+    __slots__ = ("value", "uom", "time_ms", "seen_ms")
+
+    def __init__(self, value: Any, uom: Optional[str], time_ms: int) -> None:
+        self.value = value
+        self.uom = uom
+        self.time_ms = time_ms
+        self.seen_ms = time_ms
+
+
+class ExceptionReporter:
+    """
+    Per-topic report-by-exception state of one proxy.
+
+    `published`, `suppressed` and `heartbeats` count since creation; `collect()` reports the
+    counts since the previous call, like the other client status stats. The state table takes
+    the proxy's `max_entries`/`ttl` bounds; an evicted topic publishes its next value.
+    """
+
+    def __init__(self, *, max_entries: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        self.states: TopicStateStore[str, _Reported] = TopicStateStore(
+            max_entries=max_entries, ttl=ttl, entry_bytes=sys.getsizeof(_Reported(0.0, None, 0)) + 2 * sys.getsizeof(2**40)
+        )
+        self.published = 0
+        self.suppressed = 0
+        self.heartbeats = 0
+        self._collected = (0, 0, 0)
+
+    def should_publish(
+        self,
+        topic: str,
+        value: Any,
+        uom: Optional[str],
+        time_ms: int,
+        settings: ReportByException,
+        expected_interval_ms: Optional[int] = None,
+    ) -> bool:
+        last = self.states.get(topic)
+        if last is None:
+            self.states[topic] = _Reported(value, uom, time_ms)
+            self.published += 1
+            return True
+        elapsed = time_ms - last.time_ms
+        poll_gap = time_ms - last.seen_ms
+        last.seen_ms = time_ms
+        if elapsed >= settings.min_interval_ms and self._changed(last, value, uom, settings):
+            self.published += 1
+        else:
+            silence = settings.max_silence_ms if settings.max_silence_ms is not None else expected_interval_ms
+            if silence is None or (elapsed < silence and elapsed + poll_gap <= silence):
+                self.suppressed += 1
+                return False
+            self.published += 1
+            self.heartbeats += 1
+        last.value = value
+        last.uom = uom
+        last.time_ms = time_ms
+        return True
+
+    @staticmethod
+    def _changed(last: _Reported, value: Any, uom: Optional[str], settings: ReportByException) -> bool:
+        if uom != last.uom:
+            return True
+        previous = last.value
+        if isinstance(value, str) or isinstance(previous, str):
+            return value != previous
+        change = abs(value - previous)
+        if settings.deadband is None and settings.deadband_percent is None:
+            return change != 0
+        if settings.deadband is not None and not change > settings.deadband:
+            return False
+        if settings.deadband_percent is not None and previous != 0:
+            return change > abs(previous) * settings.deadband_percent / 100
+        return change != 0
+
+    def stats(self) -> ReportByExceptionStats:
+        return ReportByExceptionStats(
+            topics=len(self.states),
+            published=self.published,
+            suppressed=self.suppressed,
+            heartbeats=self.heartbeats,
+        )
+
+    def collect(self) -> Dict[str, Tuple[float, Optional[str]]]:
+        published, suppressed, heartbeats = self._collected
+        self._collected = (self.published, self.suppressed, self.heartbeats)
+        return {
+            "rbe-published": (self.published - published, None),
+            "rbe-suppressed": (self.suppressed - suppressed, None),
+            "rbe-heartbeats": (self.heartbeats - heartbeats, None),
+        }
@@ -71,8 +71,8 @@ class StatusMonitor:
                 uom="MB",
                 time=time,
             )
-            await self._client.publish_raw(heap_used_topic, UnsPacket.to_json(heap_used_packet))
-            await self._client.publish_raw(heap_total_topic, UnsPacket.to_json(heap_total_packet))
+            await self._client.publish_raw(heap_used_topic, UnsPacket.to_bytes(heap_used_packet))
+            await self._client.publish_raw(heap_total_topic, UnsPacket.to_bytes(heap_total_packet))
             await asyncio.sleep(self._interval_s)
 
     async def _publish_active_loop(self) -> None:
@@ -84,5 +84,5 @@ class StatusMonitor:
                 uom="bit",
                 time=time,
             )
-            await self._client.publish_raw(topic, UnsPacket.to_json(active_packet))
+            await self._client.publish_raw(topic, UnsPacket.to_bytes(active_packet))
             await asyncio.sleep(self._interval_s)
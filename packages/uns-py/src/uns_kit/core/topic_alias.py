@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class TopicAliasStats:
+    maximum: int
+    size: int
+    hits: int
+    assignments: int
+    evictions: int
+    bypassed: int
+
+
+class TopicAliasTable:
+    """
+    Outgoing MQTT 5 topic alias table for one connection.
+
+    Holds at most `maximum` aliases (the broker's topic-alias-maximum) with LRU
+    replacement. `resolve(topic)` returns the (topic, alias) pair to put on the wire: the
+    first publish of a topic carries the full topic plus the alias it is being bound to,
+    later publishes send an empty topic and only the alias. When the table is full the
+    least recently used topic gives up its alias number, which is re-bound by sending it
+    with the new topic, but only if it has been idle for more than `2 * maximum` lookups.
+    Otherwise the new topic is sent in full without an alias, so cycling through more
+    topics than aliases keeps the hot set instead of thrashing. A fresh table must be used
+    for every new connection, because the broker forgets all aliases when the connection
+    ends.
+    """
+
+    def __init__(self, maximum: int) -> None:
+        self.maximum = max(0, maximum)
+        # topic -> [alias, lookup clock of the last use], least recently used first.
+        self._aliases: OrderedDict[str, list[int]] = OrderedDict()
+        self._clock = 0
+        self._hits = 0
+        self._assignments = 0
+        self._evictions = 0
+        self._bypassed = 0
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def resolve(self, topic: str) -> Tuple[str, Optional[int]]:
+        if self.maximum == 0:
+            return topic, None
+        self._clock += 1
+        aliases = self._aliases
+        entry = aliases.get(topic)
+        if entry is not None:
+            aliases.move_to_end(topic)
+            entry[1] = self._clock
+            self._hits += 1
+            return "", entry[0]
+        if len(aliases) < self.maximum:
+            alias = len(aliases) + 1
+        else:
+            victim = next(iter(aliases.values()))
+            if self._clock - victim[1] <= 2 * self.maximum:
+                self._bypassed += 1
+                return topic, None
+            _, (alias, _) = aliases.popitem(last=False)
+            self._evictions += 1
+        aliases[topic] = [alias, self._clock]
+        self._assignments += 1
+        return topic, alias
+
+    def stats(self) -> TopicAliasStats:
+        return TopicAliasStats(
+            maximum=self.maximum,
+            size=len(self._aliases),
+            hits=self._hits,
+            assignments=self._assignments,
+            evictions=self._evictions,
+            bypassed=self._bypassed,
+        )
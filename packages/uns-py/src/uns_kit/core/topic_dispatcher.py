@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+import aiomqtt
+
+from .inbound_buffer import InboundBuffer, InboundBufferStats, InboundPolicy
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    from .client import UnsMqttClient
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+MessageHandler = Callable[[aiomqtt.Message], Any]
+
+
+def validate_topic_filter(topic_filter: str) -> List[str]:
+    """Split an MQTT topic filter into levels, rejecting misplaced `+`/`#` wildcards."""
+    if not topic_filter:
+        raise ValueError("Topic filter must not be empty.")
+    levels = topic_filter.split("/")
+    for index, level in enumerate(levels):
+        if level == "#":
+            if index != len(levels) - 1:
+                raise ValueError(f"'#' must be the last level of topic filter {topic_filter!r}.")
+        elif level != "+" and ("#" in level or "+" in level):
+            raise ValueError(f"Wildcards must occupy a whole level in topic filter {topic_filter!r}.")
+    return levels
+
+
+class _TrieNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.values: List[Any] = []
+
+
+class TopicTrie(Generic[T]):
+    """
+    MQTT topic filter trie.
+
+    Values are registered under topic filters (with `+`/`#` wildcards) and `match(topic)`
+    returns the values of every matching filter. Matching walks one trie level per topic
+    level, so its cost depends on topic depth and wildcard fan-out, not on the number of
+    registered filters. Follows MQTT semantics: `a/#` also matches `a`, and wildcards in
+    the first level do not match `$`-prefixed topics.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, topic_filter: str, value: T) -> None:
+        node = self._root
+        for level in validate_topic_filter(topic_filter):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TrieNode()
+            node = child
+        node.values.append(value)
+        self._size += 1
+
+    def remove(self, topic_filter: str, value: T) -> bool:
+        path: List[Tuple[_TrieNode, str]] = []
+        node = self._root
+        for level in validate_topic_filter(topic_filter):
+            child = node.children.get(level)
+            if child is None:
+                return False
+            path.append((node, level))
+            node = child
+        try:
+            node.values.remove(value)
+        except ValueError:
+            return False
+        self._size -= 1
+        # Prune branches left without values or children.
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.values or child.children:
+                break
+            del parent.children[level]
+        return True
+
+    def match(self, topic: str) -> List[T]:
+        levels = topic.split("/")
+        system_topic = topic.startswith("$")
+        matches: List[T] = []
+        nodes = [self._root]
+        for index, level in enumerate(levels):
+            wildcards = not (index == 0 and system_topic)
+            next_nodes: List[_TrieNode] = []
+            for node in nodes:
+                children = node.children
+                if wildcards:
+                    multi = children.get("#")
+                    if multi is not None:
+                        matches.extend(multi.values)
+                    single = children.get("+")
+                    if single is not None:
+                        next_nodes.append(single)
+                child = children.get(level)
+                if child is not None:
+                    next_nodes.append(child)
+            if not next_nodes:
+                return matches
+            nodes = next_nodes
+        for node in nodes:
+            matches.extend(node.values)
+            multi = node.children.get("#")
+            if multi is not None:
+                matches.extend(multi.values)
+        return matches
+
+
+class TopicSubscription:
+    """
+    One consumer registered on a `TopicDispatcher`.
+
+    Without a handler, matching messages are queued in an `InboundBuffer` and read by
+    iterating the subscription (`async for msg in subscription`). Iteration ends once the
+    subscription is closed and the buffer is drained.
+    """
+
+    def __init__(
+        self,
+        dispatcher: "TopicDispatcher",
+        topic_filters: Tuple[str, ...],
+        handler: Optional[MessageHandler],
+        buffer: Optional[InboundBuffer] = None,
+        channel: Optional[object] = None,
+        max_backlog: Optional[int] = None,
+    ) -> None:
+        self.topic_filters = topic_filters
+        self.handler = handler
+        self.channel = channel
+        # Deliveries of this subscription its channel may hold back while another one is waiting.
+        self.max_backlog = max_backlog
+        self.closed = False
+        self._dispatcher = dispatcher
+        self._buffer = buffer if buffer is not None else InboundBuffer(None)
+
+    def _deliver(self, message: aiomqtt.Message) -> Any:
+        if self.handler is not None:
+            return self.handler(message)
+        return self._buffer.put(message)
+
+    def _finish(self) -> None:
+        self.closed = True
+        self._buffer.close()
+
+    def stats(self) -> InboundBufferStats:
+        return self._buffer.stats()
+
+    def __aiter__(self) -> "TopicSubscription":
+        return self
+
+    async def __anext__(self) -> aiomqtt.Message:
+        message = await self._buffer.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def close(self) -> None:
+        await self._dispatcher.unsubscribe(self)
+
+    async def __aenter__(self) -> "TopicSubscription":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+
+class TopicDispatcher:
+    """
+    Routes the messages of one MQTT connection to any number of subscriptions.
+
+    A single read loop consumes the aiomqtt message stream, so concurrent subscribers no
+    longer compete for the same iterator. Broker subscriptions are reference counted per
+    topic filter: the filter is subscribed for its first subscriber, unsubscribed after the
+    last one leaves and re-subscribed after every reconnect. Messages are routed through a
+    `TopicTrie`; a subscription with several overlapping filters receives each message once.
+
+    Subscriptions made for a `channel` (a client sharing the connection) do not hold up the
+    read loop: when one of them has to wait (a full "block" buffer, a slow async handler),
+    that channel's later deliveries queue behind it, in order, and a task of its own waits
+    for them, so one slow proxy does not stall the others on the socket. That backlog is
+    bounded by each subscription's `max_size` and handled by its policy: "block" pauses the
+    read loop until the channel catches up, the drop policies discard the subscription's
+    oldest held-back message (or, with "drop-newest", the incoming one) and count it as
+    dropped.
+    """
+
+    def __init__(self, client: "UnsMqttClient") -> None:
+        self._client = client
+        self._trie: TopicTrie[TopicSubscription] = TopicTrie()
+        self._refcounts: Dict[str, int] = {}
+        self._subscriptions: List[TopicSubscription] = []
+        self._connection: Optional[aiomqtt.Client] = None
+        self._task: Optional[asyncio.Task] = None
+        # Deliveries of channels that are waiting for a slow subscription, with their pump tasks.
+        self._backlogs: Dict[object, Deque[Tuple[TopicSubscription, aiomqtt.Message]]] = {}
+        self._pumps: Dict[object, asyncio.Task] = {}
+        self._backlog_room: Dict[object, asyncio.Event] = {}
+
+    @property
+    def topic_filters(self) -> List[str]:
+        """Topic filters currently subscribed on the broker."""
+        return list(self._refcounts)
+
+    def refcount(self, topic_filter: str) -> int:
+        return self._refcounts.get(topic_filter, 0)
+
+    async def subscribe(
+        self,
+        topics: str | Iterable[str],
+        handler: Optional[MessageHandler] = None,
+        *,
+        max_size: Optional[int] = None,
+        policy: Optional[InboundPolicy] = None,
+        channel: Optional[object] = None,
+    ) -> TopicSubscription:
+        """
+        Register a subscription for one or more topic filters.
+
+        `handler` is called from the read loop for each matching message (awaited if it
+        returns an awaitable), so it should not block. Without a handler, iterate the
+        returned subscription instead; its buffer holds up to `max_size` messages handled
+        by `policy` (the client's `inbound_max_size`/`inbound_policy` by default). A full
+        "block" buffer pauses the read loop, and so every subscription of the connection,
+        unless the subscription belongs to a `channel`; then it pauses only that channel
+        until another `max_size` messages are held back for it.
+        """
+        topic_filters = tuple(dict.fromkeys([topics] if isinstance(topics, str) else topics))
+        for topic_filter in topic_filters:
+            validate_topic_filter(topic_filter)
+        buffer = None if handler is not None else self._client._new_inbound_buffer(max_size, policy)
+        max_backlog = buffer.max_size if buffer is not None else self._client.inbound_max_size
+        subscription = TopicSubscription(self, topic_filters, handler, buffer, channel, max_backlog)
+        new_filters = []
+        for topic_filter in topic_filters:
+            self._trie.add(topic_filter, subscription)
+            count = self._refcounts.get(topic_filter, 0)
+            if count == 0:
+                new_filters.append(topic_filter)
+            self._refcounts[topic_filter] = count + 1
+        self._subscriptions.append(subscription)
+
+        try:
+            await self._client._ensure_connected()
+            connection = self._client._client
+            assert connection is not None
+            if connection is self._connection:
+                for topic_filter in new_filters:
+                    await connection.subscribe(topic_filter)
+            else:
+                await self._attach(connection)
+        except aiomqtt.MqttError:
+            await self.unsubscribe(subscription)
+            raise
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._read_loop())
+        return subscription
+
+    async def unsubscribe(self, subscription: TopicSubscription) -> None:
+        if subscription.closed:
+            return
+        subscription._finish()
+        with contextlib.suppress(ValueError):
+            self._subscriptions.remove(subscription)
+        released = []
+        for topic_filter in subscription.topic_filters:
+            self._trie.remove(topic_filter, subscription)
+            count = self._refcounts.get(topic_filter, 0) - 1
+            if count > 0:
+                self._refcounts[topic_filter] = count
+            else:
+                self._refcounts.pop(topic_filter, None)
+                released.append(topic_filter)
+        connection = self._connection
+        if connection is not None:
+            for topic_filter in released:
+                # Best-effort unsubscribe; failure isn't fatal (e.g. disconnect while shutting down).
+                with contextlib.suppress(Exception):
+                    await connection.unsubscribe(topic_filter)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for pump in list(self._pumps.values()):
+            pump.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await pump
+        for subscription in list(self._subscriptions):
+            subscription._finish()
+        self._subscriptions.clear()
+        self._refcounts.clear()
+        self._trie = TopicTrie()
+        self._connection = None
+
+    async def dispatch(self, message: aiomqtt.Message) -> int:
+        """Deliver one message to every matching subscription; returns the number of deliveries."""
+        self._client._prepare_message(message)
+        matched = self._trie.match(str(message.topic))
+        if not matched:
+            return 0
+        if len(matched) > 1:
+            matched = list(dict.fromkeys(matched))
+        backlogs = self._backlogs
+        for subscription in matched:
+            channel = subscription.channel
+            if channel is not None and channel in backlogs:
+                if not await self._make_backlog_room(subscription):
+                    continue
+                backlog = backlogs.get(channel)
+                if backlog is not None:
+                    backlog.append((subscription, message))
+                    continue
+            try:
+                result = subscription._deliver(message)
+                if inspect.isawaitable(result):
+                    if channel is None:
+                        await result
+                    else:
+                        backlogs[channel] = deque()
+                        self._backlog_room[channel] = asyncio.Event()
+                        self._pumps[channel] = asyncio.create_task(self._pump_channel(channel, result, message))
+            except Exception:
+                logger.exception("Message handler failed for %s", message.topic)
+        return len(matched)
+
+    async def _make_backlog_room(self, subscription: TopicSubscription) -> bool:
+        """Apply the subscription's policy to a full channel backlog; False when the message is dropped."""
+        channel = subscription.channel
+        limit = subscription.max_backlog
+        backlog = self._backlogs[channel]
+        if limit is None or len(backlog) < limit:
+            return True
+        buffer = subscription._buffer
+        if buffer.policy == "block":
+            room = self._backlog_room[channel]
+            while channel in self._backlogs and len(backlog) >= limit:
+                room.clear()
+                await room.wait()
+            return True
+        if buffer.policy != "drop-newest":
+            for index, (queued, _) in enumerate(backlog):
+                if queued is subscription:
+                    del backlog[index]
+                    buffer._drop()
+                    return True
+        buffer._drop()
+        return False
+
+    async def _pump_channel(self, channel: object, pending: Any, message: aiomqtt.Message) -> None:
+        backlog = self._backlogs[channel]
+        room = self._backlog_room[channel]
+        try:
+            while True:
+                try:
+                    await pending
+                except Exception:
+                    logger.exception("Message handler failed for %s", message.topic)
+                while backlog:
+                    subscription, message = backlog.popleft()
+                    room.set()
+                    try:
+                        pending = subscription._deliver(message)
+                    except Exception:
+                        logger.exception("Message handler failed for %s", message.topic)
+                        continue
+                    if inspect.isawaitable(pending):
+                        break
+                else:
+                    return
+        finally:
+            del self._backlogs[channel]
+            del self._pumps[channel]
+            del self._backlog_room[channel]
+            room.set()
+
+    async def _attach(self, connection: aiomqtt.Client) -> None:
+        # A new connection (first use or after a reconnect) carries no subscriptions yet.
+        self._connection = connection
+        for topic_filter in list(self._refcounts):
+            await connection.subscribe(topic_filter)
+
+    async def _read_loop(self) -> None:
+        client = self._client
+        while not client._closing:
+            try:
+                await client._ensure_connected()
+                connection = client._client
+                if connection is None:
+                    return
+                if connection is not self._connection:
+                    await self._attach(connection)
+                messages = connection.messages
+                try:
+                    async for message in messages:
+                        await self.dispatch(message)
+                finally:
+                    with contextlib.suppress(Exception):
+                        await messages.aclose()
+                raise aiomqtt.MqttError("MQTT message stream ended")
+            except aiomqtt.MqttError:
+                self._connection = None
+                client._connected.clear()
+                await asyncio.sleep(client.reconnect_interval)
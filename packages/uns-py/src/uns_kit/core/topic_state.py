@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Approximate cost of one OrderedDict entry (hash slot, index and order link) on CPython 3.11.
+_SLOT_BYTES = 100
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class TopicStateStats:
+    entries: int
+    approx_bytes: int
+    evicted: int
+
+
+class TopicStateStore(Generic[K, V]):
+    """
+    Per-topic state (last values, sequence ids, resolved identities) with optional bounds.
+
+    `max_entries` evicts the least recently used entries beyond it. `ttl` (seconds) drops
+    entries unused for between one and two `ttl`: entries live in a young and an old
+    generation, every `ttl` the old one is dropped and the young one becomes old, and
+    using an old entry moves it back, so no per-entry timestamp is kept. Without bounds it
+    behaves like a dict.
+
+    `approx_bytes` counts the keys, one dict slot per entry and `entry_bytes`, the caller's
+    estimate for one value.
+    """
+
+    def __init__(self, *, max_entries: Optional[int] = None, ttl: Optional[float] = None, entry_bytes: int = 0) -> None:
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("State max_entries must be positive (or None for unbounded).")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("State ttl must be positive (or None to keep entries).")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evicted = 0
+        self._entry_bytes = entry_bytes
+        self._key_bytes = 0
+        self._young: OrderedDict[K, V] = OrderedDict()
+        self._old: Dict[K, V] = {}
+        self._lru = max_entries is not None
+        self._rotate_at = time.monotonic() + ttl if ttl is not None else None
+
+    def __len__(self) -> int:
+        return len(self._young) + len(self._old)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._young or key in self._old
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        young = self._young
+        value = young.get(key, _MISSING)
+        if value is not _MISSING:
+            if self._lru:
+                young.move_to_end(key)
+            return value  # type: ignore[return-value]
+        if self._rotate_at is not None:
+            self._expire()
+            value = self._old.pop(key, _MISSING)
+            if value is not _MISSING:
+                self._young[key] = value  # type: ignore[assignment]
+                return value  # type: ignore[return-value]
+        return default
+
+    def __setitem__(self, key: K, value: V) -> None:
+        young = self._young
+        if key in young:
+            young[key] = value
+            if self._lru:
+                young.move_to_end(key)
+            return
+        if self._rotate_at is not None:
+            self._expire()
+        if self._old.pop(key, _MISSING) is _MISSING:
+            self._key_bytes += sys.getsizeof(key)
+        self._young[key] = value
+        if self.max_entries is not None and len(self) > self.max_entries:
+            self._evict_oldest()
+
+    def stats(self) -> TopicStateStats:
+        entries = len(self)
+        return TopicStateStats(
+            entries=entries,
+            approx_bytes=self._key_bytes + entries * (_SLOT_BYTES + self._entry_bytes),
+            evicted=self.evicted,
+        )
+
+    def _evict_oldest(self) -> None:
+        if self._old:
+            key = next(iter(self._old))
+            del self._old[key]
+        else:
+            key, _ = self._young.popitem(last=False)
+        self._key_bytes -= sys.getsizeof(key)
+        self.evicted += 1
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        assert self._rotate_at is not None and self.ttl is not None
+        if now < self._rotate_at:
+            return
+        dropped = [self._old]
+        if now >= self._rotate_at + self.ttl:
+            # Idle for more than a whole generation: the young entries are stale too.
+            dropped.append(self._young)
+            self._old = {}
+        else:
+            self._old = self._young
+        self._young = OrderedDict()
+        for generation in dropped:
+            self._key_bytes -= sum(sys.getsizeof(key) for key in generation)
+            self.evicted += len(generation)
+        self._rotate_at = now + self.ttl
@@ -1,20 +1,44 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import sys
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
-from collections.abc import Awaitable
-from typing import Any, Dict, Optional
+from pathlib import Path
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, Dict, Literal, Mapping, Optional
 
-from .client import UnsMqttClient
+from .client import DEFAULT_CONNECT_TIMEOUT, DEFAULT_MAX_INFLIGHT, MqttError, UnsMqttClient
+from .publish_lanes import DEFAULT_CONTROL_RESERVE
 from .logger import get_logger
-from .packet import UnsPacket, isoformat
-from .proxy import UnsProxy
+from .inbound_buffer import DEFAULT_INBOUND_MAX_SIZE, InboundPolicy
+from .outbox import DEFAULT_OUTBOX_MAX_BYTES, MAX_PENDING_APPENDS, OutboxStats, PublishOutbox
+from .packet import (
+    PacketCodecName,
+    TableTemplate,
+    TableValue,
+    UnsPacket,
+    _epoch_ms,
+    _epoch_ms_from_iso,
+    _iso_from_epoch_ms,
+    _now_epoch_ms,
+)
+from .payload_compression import DEFAULT_COMPRESSION_THRESHOLD, PayloadCompression
+from .proxy import DEFAULT_REGISTRY_DEBOUNCE_S, UnsProxy
+from .report_by_exception import ExceptionReporter, ReportByException, ReportByExceptionStats
 from .topic_builder import TopicBuilder
+from .topic_state import TopicStateStats, TopicStateStore
 
 logger = get_logger(__name__)
 
+DEFAULT_PUBLISH_BATCH_SIZE = 64
+# "shared": all workers serve one queue; "sharded": one queue per worker, picked by topic hash;
+# "coalesce": sharded, keeping only the newest pending publish of each topic.
+PublishMode = Literal["shared", "sharded", "coalesce"]
+PUBLISH_MODES = ("shared", "sharded", "coalesce")
+
 
 class MessageMode(str, Enum):
     RAW = "raw"
@@ -24,17 +48,184 @@ class MessageMode(str, Enum):
     BOTH = "both"
 
 
-@dataclass
+@dataclass(slots=True)
 class LastValueEntry:
     value: Any
     uom: Optional[str]
-    timestamp: datetime
+    timestamp_ms: int
+
+
+@dataclass(slots=True)
+class _TopicIdentity:
+    """Resolved identity of one (topic, asset, objectType, objectId, attribute) as given by callers."""
+
+    base_topic: str
+    asset: Optional[str]
+    object_type: Optional[str]
+    object_id: str
+    publish_topic: str
+    registered: bool = False
+
+
+# Rough per-entry sizes for the state accounting: a last value (a float and an epoch ms), a
+# sequence id and a resolved identity (its strings are shared with the keys).
+_LAST_VALUE_BYTES = sys.getsizeof(LastValueEntry(0.0, None, 0)) + sys.getsizeof(0.0) + sys.getsizeof(2**40)
+_SEQUENCE_ID_BYTES = sys.getsizeof(2**20)
+_IDENTITY_BYTES = sys.getsizeof(_TopicIdentity("", None, None, "", ""))
 
 
 @dataclass
 class QueuedPublish:
     topic: str
     payload: str | bytes
+    content_type: Optional[str] = None
+
+
+class _PublishQueue(asyncio.Queue):
+    def requeue(self, items: Sequence[QueuedPublish | None]) -> None:
+        """Put items a worker took but did not publish back at the front, in order."""
+        for item in reversed(items):
+            self._queue.appendleft(item)  # type: ignore[attr-defined]
+        for _ in items:
+            self._wakeup_next(self._getters)  # type: ignore[attr-defined]
+
+    def fits(self, items: Sequence[QueuedPublish]) -> bool:
+        """Whether `put_many(items)` stays within `maxsize`."""
+        return not self.maxsize or self.maxsize - self.qsize() >= len(items)
+
+    def put_many(self, items: Sequence[QueuedPublish]) -> None:
+        """Append a batch in one go; the caller has checked that it fits."""
+        self._queue.extend(items)  # type: ignore[attr-defined]
+        self._unfinished_tasks += len(items)  # type: ignore[attr-defined]
+        self._finished.clear()  # type: ignore[attr-defined]
+        for _ in range(min(len(items), len(self._getters))):  # type: ignore[attr-defined]
+            self._wakeup_next(self._getters)  # type: ignore[attr-defined]
+
+
+class _CoalescingPublishQueue(_PublishQueue):
+    """
+    Publish queue holding at most one pending publish per topic.
+
+    A newer publish replaces the pending one of its topic in place, keeping the topic's
+    place in line, so the queue never holds more entries than there are topics. Replaced
+    publishes count in `superseded` and are reported to `on_superseded`. With
+    `min_interval` > 0 each topic is handed out at most once per interval; a publish
+    arriving sooner waits (and coalesces) until its topic is due.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 0,
+        min_interval: float = 0.0,
+        on_superseded: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._min_interval = min_interval
+        self._on_superseded = on_superseded
+        self._deferred: Dict[str, QueuedPublish] = {}
+        # Topics handed out less than `min_interval` ago, with the timer that makes them due again.
+        self._cooling: Dict[str, asyncio.TimerHandle] = {}
+        self.superseded = 0
+        super().__init__(maxsize=maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        # Ready publishes by topic, in arrival order; stop sentinels get a key of their own.
+        self._queue: Dict[object, QueuedPublish | None] = {}
+
+    def _put(self, item: QueuedPublish | None) -> bool:
+        """Add `item`; False when it replaced a pending publish instead of adding one."""
+        if item is None:
+            self._queue[object()] = None
+            return True
+        topic = item.topic
+        if topic in self._queue:
+            self._queue[topic] = item
+            self._supersede()
+            return False
+        if topic in self._deferred:
+            self._deferred[topic] = item
+            self._supersede()
+            return False
+        if topic in self._cooling:
+            self._deferred[topic] = item
+        else:
+            self._queue[topic] = item
+        return True
+
+    def _get(self) -> QueuedPublish | None:
+        key = next(iter(self._queue))
+        item = self._queue.pop(key)
+        if item is not None and self._min_interval:
+            topic = item.topic
+            self._cooling[topic] = asyncio.get_running_loop().call_later(self._min_interval, self._release, topic)
+        return item
+
+    def full(self) -> bool:
+        return self.maxsize > 0 and self._pending() >= self.maxsize
+
+    def fits(self, items: Sequence[QueuedPublish]) -> bool:
+        if not self.maxsize:
+            return True
+        # Replacements need no room, and a batch's repeats of one topic take a single entry.
+        new_topics = {item.topic for item in items if item.topic not in self._queue and item.topic not in self._deferred}
+        return self.maxsize - self._pending() >= len(new_topics)
+
+    def _pending(self) -> int:
+        return len(self._queue) + len(self._deferred)
+
+    def put_nowait(self, item: QueuedPublish | None) -> None:
+        if item is not None and (item.topic in self._queue or item.topic in self._deferred):
+            # Replacing a pending publish needs no room.
+            self._put(item)
+            return
+        super().put_nowait(item)
+
+    def put_many(self, items: Sequence[QueuedPublish]) -> None:
+        # Only added entries are taken (and marked done) by a worker; replaced ones never are.
+        added = sum(self._put(item) for item in items)
+        self._unfinished_tasks += added  # type: ignore[attr-defined]
+        self._finished.clear()  # type: ignore[attr-defined]
+        for _ in range(min(len(self._queue), len(self._getters))):  # type: ignore[attr-defined]
+            self._wakeup_next(self._getters)  # type: ignore[attr-defined]
+
+    def requeue(self, items: Sequence[QueuedPublish | None]) -> None:
+        front: Dict[object, QueuedPublish | None] = {}
+        for item in items:
+            if item is None:
+                front[object()] = None
+            elif item.topic in self._queue or item.topic in self._deferred:
+                # A newer publish of the topic arrived meanwhile.
+                self._supersede()
+            else:
+                front[item.topic] = item
+                # Not sent after all, so not rate limited either.
+                timer = self._cooling.pop(item.topic, None)
+                if timer is not None:
+                    timer.cancel()
+        self._queue = {**front, **self._queue}
+        for _ in front:
+            self._wakeup_next(self._getters)  # type: ignore[attr-defined]
+
+    def take_deferred(self) -> list[QueuedPublish]:
+        """Remove and return the publishes waiting for their topic's interval."""
+        for timer in self._cooling.values():
+            timer.cancel()
+        self._cooling.clear()
+        items = list(self._deferred.values())
+        self._deferred.clear()
+        return items
+
+    def _release(self, topic: str) -> None:
+        del self._cooling[topic]
+        item = self._deferred.pop(topic, None)
+        if item is not None:
+            self._queue[topic] = item
+            self._wakeup_next(self._getters)  # type: ignore[attr-defined]
+
+    def _supersede(self) -> None:
+        self.superseded += 1
+        if self._on_superseded is not None:
+            self._on_superseded()
 
 
 class UnsMqttProxy(UnsProxy):
@@ -42,7 +233,7 @@ class UnsMqttProxy(UnsProxy):
 
     def __init__(
         self,
-        host: str,
+        host: str | Sequence[str],
         *,
         process_name: str,
         instance_name: str,
@@ -58,7 +249,30 @@ class UnsMqttProxy(UnsProxy):
         reconnect_interval: float = 2.0,
         max_reconnect_interval: float = 30.0,
         publish_concurrency: int = 32,
+        publish_batch_size: int = DEFAULT_PUBLISH_BATCH_SIZE,
+        publish_mode: PublishMode = "shared",
+        coalesce_max_rate: Optional[float] = None,
         max_pending_publishes: Optional[int] = None,
+        mqtt5: bool = False,
+        packet_codec: PacketCodecName = "json",
+        compression: Optional[PayloadCompression] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        shared_connection: Optional[UnsMqttClient] = None,
+        publish_qos: int = 0,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        control_reserve: int = DEFAULT_CONTROL_RESERVE,
+        outbox_path: Optional[str | Path] = None,
+        outbox_max_bytes: int = DEFAULT_OUTBOX_MAX_BYTES,
+        outbox_replay_rate: Optional[float] = None,
+        topic_aliases: bool = False,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        inbound_max_size: Optional[int] = DEFAULT_INBOUND_MAX_SIZE,
+        inbound_policy: InboundPolicy = "block",
+        registry_debounce: float = DEFAULT_REGISTRY_DEBOUNCE_S,
+        registry_page_size: Optional[int] = None,
+        report_by_exception: Optional[ReportByException | Mapping[str, Any]] = None,
+        state_max_entries: Optional[int] = None,
+        state_ttl: Optional[float] = None,
     ) -> None:
         self.topic_builder = TopicBuilder(package_name, package_version, process_name)
         self.instance_status_topic = self.topic_builder.instance_status_topic(instance_name)
@@ -77,68 +291,214 @@ class UnsMqttProxy(UnsProxy):
             instance_name=instance_name,
             publisher_active=True,
             subscriber_active=True,
+            mqtt5=mqtt5,
+            packet_codec=packet_codec,
+            compression=compression,
+            compression_threshold=compression_threshold,
+            shared_connection=shared_connection,
+            max_inflight=max_inflight,
+            control_reserve=control_reserve,
+            topic_aliases=topic_aliases,
+            connect_timeout=connect_timeout,
+            inbound_max_size=inbound_max_size,
+            inbound_policy=inbound_policy,
+        )
+        super().__init__(
+            self.client,
+            self.instance_status_topic,
+            instance_name,
+            registry_debounce=registry_debounce,
+            registry_page_size=registry_page_size,
         )
-        super().__init__(self.client, self.instance_status_topic, instance_name)
-        self._last_values: Dict[str, LastValueEntry] = {}
-        self._sequence_ids: Dict[str, int] = {}
+        # Per-topic state, bounded by `state_max_entries` (LRU) and `state_ttl` (seconds unused) when set.
+        # An evicted topic starts over: no interval on its next packet and sequence ids from 0.
+        self._state_max_entries = state_max_entries
+        self._state_ttl = state_ttl
+        self._last_values: TopicStateStore[str, LastValueEntry] = self._topic_state(_LAST_VALUE_BYTES)
+        self._sequence_ids: TopicStateStore[str, int] = self._topic_state(_SEQUENCE_ID_BYTES)
+        self._identities: TopicStateStore[tuple[Any, ...], _TopicIdentity] = self._topic_state(_IDENTITY_BYTES)
+        self._state_evicted_collected = 0
+        self.client.add_stats_source(self._state_metrics)
+        # Default for data attributes without their own "reportByException"; None publishes every value.
+        self._report_by_exception = ReportByException.from_value(report_by_exception)
+        self._exception_reporter: Optional[ExceptionReporter] = None
         self._delta_mode_deprecation_warned = False
         self._publish_concurrency = max(1, publish_concurrency)
+        self._publish_batch_size = max(1, publish_batch_size)
+        if publish_qos not in (0, 1, 2):
+            raise ValueError("publish_qos must be 0, 1 or 2.")
+        self._publish_qos = publish_qos
+        self._pipelined_completions: set[asyncio.Task[None]] = set()
         self._max_pending_publishes = (
             None if max_pending_publishes is None or max_pending_publishes <= 0 else max_pending_publishes
         )
-        if self._max_pending_publishes is None:
-            self._publish_queue: asyncio.Queue[QueuedPublish | None] = asyncio.Queue()
+        if publish_mode not in PUBLISH_MODES:
+            raise ValueError(f"publish_mode must be one of {', '.join(PUBLISH_MODES)}.")
+        if coalesce_max_rate is not None and (publish_mode != "coalesce" or coalesce_max_rate <= 0):
+            raise ValueError("coalesce_max_rate must be positive and requires publish_mode 'coalesce'.")
+        self._publish_mode = publish_mode
+        self._superseded_collected = 0
+        if publish_mode != "shared":
+            # One queue per worker keeps each topic's publishes in order; the pending limit is split across them.
+            shard_limit = -(-self._max_pending_publishes // self._publish_concurrency) if self._max_pending_publishes else 0
+            if publish_mode == "coalesce":
+                min_interval = 1.0 / coalesce_max_rate if coalesce_max_rate else 0.0
+                self._publish_queues = [
+                    _CoalescingPublishQueue(
+                        maxsize=shard_limit, min_interval=min_interval, on_superseded=self._mark_publish_completed
+                    )
+                    for _ in range(self._publish_concurrency)
+                ]
+                self.client.add_stats_source(self._coalesce_metrics)
+            else:
+                self._publish_queues = [_PublishQueue(maxsize=shard_limit) for _ in range(self._publish_concurrency)]
         else:
-            self._publish_queue = asyncio.Queue(maxsize=self._max_pending_publishes)
+            self._publish_queues = [_PublishQueue(maxsize=self._max_pending_publishes or 0)]
         self._publish_workers: list[asyncio.Task[None]] = []
         self._publish_workers_started = False
         self._publish_workers_stop_requested = False
+        # Plain counters (single event loop); only drain waiters park, on `_drained`.
         self._pending_enqueue_operations = 0
         self._pending_publish_completions = 0
-        self._drain_condition = asyncio.Condition()
+        self._drained = asyncio.Event()
+        self._drained.set()
         self._publish_worker_failure: Exception | None = None
+        # Store-and-forward: publishes made while disconnected (or while a backlog exists)
+        # go to disk and are replayed in order after reconnecting.
+        self._outbox = PublishOutbox(outbox_path, max_bytes=outbox_max_bytes) if outbox_path is not None else None
+        self._outbox_replay_rate = outbox_replay_rate if outbox_replay_rate and outbox_replay_rate > 0 else None
+        self._outbox_wakeup = asyncio.Event()
+        self._outbox_task: Optional[asyncio.Task[None]] = None
+        self._outbox_writer: Optional[asyncio.Future[None]] = None
+        if self._outbox is not None:
+            self.client.add_stats_source(self._outbox_metrics)
 
     async def connect(self) -> None:
         await self.client.connect()
         self._ensure_publish_workers_started()
+        self._ensure_outbox_replay_started()
         await self.start()
 
     async def stop(self, *, drain: bool = True, timeout: Optional[float] = DEFAULT_DRAIN_TIMEOUT_S) -> None:
         await self._stop_publish_workers(drain=drain, timeout=timeout)
+        await self._stop_outbox()
         await super().stop()
 
+    def outbox_stats(self) -> Optional[OutboxStats]:
+        """Backlog depth/age of the store-and-forward outbox, or None when it is disabled."""
+        return self._outbox.stats() if self._outbox is not None else None
+
+    def superseded_publishes(self) -> int:
+        """Publishes replaced by a newer one of the same topic before being sent (``publish_mode="coalesce"``)."""
+        return sum(getattr(queue, "superseded", 0) for queue in self._publish_queues)
+
+    def state_stats(self) -> TopicStateStats:
+        """Entries, approximate size and evictions of the per-topic state, summed over its tables."""
+        stores = [self._last_values, self._sequence_ids, self._identities]
+        if self._exception_reporter is not None:
+            stores.append(self._exception_reporter.states)
+        stats = [store.stats() for store in stores]
+        return TopicStateStats(
+            entries=sum(item.entries for item in stats),
+            approx_bytes=sum(item.approx_bytes for item in stats),
+            evicted=sum(item.evicted for item in stats),
+        )
+
+    def report_by_exception_stats(self) -> Optional[ReportByExceptionStats]:
+        reporter = self._exception_reporter
+        return reporter.stats() if reporter is not None else None
+
     async def close(self, *, drain: bool = True, timeout: Optional[float] = DEFAULT_DRAIN_TIMEOUT_S) -> None:
         await self.stop(drain=drain, timeout=timeout)
         await self.client.close()
+        if self._outbox is not None:
+            self._outbox.close()
 
     async def publish_message(self, topic: str, payload: str | bytes) -> None:
         await self._track_enqueue_operation(self._enqueue_publish(topic, payload))
 
     async def publish_packet(self, topic: str, packet: Dict[str, Any]) -> None:
-        await self._track_enqueue_operation(self._enqueue_publish(topic, UnsPacket.to_json(packet)))
+        await self._track_enqueue_operation(self._enqueue_packet(topic, packet))
+
+    async def publish_table_row(
+        self,
+        template: TableTemplate,
+        topic: str,
+        values: Sequence[TableValue],
+        *,
+        time: Optional[datetime | str | int] = None,
+    ) -> None:
+        await self._track_enqueue_operation(self._enqueue_publish(topic, template.encode(values, time=time)))
 
     async def publish_mqtt_message(self, mqtt_message: Dict[str, Any], mode: MessageMode = MessageMode.RAW) -> None:
         await self._track_enqueue_operation(self._publish_mqtt_message_impl(mqtt_message, mode))
 
+    async def publish_many(self, mqtt_messages: Sequence[Dict[str, Any]], mode: MessageMode = MessageMode.RAW) -> None:
+        """
+        Publish many `publish_mqtt_message()` inputs, e.g. one poller scan, in one pass.
+
+        Every attribute is validated before anything is published, so one invalid entry
+        rejects the whole batch. The batch shares one timestamp (registry entries and data
+        without a `time`), new topics reach the registry in a single update, and the packets
+        are queued together. If the batch does not fit in the bounded publish queue it is
+        rejected as a whole (or spilled to the outbox, when configured).
+        """
+        await self._track_enqueue_operation(self._publish_many_impl(mqtt_messages, mode))
+
     async def drain_publishes(self, *, timeout: Optional[float] = None) -> None:
         deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
         while True:
-            async with self._drain_condition:
-                if self._pending_enqueue_operations == 0 and self._pending_publish_completions == 0:
-                    return
-                self._raise_if_drain_blocked()
-                if deadline is None:
-                    await self._drain_condition.wait()
-                    continue
-                remaining = deadline - asyncio.get_running_loop().time()
-                if remaining <= 0:
-                    raise TimeoutError("Timed out waiting for pending MQTT publishes to drain.")
-                await asyncio.wait_for(self._drain_condition.wait(), timeout=remaining)
+            if self._pending_enqueue_operations == 0 and self._pending_publish_completions == 0:
+                return
+            self._raise_if_drain_blocked()
+            # Also set to wake waiters when a worker exits; re-armed while work is pending.
+            self._drained.clear()
+            if deadline is None:
+                await self._drained.wait()
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for pending MQTT publishes to drain.")
+            await asyncio.wait_for(self._drained.wait(), timeout=remaining)
 
     async def flush(self, *, timeout: Optional[float] = None) -> None:
         await self.drain_publishes(timeout=timeout)
 
     async def _publish_mqtt_message_impl(self, mqtt_message: Dict[str, Any], mode: MessageMode = MessageMode.RAW) -> None:
+        for msg, value_is_cumulative in self._build_attribute_messages(mqtt_message, mode):
+            await self._process_and_publish(msg, value_is_cumulative=value_is_cumulative)
+
+    async def _publish_many_impl(self, mqtt_messages: Sequence[Dict[str, Any]], mode: MessageMode) -> None:
+        prepared = [
+            entry for mqtt_message in mqtt_messages for entry in self._build_attribute_messages(mqtt_message, mode)
+        ]
+        if not prepared:
+            return
+        now_ms = _now_epoch_ms()
+        timestamp = _iso_from_epoch_ms(now_ms)
+        identities = [self._topic_identity(msg) for msg, _ in prepared]
+        new_topics = [
+            self._registry_entry(msg, identity, timestamp)
+            for (msg, _), identity in zip(prepared, identities)
+            if not identity.registered
+        ]
+        if new_topics:
+            await self.register_unique_topics(new_topics)
+            for identity in identities:
+                identity.registered = True
+        encode_packet = self.client.encode_packet
+        content_type = self.client.packet_content_type
+        items = []
+        for (msg, value_is_cumulative), identity in zip(prepared, identities):
+            publish = self._prepare_packet(msg, identity, value_is_cumulative=value_is_cumulative, now_ms=now_ms)
+            if publish is not None:
+                items.append(QueuedPublish(publish[0], encode_packet(publish[1]), content_type))
+        self._enqueue_publishes(items)
+
+    def _build_attribute_messages(
+        self, mqtt_message: Dict[str, Any], mode: MessageMode
+    ) -> list[tuple[Dict[str, Any], bool]]:
+        """Validated per-attribute messages with their value_is_cumulative flag, in publish order."""
         attrs = mqtt_message.get("attributes")
         if attrs is None:
             raise ValueError("mqtt_message must include attributes")
@@ -152,6 +512,7 @@ class UnsMqttProxy(UnsProxy):
         object_type_description = mqtt_message.get("objectTypeDescription")
         object_id = mqtt_message.get("objectId")
 
+        built: list[tuple[Dict[str, Any], bool]] = []
         for attr in attrs:
             attribute = attr.get("attribute")
             if attribute is None:
@@ -169,6 +530,7 @@ class UnsMqttProxy(UnsProxy):
             validity_mode = attr.get("validityMode")
             expected_interval_ms = attr.get("expectedIntervalMs")
             lifecycle_end_value = attr.get("lifecycleEndValue")
+            report_by_exception = attr.get("reportByException", self._report_by_exception)
 
             message = attr.get("message")
             if message is None:
@@ -184,10 +546,21 @@ class UnsMqttProxy(UnsProxy):
                         **({"createdAt": attr["createdAt"]} if attr.get("createdAt") else {}),
                         **({"expiresAt": attr["expiresAt"]} if attr.get("expiresAt") else {}),
                     }
+                elif "series" in attr:
+                    message = {
+                        "series": attr["series"],
+                        **({"createdAt": attr["createdAt"]} if attr.get("createdAt") else {}),
+                        **({"expiresAt": attr["expiresAt"]} if attr.get("expiresAt") else {}),
+                    }
                 else:
-                    raise ValueError("Attribute entry must include exactly one of data/table/message")
+                    raise ValueError("Attribute entry must include exactly one of data/table/series/message")
 
             packet = UnsPacket.from_message(message)
+            if not any(isinstance(packet["message"].get(kind), dict) for kind in ("data", "table", "series")):
+                raise ValueError("packet.message must include data, table or series")
+            if "series" in packet["message"] and mode != MessageMode.RAW:
+                raise ValueError("series packets can only be published with MessageMode.RAW")
+            time_ms = self._packet_time_ms(packet["message"])
 
             msg = {
                 "topic": base_topic,
@@ -206,6 +579,7 @@ class UnsMqttProxy(UnsProxy):
                 "counterResetPolicy": counter_reset_policy,
                 "tableColumns": table_columns,
                 "packet": packet,
+                "timeMs": time_ms,
             }
 
             if validity_mode is not None:
@@ -214,22 +588,48 @@ class UnsMqttProxy(UnsProxy):
                 msg["expectedIntervalMs"] = expected_interval_ms
             if lifecycle_end_value is not None:
                 msg["lifecycleEndValue"] = lifecycle_end_value
+            if report_by_exception is not None:
+                msg["reportByException"] = ReportByException.from_value(report_by_exception)
 
             if mode == MessageMode.RAW:
-                await self._process_and_publish(msg, value_is_cumulative=False)
+                built.append((msg, False))
             elif mode == MessageMode.DELTA:
                 self._warn_deprecated_delta_mode(mode)
                 delta_msg = dict(msg)
                 delta_msg["attribute"] = f"{attribute}-delta"
                 delta_msg["description"] = f"{msg['description']} (delta)"
-                await self._process_and_publish(delta_msg, value_is_cumulative=True)
+                built.append((delta_msg, True))
             elif mode == MessageMode.BOTH:
                 self._warn_deprecated_delta_mode(mode)
-                await self._process_and_publish(msg, value_is_cumulative=False)
+                built.append((msg, False))
                 delta_msg = dict(msg)
                 delta_msg["attribute"] = f"{attribute}-delta"
                 delta_msg["description"] = f"{msg['description']} (delta)"
-                await self._process_and_publish(delta_msg, value_is_cumulative=True)
+                built.append((delta_msg, True))
+        return built
+
+    @classmethod
+    def _packet_time_ms(cls, message: Dict[str, Any]) -> Optional[int]:
+        """Parse the packet times before anything is registered; returns the data time in epoch ms, if set."""
+        table = message.get("table")
+        if isinstance(table, dict):
+            table_time = table.get("time")
+            if table_time is not None and not isinstance(table_time, str):
+                table["time"] = _iso_from_epoch_ms(_epoch_ms(table_time))
+        series = message.get("series")
+        if isinstance(series, dict):
+            cls._series_time_bounds(series)
+        data = message.get("data")
+        if not isinstance(data, dict):
+            return None
+        # Times are carried as epoch ms; epoch ms inputs are written to the packet as ISO strings.
+        time_value = data.get("time")
+        if time_value is None or time_value == "":
+            return None
+        time_ms = _epoch_ms(time_value)
+        if not isinstance(time_value, str):
+            data["time"] = _iso_from_epoch_ms(time_ms)
+        return time_ms
 
     def _warn_deprecated_delta_mode(self, mode: MessageMode) -> None:
         if self._delta_mode_deprecation_warned:
@@ -242,20 +642,44 @@ class UnsMqttProxy(UnsProxy):
             mode.value,
         )
 
-    def _resolve_object_identity(self, msg: Dict[str, Any]) -> None:
-        topic = msg.get("topic", "")
-        provided_type = msg.get("objectType")
-        provided_id = msg.get("objectId")
-        provided_asset = msg.get("asset")
+    def _topic_identity(self, msg: Dict[str, Any]) -> _TopicIdentity:
+        key = (msg.get("topic", ""), msg.get("asset"), msg.get("objectType"), msg.get("objectId"), msg.get("attribute"))
+        identity = self._identities.get(key)
+        if identity is None:
+            identity = self._identities[key] = self._resolve_object_identity(*key)
+        return identity
 
+    def _resolve_object_identity(
+        self,
+        topic: str,
+        provided_asset: Optional[str],
+        provided_type: Optional[str],
+        provided_id: Optional[str],
+        attribute: Any,
+    ) -> _TopicIdentity:
         parts = [p for p in topic.split("/") if p]
         parsed_type = parts[-2] if len(parts) >= 2 else None
         parsed_id = parts[-1] if len(parts) >= 1 else None
         parsed_asset = parts[-3] if len(parts) >= 3 else None
 
-        msg["objectType"] = provided_type or parsed_type
-        msg["objectId"] = provided_id or parsed_id or "main"
-        msg["asset"] = provided_asset or parsed_asset
+        object_type = provided_type or parsed_type
+        object_id = provided_id or parsed_id or "main"
+        asset = provided_asset or parsed_asset
+        base_topic = self._normalize_topic(topic)
+        publish_topic = (
+            f"{base_topic}"
+            f"{asset + '/' if asset else ''}"
+            f"{object_type + '/' if object_type else ''}"
+            f"{object_id}/"
+            f"{attribute}"
+        )
+        return _TopicIdentity(
+            base_topic=sys.intern(base_topic),
+            asset=asset,
+            object_type=object_type,
+            object_id=object_id,
+            publish_topic=sys.intern(publish_topic),
+        )
 
     def _normalize_topic(self, topic: str) -> str:
         return topic if topic.endswith("/") else f"{topic}/"
@@ -266,8 +690,9 @@ class UnsMqttProxy(UnsProxy):
         self._publish_workers_started = True
         self._publish_workers_stop_requested = False
         self._publish_worker_failure = None
+        queues = self._publish_queues
         self._publish_workers = [
-            asyncio.create_task(self._publish_worker(), name=f"{self._instance_name}-publish-{index}")
+            asyncio.create_task(self._publish_worker(queues[index % len(queues)]), name=f"{self._instance_name}-publish-{index}")
             for index in range(self._publish_concurrency)
         ]
         for task in self._publish_workers:
@@ -284,8 +709,9 @@ class UnsMqttProxy(UnsProxy):
         if drain:
             await self.flush(timeout=timeout)
             self._publish_workers_stop_requested = True
-            for _ in self._publish_workers:
-                await self._publish_queue.put(None)
+            queues = self._publish_queues
+            for index in range(len(self._publish_workers)):
+                await queues[index % len(queues)].put(None)
         else:
             self._publish_workers_stop_requested = True
             await self._discard_queued_publishes()
@@ -295,167 +721,410 @@ class UnsMqttProxy(UnsProxy):
         self._publish_workers = []
         self._publish_workers_started = False
 
-    async def _publish_worker(self) -> None:
+    async def _publish_worker(self, queue: _PublishQueue) -> None:
+        workers_per_queue = self._publish_concurrency if self._publish_mode == "shared" else 1
         while True:
-            item = await self._publish_queue.get()
-            try:
+            # Take a fair share of what is already queued (up to the batch size) per wake-up,
+            # so a burst still spreads over the workers when publishes block.
+            batch = [await queue.get()]
+            limit = min(self._publish_batch_size, 1 + queue.qsize() // workers_per_queue)
+            while len(batch) < limit and batch[-1] is not None:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            for index, item in enumerate(batch):
                 if item is None:
                     return
-                await self.client.publish_raw(item.topic, item.payload)
-            except Exception as exc:
-                logger.exception("Error publishing message to topic %s", item.topic if item else "<shutdown>")
-                await self.event.emit(
-                    "error",
-                    {
-                        "topic": item.topic if item else None,
-                        "payload": item.payload if item else None,
-                        "error": exc,
-                    },
+                try:
+                    await self._publish_queued(item)
+                except BaseException:
+                    rest = batch[index + 1 :]
+                    if self._publish_workers_stop_requested:
+                        self._release_unpublished(rest)
+                    else:
+                        queue.requeue(rest)
+                    raise
+
+    async def _publish_queued(self, item: QueuedPublish) -> None:
+        awaiting_ack = False
+        try:
+            if self._publish_qos > 0:
+                # QoS 1/2: keep sending while earlier publishes wait for their acks.
+                ack = await self.client.publish_pipelined(
+                    item.topic, item.payload, qos=self._publish_qos, content_type=item.content_type
                 )
-            finally:
-                if item is not None:
-                    await self._mark_publish_completed()
-                self._publish_queue.task_done()
+                ack.add_done_callback(lambda future, item=item: self._handle_publish_ack(item, future))
+                awaiting_ack = True
+            elif item.content_type is None:
+                await self.client.publish_raw(item.topic, item.payload)
+            else:
+                await self.client.publish_raw(item.topic, item.payload, content_type=item.content_type)
+        except Exception as exc:
+            if self._spill_to_outbox(item, exc):
+                return
+            logger.exception("Error publishing message to topic %s", item.topic)
+            await self.event.emit("error", {"topic": item.topic, "payload": item.payload, "error": exc})
+        finally:
+            if not awaiting_ack:
+                self._mark_publish_completed()
+
+    def _spill_to_outbox(self, item: QueuedPublish, exc: BaseException) -> bool:
+        # A publish lost to a broker outage is kept for replay instead of being reported.
+        if self._outbox is None or not isinstance(exc, MqttError):
+            return False
+        self._append_to_outbox([item])
+        return True
+
+    def _append_to_outbox(self, items: Sequence[QueuedPublish]) -> None:
+        outbox = self._outbox
+        assert outbox is not None
+        for item in items:
+            outbox.append(item.topic, item.payload, content_type=item.content_type)
+        if outbox.pending >= MAX_PENDING_APPENDS:
+            # A caller that never yields to the writer would otherwise buffer the whole outage.
+            outbox.flush()
+        # Everything appended until the loop gets to the writer goes to disk in one transaction.
+        if self._outbox_writer is None or self._outbox_writer.done():
+            self._outbox_writer = asyncio.ensure_future(self._write_outbox())
+        self._outbox_wakeup.set()
+
+    async def _write_outbox(self) -> None:
+        outbox = self._outbox
+        assert outbox is not None
+        while outbox.pending:
+            try:
+                await asyncio.to_thread(outbox.flush)
+            except Exception:
+                # The entries stay buffered and are written with the next append (or on close).
+                logger.exception("%s - Could not write the publish outbox", self._instance_name)
+                return
+
+    def _handle_publish_ack(self, item: QueuedPublish, future: asyncio.Future[None]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self._mark_publish_completed()
+            return
+        task = asyncio.ensure_future(self._complete_pipelined_publish(item, future))
+        self._pipelined_completions.add(task)
+        task.add_done_callback(self._pipelined_completions.discard)
+
+    async def _complete_pipelined_publish(self, item: QueuedPublish, future: asyncio.Future[None]) -> None:
+        try:
+            exc = None if future.cancelled() else future.exception()
+            if exc is not None and not self._spill_to_outbox(item, exc):
+                logger.error("Error publishing message to topic %s: %s", item.topic, exc)
+                await self.event.emit("error", {"topic": item.topic, "payload": item.payload, "error": exc})
+        finally:
+            self._mark_publish_completed()
 
-    async def _enqueue_publish(self, topic: str, payload: str | bytes) -> None:
+    async def _enqueue_packet(self, topic: str, packet: Dict[str, Any]) -> None:
+        await self._enqueue_publish(topic, self.client.encode_packet(packet), content_type=self.client.packet_content_type)
+
+    async def _enqueue_publish(self, topic: str, payload: str | bytes, *, content_type: Optional[str] = None) -> None:
         self._ensure_publish_workers_started()
+        queues = self._publish_queues
+        queue = queues[hash(topic) % len(queues)] if len(queues) > 1 else queues[0]
+        outbox = self._outbox
+        if outbox is not None and (len(outbox) or not self.client.is_connected or queue.full()):
+            # Behind an existing backlog the message must wait its turn to keep publish order.
+            self._append_to_outbox([QueuedPublish(topic=topic, payload=payload, content_type=content_type)])
+            return
         try:
-            self._publish_queue.put_nowait(QueuedPublish(topic=topic, payload=payload))
+            queue.put_nowait(QueuedPublish(topic=topic, payload=payload, content_type=content_type))
         except asyncio.QueueFull as exc:
             queue_limit = self._max_pending_publishes if self._max_pending_publishes is not None else "unbounded"
             raise RuntimeError(f"{self._instance_name} - Publisher queue is full ({queue_limit}).") from exc
-        await self._mark_publish_accepted()
+        self._mark_publish_accepted()
+
+    def _enqueue_publishes(self, items: Sequence[QueuedPublish]) -> None:
+        if not items:
+            return
+        self._ensure_publish_workers_started()
+        queues = self._publish_queues
+        shards: dict[int, list[QueuedPublish]] = {}
+        for item in items:
+            shards.setdefault(hash(item.topic) % len(queues) if len(queues) > 1 else 0, []).append(item)
+        fits = all(queues[index].fits(batch) for index, batch in shards.items())
+        outbox = self._outbox
+        if outbox is not None and (len(outbox) or not self.client.is_connected or not fits):
+            self._append_to_outbox(items)
+            return
+        if not fits:
+            raise RuntimeError(f"{self._instance_name} - Publisher queue is full ({self._max_pending_publishes}).")
+        # Accept first: a coalescing queue completes the publishes a batch supersedes while putting it.
+        self._mark_publish_accepted(len(items))
+        for index, batch in shards.items():
+            queues[index].put_many(batch)
 
     async def _process_and_publish(self, msg: Dict[str, Any], *, value_is_cumulative: bool) -> None:
-        self._resolve_object_identity(msg)
-        base_topic = self._normalize_topic(msg.get("topic", ""))
+        identity = self._topic_identity(msg)
+        if not identity.registered:
+            await self.register_unique_topic(self._registry_entry(msg, identity, _iso_from_epoch_ms(_now_epoch_ms())))
+            identity.registered = True
+        publish = self._prepare_packet(msg, identity, value_is_cumulative=value_is_cumulative)
+        if publish is not None:
+            await self._enqueue_packet(*publish)
 
-        packet = msg["packet"]
-        message = packet.get("message", {})
+    def _registry_entry(self, msg: Dict[str, Any], identity: _TopicIdentity, timestamp: str) -> Dict[str, Any]:
+        message = msg["packet"].get("message", {})
         data = message.get("data")
         table = message.get("table")
+        series = message.get("series")
 
-        attribute_type = "Data" if data is not None else "Table" if table is not None else None
+        # A series carries many samples of a Data attribute.
+        attribute_type = "Data" if data is not None or series is not None else "Table" if table is not None else None
         data_group = ""
         if isinstance(data, dict):
             data_group = data.get("dataGroup") or ""
         if isinstance(table, dict):
             data_group = table.get("dataGroup") or ""
+        if isinstance(series, dict):
+            data_group = series.get("dataGroup") or ""
 
-        await self.register_unique_topic(
-            {
-                "timestamp": isoformat(datetime.now(timezone.utc)),
-                "topic": base_topic,
-                "asset": msg.get("asset"),
-                "assetDescription": msg.get("assetDescription"),
-                "objectType": msg.get("objectType"),
-                "objectTypeDescription": msg.get("objectTypeDescription"),
-                "objectId": msg.get("objectId"),
-                "attribute": msg.get("attribute"),
-                "attributeType": attribute_type,
-                "description": msg.get("description"),
-                "tags": msg.get("tags"),
-                "attributeNeedsPersistence": msg.get("attributeNeedsPersistence"),
-                "valueType": msg.get("valueType"),
-                "presentationKind": msg.get("presentationKind"),
-                "defaultAggregation": msg.get("defaultAggregation"),
-                "counterResetPolicy": msg.get("counterResetPolicy"),
-                "tableColumns": msg.get("tableColumns"),
-                "dataGroup": data_group,
-                **({"validityMode": msg.get("validityMode")} if msg.get("validityMode") is not None else {}),
-                **(
-                    {"expectedIntervalMs": msg.get("expectedIntervalMs")}
-                    if msg.get("expectedIntervalMs") is not None
-                    else {}
-                ),
-                **({"lifecycleEndValue": msg.get("lifecycleEndValue")} if msg.get("lifecycleEndValue") is not None else {}),
-            }
-        )
+        return {
+            "timestamp": timestamp,
+            "topic": identity.base_topic,
+            "asset": identity.asset,
+            "assetDescription": msg.get("assetDescription"),
+            "objectType": identity.object_type,
+            "objectTypeDescription": msg.get("objectTypeDescription"),
+            "objectId": identity.object_id,
+            "attribute": msg.get("attribute"),
+            "attributeType": attribute_type,
+            "description": msg.get("description"),
+            "tags": msg.get("tags"),
+            "attributeNeedsPersistence": msg.get("attributeNeedsPersistence"),
+            "valueType": msg.get("valueType"),
+            "presentationKind": msg.get("presentationKind"),
+            "defaultAggregation": msg.get("defaultAggregation"),
+            "counterResetPolicy": msg.get("counterResetPolicy"),
+            "tableColumns": msg.get("tableColumns"),
+            "dataGroup": data_group,
+            **({"validityMode": msg.get("validityMode")} if msg.get("validityMode") is not None else {}),
+            **(
+                {"expectedIntervalMs": msg.get("expectedIntervalMs")}
+                if msg.get("expectedIntervalMs") is not None
+                else {}
+            ),
+            **({"lifecycleEndValue": msg.get("lifecycleEndValue")} if msg.get("lifecycleEndValue") is not None else {}),
+        }
 
-        publish_topic = (
-            f"{base_topic}"
-            f"{msg.get('asset') + '/' if msg.get('asset') else ''}"
-            f"{msg.get('objectType') + '/' if msg.get('objectType') else ''}"
-            f"{msg.get('objectId') + '/' if msg.get('objectId') else ''}"
-            f"{msg.get('attribute')}"
-        )
+    def _prepare_packet(
+        self,
+        msg: Dict[str, Any],
+        identity: _TopicIdentity,
+        *,
+        value_is_cumulative: bool,
+        now_ms: Optional[int] = None,
+    ) -> Optional[tuple[str, Dict[str, Any]]]:
+        """Assign the sequence id and interval and track the last value; returns (topic, packet) to publish, if any."""
+        base_topic = identity.base_topic
+        publish_topic = identity.publish_topic
+        packet = msg["packet"]
+        message = packet.get("message", {})
+        data = message.get("data")
+        series = message.get("series")
+
+        if isinstance(data, dict):
+            # Given times were parsed by _build_attribute_messages; a missing one becomes now.
+            time_ms = msg.get("timeMs")
+            if time_ms is None:
+                time_ms = _now_epoch_ms() if now_ms is None else now_ms
+                data["time"] = _iso_from_epoch_ms(time_ms)
+            new_value = data.get("value")
+            new_uom = data.get("uom")
+            settings = msg.get("reportByException")
+            # Suppressed values take no sequence id and leave the last value (and so the interval) alone.
+            if settings is not None and not value_is_cumulative:
+                reporter = self._exception_reporter or self._start_exception_reporter()
+                if not reporter.should_publish(
+                    publish_topic, new_value, new_uom, time_ms, settings, msg.get("expectedIntervalMs")
+                ):
+                    return None
 
         seq_id = self._sequence_ids.get(base_topic, 0)
         self._sequence_ids[base_topic] = seq_id + 1
         packet["sequenceId"] = seq_id
 
         if isinstance(data, dict):
-            time_value = data.get("time")
-            if not time_value:
-                time_value = UnsPacket.data(value=0)["message"]["data"]["time"]
-                data["time"] = time_value
-            current_time = datetime.fromisoformat(time_value.replace("Z", "+00:00"))
-            new_value = data.get("value")
-            new_uom = data.get("uom")
             last = self._last_values.get(publish_topic)
             if last:
-                interval_ms = int((current_time - last.timestamp).total_seconds() * 1000)
-                packet["interval"] = interval_ms
+                packet["interval"] = time_ms - last.timestamp_ms
                 if value_is_cumulative and isinstance(new_value, (int, float)) and isinstance(last.value, (int, float)):
                     delta = new_value - last.value
                     data["value"] = delta
-                    data["time"] = isoformat(current_time)
-                self._last_values[publish_topic] = LastValueEntry(new_value, new_uom, current_time)
-                await self._enqueue_publish(publish_topic, UnsPacket.to_json(packet))
-            else:
-                self._last_values[publish_topic] = LastValueEntry(new_value, new_uom, current_time)
-                # For delta mode with no previous value, skip to avoid bogus delta; otherwise publish.
-                if not value_is_cumulative:
-                    await self._enqueue_publish(publish_topic, UnsPacket.to_json(packet))
-        elif isinstance(table, dict):
-            await self._enqueue_publish(publish_topic, UnsPacket.to_json(packet))
-        else:
-            raise ValueError("packet.message must include data or table")
+                    data["time"] = _iso_from_epoch_ms(time_ms)
+                last.value = new_value
+                last.uom = new_uom
+                last.timestamp_ms = time_ms
+                return publish_topic, packet
+            self._last_values[publish_topic] = LastValueEntry(new_value, new_uom, time_ms)
+            # For delta mode with no previous value, skip to avoid bogus delta; otherwise publish.
+            return None if value_is_cumulative else (publish_topic, packet)
+        if isinstance(series, dict):
+            first_time, last_time = self._series_time_bounds(series)
+            last = self._last_values.get(publish_topic)
+            if last:
+                packet["interval"] = first_time - last.timestamp_ms
+            self._last_values[publish_topic] = LastValueEntry(series["values"][-1], series.get("uom"), last_time)
+        return publish_topic, packet
+
+    def _start_exception_reporter(self) -> ExceptionReporter:
+        reporter = ExceptionReporter(max_entries=self._state_max_entries, ttl=self._state_ttl)
+        self._exception_reporter = reporter
+        self.client.add_stats_source(reporter.collect)
+        return reporter
+
+    @staticmethod
+    def _series_time_bounds(series: Dict[str, Any]) -> tuple[int, int]:
+        """First and last sample time of a series, in epoch ms."""
+        if "times" in series:
+            times = series["times"]
+            return _epoch_ms_from_iso(times[0]), _epoch_ms_from_iso(times[-1])
+        first_ms = series["startTime"] + series["timeDeltas"][0]
+        last_ms = series["startTime"] + sum(series["timeDeltas"])
+        return first_ms, last_ms
 
     async def _track_enqueue_operation(self, operation: Awaitable[None]) -> None:
-        await self._increment_pending_enqueues()
+        self._pending_enqueue_operations += 1
+        self._drained.clear()
         try:
             await operation
         finally:
-            await self._decrement_pending_enqueues()
-
-    async def _increment_pending_enqueues(self) -> None:
-        async with self._drain_condition:
-            self._pending_enqueue_operations += 1
-            self._drain_condition.notify_all()
-
-    async def _decrement_pending_enqueues(self) -> None:
-        async with self._drain_condition:
-            if self._pending_enqueue_operations > 0:
-                self._pending_enqueue_operations -= 1
-            self._drain_condition.notify_all()
-
-    async def _mark_publish_accepted(self) -> None:
-        async with self._drain_condition:
-            self._pending_publish_completions += 1
-            self._drain_condition.notify_all()
-
-    async def _mark_publish_completed(self) -> None:
-        async with self._drain_condition:
-            if self._pending_publish_completions > 0:
-                self._pending_publish_completions -= 1
-            self._drain_condition.notify_all()
+            self._pending_enqueue_operations -= 1
+            self._settle_drain()
+
+    def _mark_publish_accepted(self, count: int = 1) -> None:
+        self._pending_publish_completions += count
+        self._drained.clear()
+
+    def _mark_publish_completed(self) -> None:
+        if self._pending_publish_completions > 0:
+            self._pending_publish_completions -= 1
+        self._settle_drain()
+
+    def _settle_drain(self) -> None:
+        if self._pending_enqueue_operations == 0 and self._pending_publish_completions == 0:
+            self._drained.set()
+
+    def _release_unpublished(self, items: Sequence[QueuedPublish | None]) -> None:
+        # Items taken off the queue that will not be published (shutdown or a cancelled worker).
+        released = 0
+        for item in items:
+            if item is None:
+                continue
+            released += 1
+            if self._outbox is not None:
+                # Not published yet: persist so the next start replays it.
+                self._outbox.append(item.topic, item.payload, content_type=item.content_type)
+                self._outbox_wakeup.set()
+        if released:
+            self._pending_publish_completions = max(0, self._pending_publish_completions - released)
+            self._settle_drain()
 
     async def _discard_queued_publishes(self) -> None:
-        discarded = 0
+        discarded: list[QueuedPublish | None] = []
+        for queue in self._publish_queues:
+            while True:
+                try:
+                    discarded.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            if isinstance(queue, _CoalescingPublishQueue):
+                discarded.extend(queue.take_deferred())
+        self._release_unpublished(discarded)
+
+    def _ensure_outbox_replay_started(self) -> None:
+        if self._outbox is None or (self._outbox_task is not None and not self._outbox_task.done()):
+            return
+        self._outbox_task = asyncio.create_task(self._replay_outbox(), name=f"{self._instance_name}-outbox-replay")
+        self._outbox_wakeup.set()
+
+    async def _stop_outbox(self) -> None:
+        if self._outbox_task is not None:
+            self._outbox_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._outbox_task
+            self._outbox_task = None
+        if self._outbox_writer is not None:
+            await self._outbox_writer
+            self._outbox_writer = None
+        if self._outbox is not None and self._outbox.pending:
+            # Including what workers released while stopping.
+            await asyncio.to_thread(self._outbox.flush)
+
+    async def _replay_outbox(self) -> None:
+        outbox = self._outbox
+        assert outbox is not None
+        interval = 1.0 / self._outbox_replay_rate if self._outbox_replay_rate else 0.0
+        loop = asyncio.get_running_loop()
+        next_send = loop.time()
         while True:
+            if not len(outbox):
+                self._outbox_wakeup.clear()
+                await self._outbox_wakeup.wait()
+                continue
+            replayed_id = None
+            acks: list[tuple[int, asyncio.Future[None]]] = []
             try:
-                item = self._publish_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-            if item is not None:
-                discarded += 1
-            self._publish_queue.task_done()
-        if discarded == 0:
-            return
-        async with self._drain_condition:
-            self._pending_publish_completions = max(0, self._pending_publish_completions - discarded)
-            self._drain_condition.notify_all()
+                await self.client.wait_connected()
+                # Write what is still buffered off the event loop; peek() would do it on it.
+                if outbox.pending:
+                    await asyncio.to_thread(outbox.flush)
+                for entry in outbox.peek(100):
+                    if interval:
+                        delay = next_send - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        next_send = max(next_send, loop.time()) + interval
+                    if self._publish_qos > 0:
+                        ack = await self.client.publish_pipelined(
+                            entry.topic, entry.payload, qos=self._publish_qos, content_type=entry.content_type
+                        )
+                        acks.append((entry.id, ack))
+                    else:
+                        await self.client.publish_raw(entry.topic, entry.payload, content_type=entry.content_type)
+                        replayed_id = entry.id
+                # Acks arrive in publish order; only a contiguous acknowledged prefix is removed.
+                for entry_id, ack in acks:
+                    await ack
+                    replayed_id = entry_id
+            except MqttError:
+                await asyncio.sleep(self.client.reconnect_interval)
+            except Exception:
+                # Keep replaying: new publishes are diverted to the outbox while it has a backlog.
+                logger.exception("%s - Outbox replay failed; retrying", self._instance_name)
+                await asyncio.sleep(self.client.reconnect_interval)
+            finally:
+                if replayed_id is not None:
+                    outbox.remove_through(replayed_id)
+
+    def _outbox_metrics(self) -> Dict[str, tuple[float, Optional[str]]]:
+        stats = self.outbox_stats()
+        assert stats is not None
+        return {
+            "outbox-backlog": (stats.backlog, None),
+            "outbox-backlog-bytes": (round(stats.backlog_bytes / 1024), "kB"),
+            "outbox-oldest-age": (round(stats.oldest_age_s, 3), "s"),
+            "outbox-dropped": (stats.dropped, None),
+        }
+
+    def _topic_state(self, entry_bytes: int) -> TopicStateStore[Any, Any]:
+        return TopicStateStore(max_entries=self._state_max_entries, ttl=self._state_ttl, entry_bytes=entry_bytes)
+
+    def _state_metrics(self) -> Dict[str, tuple[float, Optional[str]]]:
+        stats = self.state_stats()
+        collected, self._state_evicted_collected = self._state_evicted_collected, stats.evicted
+        return {
+            "state-entries": (stats.entries, None),
+            "state-size": (round(stats.approx_bytes / 1024), "kB"),
+            "state-evicted": (stats.evicted - collected, None),
+        }
+
+    def _coalesce_metrics(self) -> Dict[str, tuple[float, Optional[str]]]:
+        superseded = self.superseded_publishes()
+        collected, self._superseded_collected = self._superseded_collected, superseded
+        return {"publish-superseded": (superseded - collected, None)}
 
     def _handle_publish_worker_done(self, task: asyncio.Task[None]) -> None:
         if task.cancelled():
@@ -465,11 +1134,8 @@ class UnsMqttProxy(UnsProxy):
         if failure is not None and not self._publish_workers_stop_requested and self._publish_worker_failure is None:
             self._publish_worker_failure = failure
         if not task.cancelled() or self._publish_worker_failure is not None:
-            asyncio.create_task(self._notify_drain_waiters())
-
-    async def _notify_drain_waiters(self) -> None:
-        async with self._drain_condition:
-            self._drain_condition.notify_all()
+            # Wake drain waiters so they re-check; they raise if the worker failed.
+            self._drained.set()
 
     def _raise_if_drain_blocked(self) -> None:
         if self._publish_worker_failure is not None:
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import aiomqtt
+import pytest
+
+from uns_kit.core import client as client_module
+from uns_kit.core.client import UnsMqttClient, parse_brokers
+from uns_kit.core.topic_builder import TopicBuilder
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+
+class _AckingConnection:
+    """aiomqtt stand-in whose QoS > 0 publishes resolve only when `ack()` is called."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, int]] = []
+        self._acks: list[asyncio.Future[None]] = []
+
+    async def publish(self, topic: str, payload: bytes, *, qos: int = 0, retain: bool = False, properties: object = None) -> None:
+        self.sent.append((topic, qos))
+        if qos == 0:
+            return
+        ack = asyncio.get_running_loop().create_future()
+        self._acks.append(ack)
+        await ack
+
+    def ack(self, count: int | None = None, *, error: Exception | None = None) -> None:
+        pending = [ack for ack in self._acks if not ack.done()]
+        for ack in pending[:count]:
+            if error is None:
+                ack.set_result(None)
+            else:
+                ack.set_exception(error)
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
+def _connected(client: UnsMqttClient) -> _AckingConnection:
+    connection = _AckingConnection()
+    client._client = connection  # type: ignore[assignment]
+    client._connected.set()
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_publish_pipelined_bounds_inflight_window_and_flush_waits_for_acks() -> None:
+    client = UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), enable_status=False, max_inflight=2)
+    connection = _connected(client)
+
+    first = await client.publish_pipelined("raw/a/", b"1")
+    second = await client.publish_pipelined("raw/b/", b"2")
+    third = asyncio.ensure_future(client.publish_pipelined("raw/c/", b"3"))
+    await asyncio.sleep(0)
+    assert [topic for topic, _ in connection.sent] == ["raw/a/", "raw/b/"]
+    assert client.inflight_count == 2
+    assert not third.done()
+
+    connection.ack(1)
+    await first
+    third_ack = await third
+    await asyncio.sleep(0)
+    assert [topic for topic, _ in connection.sent] == ["raw/a/", "raw/b/", "raw/c/"]
+
+    with pytest.raises(TimeoutError):
+        await client.flush(timeout=0.01)
+    connection.ack()
+    await client.flush(timeout=1)
+    assert second.done() and third_ack.done()
+    assert client.inflight_count == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_channels_of_a_shared_connection_share_one_inflight_window() -> None:
+    builder = TopicBuilder("uns-kit", "0.0.1", "test-process")
+    owner = UnsMqttClient("localhost", topic_builder=builder, enable_status=False, max_inflight=2)
+    connection = _connected(owner)
+    channels = [UnsMqttClient("localhost", topic_builder=builder, enable_status=False, shared_connection=owner) for _ in range(2)]
+    for channel in channels:
+        await channel.connect()
+
+    acks = [await channel.publish_pipelined(f"raw/{index}/", b"1") for index, channel in enumerate(channels)]
+    blocked = asyncio.ensure_future(channels[0].publish_pipelined("raw/2/", b"1"))
+    await asyncio.sleep(0)
+    assert len(connection.sent) == 2 and not blocked.done()
+    assert [channel.inflight_count for channel in channels] == [1, 1]
+
+    connection.ack(1)
+    await acks[0]
+    acks.append(await blocked)
+    connection.ack()
+    for channel in channels:
+        await channel.flush(timeout=1)
+    assert [topic for topic, _ in connection.sent] == ["raw/0/", "raw/1/", "raw/2/"]
+    for channel in channels:
+        await channel.close()
+    await owner.close()
+
+
+@pytest.mark.asyncio
+async def test_proxy_qos1_publishes_pipeline_and_complete_on_ack() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        publish_concurrency=1,
+        publish_qos=1,
+    )
+    connection = _connected(proxy.client)
+    errors: list[dict] = []
+    proxy.event.on("error", errors.append)
+
+    for index in range(5):
+        await proxy.publish_message(f"raw/data-{index}/", b"value")
+    await asyncio.sleep(0.01)
+    # One worker, yet every publish is on the wire before the first ack arrives.
+    assert [qos for _, qos in connection.sent] == [1] * 5
+
+    with pytest.raises(TimeoutError):
+        await proxy.flush(timeout=0.01)
+    connection.ack(4)
+    connection.ack(error=RuntimeError("broker rejected"))
+    await proxy.flush(timeout=1)
+    assert [error["topic"] for error in errors] == ["raw/data-4/"]
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_infra_publishes_have_reserved_slots_ahead_of_data() -> None:
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        enable_status=False,
+        max_inflight=2,
+        control_reserve=1,
+    )
+    connection = _connected(client)
+
+    await client.publish_pipelined("raw/a/", b"1")
+    await client.publish_pipelined("raw/b/", b"2")
+    blocked = asyncio.ensure_future(client.publish_raw("raw/c/", b"3", qos=1))
+    await asyncio.sleep(0)
+    # The data window is full, yet the infra heartbeat goes out at once.
+    await asyncio.wait_for(client.publish_raw("uns-infra/uns-kit/0.0.1/test-process/alive", b"1"), timeout=1)
+    assert [topic for topic, _ in connection.sent] == ["raw/a/", "raw/b/", "uns-infra/uns-kit/0.0.1/test-process/alive"]
+    lanes = client.publish_lane_stats()
+    assert (lanes["data"].in_use, lanes["data"].waiting, lanes["control"].in_use) == (2, 1, 0)
+
+    await asyncio.sleep(0.01)
+    connection.ack(1)
+    await asyncio.sleep(0.01)
+    assert connection.sent[-1][0] == "raw/c/"
+    connection.ack()
+    await blocked
+    await client.flush(timeout=1)
+    metrics = client._publish_lanes.collect()
+    assert set(metrics) == {"publish-delay-control", "publish-delay-data"}
+    assert metrics["publish-delay-data"][0] >= 5
+    assert client.publish_lane_stats()["data"].in_use == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_qos0_data_is_capped_by_the_window_and_delay_excludes_the_write() -> None:
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        enable_status=False,
+        max_inflight=2,
+    )
+    connection = _StrandingConnection()
+    client._client = connection  # type: ignore[assignment]
+    client._connected.set()
+
+    publishes = [asyncio.ensure_future(client.publish_raw(f"raw/data-{index}/", b"1")) for index in range(3)]
+    await asyncio.sleep(0.02)
+    # Only `max_inflight` QoS 0 data publishes are being written; the third waits for a slot.
+    assert len(connection._pending_publishes) == 2
+    assert client.publish_lane_stats()["data"].waiting == 1
+    connection._pending_publishes[0].set()
+    await asyncio.sleep(0.01)
+    assert len(connection._pending_publishes) == 3
+    for confirmation in connection._pending_publishes.values():
+        confirmation.set()
+    await asyncio.wait_for(asyncio.gather(*publishes), timeout=1)
+
+    # The first two were admitted at once; their 20 ms write is not head-of-line delay.
+    data = client.publish_lane_stats()["data"]
+    assert data.publishes == 3 and data.max_delay_s >= 0.015
+    assert data.total_delay_s - data.max_delay_s < 0.01
+    await client.close()
+
+
+def test_parse_brokers_accepts_lists_and_host_port_entries() -> None:
+    assert parse_brokers("a") == [("a", 1883)]
+    assert parse_brokers("a:1884, b", 8883) == [("a", 1884), ("b", 8883)]
+    assert parse_brokers(["[::1]:1885", "::1"]) == [("::1", 1885), ("::1", 1883)]
+    with pytest.raises(ValueError):
+        parse_brokers(" , ")
+
+
+class _FakePaho:
+    def __init__(self) -> None:
+        self.on_connect = lambda *args: None
+        self.connect_timeout = 5.0
+
+
+class _FailoverAiomqttClient:
+    down: set[str] = set()
+    instances: list["_FailoverAiomqttClient"] = []
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self._client = _FakePaho()
+        _FailoverAiomqttClient.instances.append(self)
+
+    async def __aenter__(self) -> "_FailoverAiomqttClient":
+        if self.kwargs["hostname"] in self.down:
+            raise aiomqtt.MqttError("Connection refused")
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_client_fails_over_to_next_broker_within_one_attempt(monkeypatch: pytest.MonkeyPatch) -> None:
+    _FailoverAiomqttClient.instances = []
+    _FailoverAiomqttClient.down = {"broker-a"}
+    monkeypatch.setattr(client_module.aiomqtt, "Client", _FailoverAiomqttClient)
+    client = UnsMqttClient(
+        "broker-a,broker-b:1884",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        enable_status=False,
+        reconnect_interval=60,
+        connect_timeout=0.5,
+    )
+
+    await asyncio.wait_for(client.connect(), timeout=1)
+    assert [instance.kwargs["hostname"] for instance in _FailoverAiomqttClient.instances] == ["broker-a", "broker-b"]
+    assert _FailoverAiomqttClient.instances[-1]._client.connect_timeout == 0.5
+    assert (client.host, client.port) == ("broker-b", 1884)
+    stats = client.connection_stats()
+    assert (stats.broker, stats.connects, stats.failed_attempts, stats.last_outage_s) == ("broker-b:1884", 1, 1, None)
+    assert stats.last_connect_latency_s is not None
+
+    # A later outage is measured from the start of reconnecting until connected again.
+    _FailoverAiomqttClient.down = {"broker-b"}
+    client._connected.clear()
+    await asyncio.wait_for(client.connect(), timeout=1)
+    stats = client.connection_stats()
+    assert (stats.broker, stats.connects, stats.failed_attempts) == ("broker-a:1883", 2, 1)
+    assert stats.last_outage_s is not None and stats.total_outage_s == stats.last_outage_s
+    await client.close()
+
+
+class _StrandingConnection:
+    """aiomqtt stand-in whose publishes wait for a confirmation, like frames still in paho's buffer."""
+
+    def __init__(self) -> None:
+        self._pending_publishes: dict[int, asyncio.Event] = {}
+
+    async def publish(self, topic: str, payload: bytes, **kwargs: object) -> None:
+        confirmation = asyncio.Event()
+        self._pending_publishes[len(self._pending_publishes)] = confirmation
+        await confirmation.wait()
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_qos0_publishes_stranded_by_a_disconnect_are_resent() -> None:
+    client = UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), enable_status=False)
+    stranded, replacement = _StrandingConnection(), _AckingConnection()
+    client._client = stranded  # type: ignore[assignment]
+    client._connected.set()
+
+    broker_back = asyncio.Event()
+
+    async def reconnect() -> None:
+        if not client._connected.is_set():
+            await broker_back.wait()
+            client._client = replacement  # type: ignore[assignment]
+            client._connected.set()
+
+    client._ensure_connected = reconnect  # type: ignore[method-assign]
+    publishes = [asyncio.ensure_future(client.publish_raw(f"raw/data-{index}/", b"1")) for index in range(3)]
+    await asyncio.sleep(0)
+    client._handle_connection_lost(stranded)  # type: ignore[arg-type]
+    await asyncio.sleep(0.01)
+    # Waiting out the outage holds no lane slot, and nothing counts as published yet.
+    assert client.publish_lane_stats()["data"].in_use == 0
+    assert client._published_message_count == 0
+    broker_back.set()
+    await asyncio.gather(*publishes)
+
+    assert sorted(replacement.sent) == [("raw/data-0/", 0), ("raw/data-1/", 0), ("raw/data-2/", 0)]
+    assert client._published_message_count == 3
+    await client.close()
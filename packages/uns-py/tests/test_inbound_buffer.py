@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import aiomqtt
+from paho.mqtt.client import MQTTMessage
+import pytest
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.inbound_buffer import InboundBuffer, InboundMetrics
+from uns_kit.core.packet import UnsPacket, isoformat
+from uns_kit.core.topic_builder import TopicBuilder
+
+
+def _message(topic: str, payload: bytes = b"x") -> aiomqtt.Message:
+    return aiomqtt.Message(topic, payload, 0, False, 0, None)
+
+
+async def _drain(buffer: InboundBuffer) -> list[bytes]:
+    buffer.close()
+    payloads = []
+    while (message := await buffer.get()) is not None:
+        payloads.append(message.payload)
+    return payloads
+
+
+@pytest.mark.asyncio
+async def test_drop_policies_bound_the_buffer() -> None:
+    oldest = InboundBuffer(2, "drop-oldest")
+    newest = InboundBuffer(2, "drop-newest")
+    for index in range(4):
+        assert oldest.put(_message("a/", str(index).encode())) is None
+        assert newest.put(_message("a/", str(index).encode())) is None
+    assert await _drain(oldest) == [b"2", b"3"]
+    assert await _drain(newest) == [b"0", b"1"]
+    assert (oldest.stats().received, oldest.stats().dropped) == (4, 2)
+
+
+@pytest.mark.asyncio
+async def test_latest_per_topic_keeps_newest_value_in_place() -> None:
+    buffer = InboundBuffer(2, "latest-per-topic")
+    for topic, payload in [("a/", b"a1"), ("b/", b"b1"), ("a/", b"a2"), ("c/", b"c1")]:
+        buffer.put(_message(topic, payload))
+    # "a/" kept its queue position with the newer value, then was evicted as the oldest topic by "c/".
+    assert await _drain(buffer) == [b"b1", b"c1"]
+    assert buffer.stats().dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_block_policy_holds_the_producer_until_a_consumer_takes() -> None:
+    buffer = InboundBuffer(1, "block")
+    assert buffer.put(_message("a/", b"1")) is None
+    waiter = buffer.put(_message("a/", b"2"))
+    assert waiter is not None
+    blocked = asyncio.ensure_future(waiter)
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    assert (await buffer.get()).payload == b"1"
+    await asyncio.wait_for(blocked, timeout=1)
+    assert len(buffer) == 1 and buffer.stats().dropped == 0
+
+    # A consumer thread releases the producer as well.
+    waiter = buffer.put(_message("a/", b"3"))
+    assert waiter is not None
+    blocked = asyncio.ensure_future(waiter)
+    await asyncio.sleep(0)
+    taken: list[bytes] = []
+    thread = threading.Thread(target=lambda: taken.append(buffer.get_sync().payload))
+    thread.start()
+    await asyncio.wait_for(blocked, timeout=1)
+    thread.join(timeout=1)
+    assert taken == [b"2"]
+    assert await _drain(buffer) == [b"3"]
+
+
+@pytest.mark.asyncio
+async def test_lag_is_sampled_from_packet_time_and_collected_per_interval() -> None:
+    metrics = InboundMetrics()
+    buffer = InboundBuffer(10, "drop-oldest", metrics=metrics, lag_sample_every=2)
+    sent = isoformat(datetime.now(timezone.utc) - timedelta(seconds=5))
+    for _ in range(3):
+        buffer.put(_message("raw/data/", UnsPacket.to_bytes(UnsPacket.data(value=1, time=sent))))
+    buffer.put(_message("raw/text/", b"not a packet"))
+    for _ in range(4):
+        await buffer.get()
+
+    lag_s = buffer.stats().lag_s
+    assert lag_s is not None and 4.5 < lag_s < 10
+    collected = metrics.collect()
+    assert collected["inbound-queue-depth"] == (0, None)
+    assert collected["inbound-lag"][1] == "ms" and collected["inbound-lag"][0] >= 4500
+    assert "inbound-lag" not in metrics.collect()
+
+
+@pytest.mark.asyncio
+async def test_client_subscriptions_use_bounded_buffers_and_report_drops() -> None:
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        enable_status=False,
+        inbound_max_size=2,
+        inbound_policy="drop-oldest",
+    )
+
+    class _Connection:
+        async def subscribe(self, *args: object, **kwargs: object) -> None:
+            return None
+
+        async def unsubscribe(self, *args: object, **kwargs: object) -> None:
+            return None
+
+        @property
+        def messages(self):
+            async def iterate():
+                await asyncio.Event().wait()
+                yield
+
+            return iterate()
+
+        async def __aexit__(self, *args: object) -> None:
+            return None
+
+    client._client = _Connection()  # type: ignore[assignment]
+    client._connected.set()
+    async with client.messages("raw/#") as messages:
+        for index in range(5):
+            await client.dispatcher.dispatch(_message("raw/data/", str(index).encode()))
+        assert [(await messages.__anext__()).payload for _ in range(2)] == [b"3", b"4"]
+        source_metrics = client._inbound_metrics.collect()
+        assert source_metrics["inbound-dropped"] == (3, None)
+    with pytest.raises(ValueError):
+        UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), inbound_policy="drop")  # type: ignore[arg-type]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_keeps_messages_beyond_the_buffer_size(monkeypatch) -> None:
+    created: list[aiomqtt.Client] = []
+
+    class _RecordingClient(aiomqtt.Client):
+        def __init__(self, *args: object, **kwargs: object) -> None:
+            super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+            created.append(self)
+
+        async def __aenter__(self) -> "_RecordingClient":
+            raise aiomqtt.MqttError("not connecting in tests")
+
+    monkeypatch.setattr(aiomqtt, "Client", _RecordingClient)
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        enable_status=False,
+        inbound_max_size=2,
+    )
+    with pytest.raises(aiomqtt.MqttError):
+        await client._connect_once()
+
+    # While a full "block" buffer holds the read loop, the broker keeps delivering.
+    [connection] = created
+    for index in range(10):
+        message = MQTTMessage(topic=b"raw/data/")
+        message.payload = str(index).encode()
+        connection._on_message(connection._client, None, message)
+    assert connection._queue.qsize() == 10
+    await client.close()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from uns_kit.core.client import MqttError
+from uns_kit.core.outbox import PublishOutbox
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+
+def test_outbox_persists_entries_in_order_across_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "outbox.db"
+    outbox = PublishOutbox(path)
+    outbox.append("raw/a/", b"1")
+    outbox.append("raw/b/", "2", content_type="application/msgpack")
+    outbox.close()
+
+    reopened = PublishOutbox(path)
+    entries = reopened.peek()
+    assert [(entry.topic, entry.payload, entry.content_type) for entry in entries] == [
+        ("raw/a/", b"1", None),
+        ("raw/b/", b"2", "application/msgpack"),
+    ]
+    assert len(reopened) == 2
+    assert reopened.remove_through(entries[0].id) == 1
+    stats = reopened.stats()
+    assert (stats.backlog, stats.backlog_bytes, stats.replayed) == (1, 1, 1)
+    reopened.close()
+
+
+def test_outbox_drops_oldest_entries_beyond_max_bytes(tmp_path: Path) -> None:
+    outbox = PublishOutbox(tmp_path / "outbox.db", max_bytes=10)
+    for index in range(5):
+        outbox.append(f"raw/{index}/", b"abcd")
+
+    assert [entry.topic for entry in outbox.peek()] == ["raw/3/", "raw/4/"]
+    stats = outbox.stats()
+    assert (stats.backlog, stats.backlog_bytes, stats.dropped) == (2, 8, 3)
+    outbox.close()
+
+
+def test_outbox_buffers_appends_until_flushed_in_one_transaction(tmp_path: Path) -> None:
+    path = tmp_path / "outbox.db"
+    outbox = PublishOutbox(path)
+    for index in range(50):
+        outbox.append(f"raw/{index}/", b"x")
+    assert (len(outbox), outbox.pending, outbox.stats().backlog) == (50, 50, 50)
+    other = PublishOutbox(path)
+    assert len(other) == 0
+    other.close()
+
+    assert outbox.flush() == 50
+    assert (len(outbox), outbox.pending) == (50, 0)
+    other = PublishOutbox(path)
+    assert len(other) == 50
+    other.close()
+    outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_proxy_spills_to_outbox_while_disconnected_and_replays_in_order(tmp_path: Path) -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        outbox_path=tmp_path / "outbox.db",
+    )
+    published: list[str] = []
+    broker_up = False
+
+    async def fake_publish_raw(
+        topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False, content_type: str | None = None
+    ) -> None:
+        if not broker_up:
+            raise MqttError("Disconnected")
+        published.append(topic)
+
+    async def fake_ensure_connected() -> None:
+        proxy.client._connected.set()
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    proxy.client._ensure_connected = fake_ensure_connected  # type: ignore[method-assign]
+    proxy.client.reconnect_interval = 0.01
+
+    # Connected, but the broker drops the publish: the worker spills it to disk.
+    proxy.client._connected.set()
+    await proxy.publish_message("raw/0/", b"0")
+    await proxy.flush(timeout=1)
+    assert proxy.outbox_stats().backlog == 1  # type: ignore[union-attr]
+    # Disconnected: straight to disk.
+    proxy.client._connected.clear()
+    await proxy.publish_message("raw/1/", b"1")
+    # Connected again, but behind a backlog new publishes queue up on disk to keep their order.
+    proxy.client._connected.set()
+    await proxy.publish_message("raw/2/", b"2")
+    assert proxy.outbox_stats().backlog == 3  # type: ignore[union-attr]
+    assert published == []
+
+    broker_up = True
+    proxy._ensure_outbox_replay_started()
+    for _ in range(100):
+        if not proxy.outbox_stats().backlog:  # type: ignore[union-attr]
+            break
+        await asyncio.sleep(0.01)
+    assert published == ["raw/0/", "raw/1/", "raw/2/"]
+    assert proxy.outbox_stats().replayed == 3  # type: ignore[union-attr]
+    await proxy.stop()
+    proxy._outbox.close()  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_outbox_replay_keeps_running_after_an_unexpected_error(tmp_path: Path) -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        outbox_path=tmp_path / "outbox.db",
+    )
+    published: list[str] = []
+    failures = [RuntimeError("codec bug")]
+
+    async def fake_publish_raw(
+        topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False, content_type: str | None = None
+    ) -> None:
+        if failures:
+            raise failures.pop()
+        published.append(topic)
+
+    async def fake_ensure_connected() -> None:
+        proxy.client._connected.set()
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    proxy.client._ensure_connected = fake_ensure_connected  # type: ignore[method-assign]
+    proxy.client.reconnect_interval = 0.01
+    await proxy.publish_message("raw/0/", b"0")
+    await proxy.publish_message("raw/1/", b"1")
+    assert proxy.outbox_stats().backlog == 2  # type: ignore[union-attr]
+
+    proxy._ensure_outbox_replay_started()
+    for _ in range(100):
+        if not proxy.outbox_stats().backlog:  # type: ignore[union-attr]
+            break
+        await asyncio.sleep(0.01)
+    assert published == ["raw/0/", "raw/1/"]
+    assert not proxy._outbox_task.done()  # type: ignore[union-attr]
+    await proxy.stop()
+    proxy._outbox.close()  # type: ignore[union-attr]
@@ -1,13 +1,55 @@
 from __future__ import annotations
 
+import importlib.util
 import json
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
 from uns_kit import UnsPacket
+from uns_kit.core.packet import (
+    PacketCodec,
+    PacketEncoder,
+    TableColumnPayload,
+    TableTemplate,
+    _epoch_ms_from_iso,
+    detect_packet_codec,
+    isoformat,
+    table_shape_cache_clear,
+    table_shape_cache_info,
+)
 
 
 TABLE_TIME = "2026-07-09T10:00:00.000Z"
+ENCODER_BACKENDS = [
+    "json",
+    pytest.param(
+        "orjson",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("orjson") is None,
+            reason="orjson is not installed",
+        ),
+    ),
+]
+
+
+PACKET_CODECS = [
+    "json",
+    pytest.param(
+        "msgpack",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("msgpack") is None,
+            reason="msgpack is not installed",
+        ),
+    ),
+    pytest.param(
+        "cbor",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("cbor2") is None,
+            reason="cbor2 is not installed",
+        ),
+    ),
+]
 
 
 def test_table_normalizes_transitional_legacy_columns_to_named_object() -> None:
@@ -142,6 +184,100 @@ def test_parse_rejects_unsupported_packet_version() -> None:
     assert UnsPacket.parse(raw_packet) is None
 
 
+@pytest.mark.parametrize("validate", ["strict", "lazy", "trusted"])
+def test_parse_view_reads_data_from_memoryview(validate: str) -> None:
+    packet = UnsPacket.data(value=42.1, uom="kW", time=TABLE_TIME, data_group="m")
+    payload = memoryview(UnsPacket.to_bytes(packet))
+
+    view = UnsPacket.parse_view(payload, validate=validate)  # type: ignore[arg-type]
+
+    assert view is not None
+    assert view.value == 42.1
+    assert view.value_type == "number"
+    assert (view.uom, view.time, view.data_group) == ("kW", TABLE_TIME, "m")
+    assert view.table is None
+    assert view.to_dict() == UnsPacket.parse(bytes(payload).decode())
+
+
+def test_parse_view_matches_parse_for_legacy_table() -> None:
+    raw_packet = json.dumps(
+        {
+            "version": "1.0.0",
+            "message": {
+                "table": {
+                    "time": TABLE_TIME,
+                    "columns": [{"name": "line speed", "type": "double", "value": 1.5}],
+                }
+            },
+        }
+    ).encode()
+
+    view = UnsPacket.parse_view(raw_packet)
+
+    assert view is not None
+    assert view.columns == {"line speed": {"type": "double", "value": 1.5}}
+    assert view.time == TABLE_TIME
+    assert view.to_dict() == UnsPacket.parse(raw_packet.decode())
+
+
+def test_parse_view_validation_modes() -> None:
+    raw_packet = json.dumps(
+        {"version": "2.0.0", "message": {"data": {"value": True}}}
+    ).encode()
+
+    assert UnsPacket.parse_view(raw_packet, validate="strict") is None
+
+    lazy = UnsPacket.parse_view(raw_packet, validate="lazy")
+    assert lazy is not None
+    with pytest.raises(ValueError, match="data.value must be string or number"):
+        lazy.value
+
+    trusted = UnsPacket.parse_view(raw_packet, validate="trusted")
+    assert trusted is not None
+    assert trusted.value is True
+
+    unsupported = json.dumps({"version": "3.0.0", "message": {}}).encode()
+    assert UnsPacket.parse_view(unsupported, validate="lazy") is None
+    assert UnsPacket.parse_view(b"not json") is None
+    with pytest.raises(ValueError, match="Unsupported packet validation mode"):
+        UnsPacket.parse_view(raw_packet, validate="loose")  # type: ignore[arg-type]
+
+
+def test_parse_caches_validated_table_shapes() -> None:
+    table_shape_cache_clear()
+
+    def raw_table(power: object) -> str:
+        return json.dumps(
+            {
+                "version": "2.0.0",
+                "message": {
+                    "table": {
+                        "time": TABLE_TIME,
+                        "columns": {
+                            "power": {"type": "double", "value": power, "uom": "kW"},
+                            "running": {"type": "boolean", "value": True},
+                        },
+                    }
+                },
+            }
+        )
+
+    first = UnsPacket.parse(raw_table(1.5))
+    second = UnsPacket.parse(raw_table(2.5))
+
+    assert first is not None and second is not None
+    assert second["message"]["table"]["columns"] == {
+        "power": {"type": "double", "value": 2.5, "uom": "kW"},
+        "running": {"type": "boolean", "value": True},
+    }
+    info = table_shape_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    assert UnsPacket.parse(raw_table(None)) is None
+    assert UnsPacket.parse(raw_table([1, 2])) is None
+    assert table_shape_cache_info().hits == 3
+
+
 def test_table_rejects_duplicate_legacy_column_names() -> None:
     with pytest.raises(ValueError, match="duplicate column name 'power'"):
         UnsPacket.table(
@@ -186,3 +322,311 @@ def test_table_rejects_duplicate_legacy_column_names() -> None:
 def test_table_rejects_invalid_named_columns(columns: dict, message: str) -> None:
     with pytest.raises(ValueError, match=message):
         UnsPacket.table(time=TABLE_TIME, columns=columns)
+
+
+@pytest.mark.parametrize("backend", ENCODER_BACKENDS)
+@pytest.mark.parametrize(
+    "packet",
+    [
+        UnsPacket.data(value=42.1, uom="kW", time=TABLE_TIME, data_group="metering"),
+        UnsPacket.data(value="Läuft – 温度", time=TABLE_TIME),
+        UnsPacket.data(value=1e16, time=TABLE_TIME),
+        UnsPacket.data(value=-4.5e-7, time=TABLE_TIME),
+        UnsPacket.data(value=0.00005, time=TABLE_TIME),
+        UnsPacket.data(value=-1.5e-05, time=TABLE_TIME),
+        UnsPacket.data(value=float("nan"), time=TABLE_TIME),
+        UnsPacket.data(value=2**70, time=TABLE_TIME),
+        UnsPacket.data(value='tab\tquote"ctrl\x01del\x7f', time=TABLE_TIME),
+        UnsPacket.table(
+            time=TABLE_TIME,
+            columns={
+                "power": {"type": "double", "value": 42.1, "uom": "kW"},
+                "running": {"type": "boolean", "value": True},
+                "batch": {"type": "symbol", "value": "B-17"},
+            },
+        ),
+    ],
+)
+def test_packet_encoder_matches_to_json_bytes(backend: str, packet: dict) -> None:
+    packet = {**packet, "sequenceId": 7, "interval": 1000}
+
+    encoded = PacketEncoder(backend).encode(packet)  # type: ignore[arg-type]
+
+    assert encoded == UnsPacket.to_json(packet).encode()
+    assert encoded == json.dumps(packet, separators=(",", ":")).encode()
+
+
+def test_packet_encoder_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unsupported packet encoder backend"):
+        PacketEncoder("yaml")  # type: ignore[arg-type]
+
+
+def test_to_bytes_raises_for_unserializable_values_like_to_json() -> None:
+    packet = {"version": "2.0.0", "message": {"data": {"value": object()}}}
+
+    with pytest.raises(TypeError):
+        UnsPacket.to_bytes(packet)
+
+
+def _per_row_table_bytes(rows: list[dict], **kwargs) -> list[bytes]:
+    return [
+        UnsPacket.to_bytes(UnsPacket.table(columns=columns, **kwargs))
+        for columns in rows
+    ]
+
+
+def test_table_batch_matches_per_row_packets_for_column_mapping() -> None:
+    np = pytest.importorskip("numpy")
+    frame = {
+        "power": np.array([42.1, float("nan"), 1e16]),
+        "count": np.array([1, 2, 3], dtype=np.int32),
+        "running": np.array([True, False, True]),
+        "batch": ["B-17", "Läuft", None],
+    }
+
+    encoded = list(
+        UnsPacket.table_batch(
+            frame, uoms={"power": "kW"}, time=TABLE_TIME, data_group="metering"
+        )
+    )
+
+    assert encoded == _per_row_table_bytes(
+        [
+            {
+                "power": {"type": "double", "value": 42.1, "uom": "kW"},
+                "count": {"type": "int", "value": 1},
+                "running": {"type": "boolean", "value": True},
+                "batch": {"type": "varchar", "value": "B-17"},
+            },
+            {
+                "count": {"type": "int", "value": 2},
+                "running": {"type": "boolean", "value": False},
+                "batch": {"type": "varchar", "value": "Läuft"},
+            },
+            {
+                "power": {"type": "double", "value": 1e16, "uom": "kW"},
+                "count": {"type": "int", "value": 3},
+                "running": {"type": "boolean", "value": True},
+            },
+        ],
+        time=TABLE_TIME,
+        data_group="metering",
+    )
+
+
+def test_table_batch_matches_per_row_packets_for_pandas_and_arrow() -> None:
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame(
+        {
+            "ts": pd.to_datetime(
+                ["2026-07-09T10:00:00.125Z", "2026-07-09T10:00:01.250Z"]
+            ),
+            "power": [42.5, -3.0],
+            "line": pd.Categorical(["L1", "L2"]),
+        }
+    )
+    expected = [
+        UnsPacket.to_bytes(
+            UnsPacket.table(
+                time=time,
+                columns={
+                    "power": {"type": "double", "value": power},
+                    "line": {"type": "symbol", "value": line},
+                },
+            )
+        )
+        for time, power, line in [
+            ("2026-07-09T10:00:00.125Z", 42.5, "L1"),
+            ("2026-07-09T10:00:01.250Z", -3.0, "L2"),
+        ]
+    ]
+
+    assert list(UnsPacket.table_batch(frame, time_column="ts")) == expected
+
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    assert list(UnsPacket.table_batch(table, time_column="ts")) == expected
+
+
+def test_table_batch_matches_to_json_for_small_floats() -> None:
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"drift": [0.00005, 1.5e-05, 0.25]})
+
+    encoded = list(UnsPacket.table_batch(frame, time=TABLE_TIME))
+
+    assert encoded == [
+        UnsPacket.to_json(
+            UnsPacket.table(
+                time=TABLE_TIME, columns={"drift": {"type": "double", "value": value}}
+            )
+        ).encode()
+        for value in (0.00005, 1.5e-05, 0.25)
+    ]
+    assert b'"value":5e-05' in encoded[0]
+
+
+def test_table_batch_validates_columns_before_encoding() -> None:
+    with pytest.raises(ValueError, match="could not be inferred"):
+        UnsPacket.table_batch({"empty": [None, None]}, time=TABLE_TIME)
+    with pytest.raises(ValueError, match="valid QuestDB type"):
+        UnsPacket.table_batch(
+            {"power": [1.0]}, column_types={"power": "real"}, time=TABLE_TIME
+        )
+    with pytest.raises(ValueError, match="same length"):
+        UnsPacket.table_batch({"a": [1, 2], "b": [1]}, time=TABLE_TIME)
+    with pytest.raises(TypeError):
+        UnsPacket.table_batch([[1, 2]], time=TABLE_TIME)
+
+
+def test_table_template_matches_table_packet_bytes() -> None:
+    template = TableTemplate(
+        [
+            TableColumnPayload(name="power", type="double", value=None, uom="kW"),
+            {"name": "running", "type": "boolean"},
+            {"name": "batch", "type": "varchar"},
+        ],
+        data_group="metering",
+    )
+
+    encoded = template.encode(
+        (42.1, True, "Läuft"),
+        time=TABLE_TIME,
+        expires_at="2026-07-09T11:00:00.000Z",
+    )
+    partial = template.encode((float("nan"), None, "B-17"), time=TABLE_TIME)
+
+    assert template.names == ("power", "running", "batch")
+    assert encoded == UnsPacket.to_bytes(
+        UnsPacket.table(
+            time=TABLE_TIME,
+            data_group="metering",
+            expires_at="2026-07-09T11:00:00.000Z",
+            columns={
+                "power": {"type": "double", "value": 42.1, "uom": "kW"},
+                "running": {"type": "boolean", "value": True},
+                "batch": {"type": "varchar", "value": "Läuft"},
+            },
+        )
+    )
+    assert partial == UnsPacket.to_bytes(
+        UnsPacket.table(
+            time=TABLE_TIME,
+            data_group="metering",
+            columns={
+                "power": {"type": "double", "value": float("nan"), "uom": "kW"},
+                "batch": {"type": "varchar", "value": "B-17"},
+            },
+        )
+    )
+
+
+def test_table_template_validates_schema_and_rows() -> None:
+    with pytest.raises(ValueError, match="valid QuestDB type"):
+        TableTemplate({"power": {"type": "real"}})
+    with pytest.raises(ValueError, match="must match"):
+        TableTemplate({"line speed": {"type": "double"}})
+
+    template = TableTemplate({"power": {"type": "double"}})
+    with pytest.raises(ValueError, match="template expects 1"):
+        template.encode((1.0, 2.0), time=TABLE_TIME)
+    with pytest.raises(ValueError, match="at least one non-null value"):
+        template.encode((None,), time=TABLE_TIME)
+    with pytest.raises(ValueError, match="must be string, number, boolean, or null"):
+        template.encode(([1.0],), time=TABLE_TIME)
+
+
+def test_series_packet_round_trips_to_per_sample_data_packets() -> None:
+    times = ["2026-07-09T10:00:00.000Z", "2026-07-09T10:00:00.001Z"]
+
+    iso_packet = UnsPacket.series([1.5, 2.5], times, uom="mm/s", data_group="vib")
+    delta_packet = UnsPacket.series(
+        [1.5, 2.5], times, uom="mm/s", data_group="vib", delta_encode=True
+    )
+
+    assert delta_packet["message"]["series"] == {
+        "values": [1.5, 2.5],
+        "startTime": 1783591200000,
+        "timeDeltas": [0, 1],
+        "uom": "mm/s",
+        "dataGroup": "vib",
+        "valueType": "number",
+    }
+    expected = [
+        UnsPacket.data(value=value, uom="mm/s", time=time, data_group="vib")
+        for time, value in zip(times, [1.5, 2.5])
+    ]
+    for packet in (iso_packet, delta_packet):
+        parsed = UnsPacket.parse(UnsPacket.to_json(packet))
+        assert parsed is not None
+        assert UnsPacket.expand_series(parsed) == expected
+
+        view = UnsPacket.parse_view(UnsPacket.to_bytes(packet))
+        assert view is not None
+        assert view.samples() == list(zip(times, [1.5, 2.5]))
+
+
+@pytest.mark.parametrize(
+    ("series", "message"),
+    [
+        ({"values": [], "times": []}, "non-empty array"),
+        ({"values": [1, "a"], "times": ["t", "t"]}, "all be strings or all"),
+        ({"values": [1], "times": ["t", "t"]}, "same length"),
+        ({"values": [1], "startTime": "now", "timeDeltas": [0]}, "epoch milliseconds"),
+        ({"values": [1], "times": ["t"], "startTime": 0}, "not both"),
+    ],
+)
+def test_parse_rejects_invalid_series(series: dict, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        UnsPacket.from_message({"series": series})
+    raw_packet = json.dumps({"version": "2.0.0", "message": {"series": series}})
+    assert UnsPacket.parse(raw_packet) is None
+
+
+@pytest.mark.parametrize("codec_name", PACKET_CODECS)
+def test_packet_codecs_round_trip_and_are_detected(codec_name: str) -> None:
+    codec = PacketCodec(codec_name)  # type: ignore[arg-type]
+    packet = {
+        **UnsPacket.table(
+            time=TABLE_TIME,
+            columns={
+                "power": {"type": "double", "value": 42.1, "uom": "kW"},
+                "batch": {"type": "varchar", "value": "Läuft"},
+            },
+        ),
+        "sequenceId": 7,
+    }
+
+    payload = codec.encode(packet)
+
+    assert detect_packet_codec(payload) == codec_name
+    assert detect_packet_codec(b"{}", codec.content_type) == codec_name
+    assert codec.decode(memoryview(payload)) == packet
+    assert UnsPacket.parse(payload) == UnsPacket.parse(UnsPacket.to_json(packet))
+    view = UnsPacket.parse_view(payload, content_type=codec.content_type)
+    assert view is not None
+    assert view.columns == packet["message"]["table"]["columns"]
+
+
+def test_packet_codec_rejects_unknown_codec() -> None:
+    with pytest.raises(ValueError, match="Unsupported packet codec"):
+        PacketCodec("protobuf")  # type: ignore[arg-type]
+
+
+def test_iso_times_use_the_cached_second_prefix_consistently() -> None:
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    start = datetime(2026, 3, 1, 23, 59, 58, 999_999, tzinfo=timezone.utc)
+    for step in range(0, 3_000, 7):
+        value = start + timedelta(milliseconds=step, microseconds=-step)
+        expected = value.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        assert isoformat(value) == expected
+        assert _epoch_ms_from_iso(expected) == (value - epoch) // timedelta(
+            milliseconds=1
+        )
+
+    cet = timezone(timedelta(hours=1))
+    new_year = "2026-01-01T00:00:00.000Z"
+    assert isoformat(datetime(2026, 1, 1, 1, 0, tzinfo=cet)) == new_year
+    assert isoformat(datetime(2026, 1, 1)) == new_year
+    assert _epoch_ms_from_iso("2026-01-01T01:00:00+01:00") == 1_767_225_600_000
+    data = UnsPacket.data(value=1, time=1_767_225_600_123)["message"]["data"]
+    assert data["time"] == "2026-01-01T00:00:00.123Z"
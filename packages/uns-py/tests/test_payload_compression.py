@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.payload_compression import PayloadCompressor, decompress_payload
+from uns_kit.core.topic_builder import TopicBuilder
+
+COMPRESSIONS = [
+    "zlib",
+    pytest.param(
+        "zstd",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("zstandard") is None,
+            reason="zstandard is not installed",
+        ),
+    ),
+]
+REGISTRY_PAYLOAD = json.dumps(
+    [{"topic": f"plant/site/line-{index}/motor/main/temperature", "attributeType": "Data"} for index in range(200)],
+    separators=(",", ":"),
+).encode()
+
+
+@pytest.mark.parametrize("algorithm", COMPRESSIONS)
+def test_payload_compressor_round_trips_above_threshold(algorithm: str) -> None:
+    compressor = PayloadCompressor(algorithm, threshold=1024)  # type: ignore[arg-type]
+
+    compressed = compressor.compress(REGISTRY_PAYLOAD)
+
+    assert compressed is not None
+    assert len(compressed) < len(REGISTRY_PAYLOAD) / 5
+    assert decompress_payload(compressed, algorithm) == REGISTRY_PAYLOAD
+    assert decompress_payload(compressed) == compressed
+    assert decompress_payload(compressed, sniff=True) == REGISTRY_PAYLOAD
+    assert compressor.compress(b'{"version":"2.0.0"}') is None
+
+
+def test_decompress_payload_passes_uncompressed_payloads_through() -> None:
+    assert decompress_payload(REGISTRY_PAYLOAD, sniff=True) == REGISTRY_PAYLOAD
+    assert decompress_payload(b"x^ not compressed", sniff=True) == b"x^ not compressed"
+    with pytest.raises(zlib.error):
+        decompress_payload(b"x^ not compressed", "zlib")
+    with pytest.raises(zlib.error):
+        decompress_payload(zlib.compress(REGISTRY_PAYLOAD)[:-8], "zlib")
+
+
+@pytest.mark.parametrize("algorithm", COMPRESSIONS)
+def test_decompress_payload_rejects_output_beyond_max_size(algorithm: str) -> None:
+    bomb = PayloadCompressor(algorithm, threshold=0).compress(bytes(8 * 1024 * 1024))  # type: ignore[arg-type]
+    assert bomb is not None and len(bomb) < 64 * 1024
+
+    with pytest.raises(ValueError, match="exceeds"):
+        decompress_payload(bomb, algorithm, max_size=1024 * 1024)
+    with pytest.raises(ValueError, match="exceeds"):
+        decompress_payload(bomb, sniff=True, max_size=1024 * 1024)
+    assert len(decompress_payload(bomb, algorithm)) == 8 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_client_compresses_large_payloads_and_decompresses_messages() -> None:
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        mqtt5=True,
+        compression="zlib",
+        compression_threshold=1024,
+        enable_status=False,
+    )
+    published: list[tuple[str, bytes, object]] = []
+
+    async def publish(topic: str, payload: bytes, *, qos: int, retain: bool, properties: object) -> None:
+        published.append((topic, payload, properties))
+
+    client._client = SimpleNamespace(publish=publish)  # type: ignore[assignment]
+    client._connected.set()
+
+    await client.publish_raw("registry/topics", REGISTRY_PAYLOAD, retain=True)
+    await client.publish_raw("small", b"{}")
+
+    (_, large_payload, properties), (_, small_payload, small_properties) = published
+    assert properties.UserProperty == [("content-encoding", "zlib")]  # type: ignore[attr-defined]
+    assert small_payload == b"{}" and small_properties is None
+
+    message = SimpleNamespace(topic="registry/topics", payload=large_payload, properties=properties)
+    client._decompress_message(message)  # type: ignore[arg-type]
+    assert message.payload == REGISTRY_PAYLOAD
+
+    # Without the property a payload is only decompressed when sniffing is turned on.
+    unmarked = SimpleNamespace(topic="third-party/blob", payload=large_payload, properties=None)
+    client._decompress_message(unmarked)  # type: ignore[arg-type]
+    assert unmarked.payload == large_payload
+    client.sniff_compression = True
+    client._decompress_message(unmarked)  # type: ignore[arg-type]
+    assert unmarked.payload == REGISTRY_PAYLOAD
+
+
+def test_client_rejects_compression_without_mqtt5() -> None:
+    # MQTT 3.1.1 cannot carry the content-encoding property, so receivers would get raw compressed bytes.
+    with pytest.raises(ValueError, match="MQTT 5"):
+        UnsMqttClient(
+            "localhost",
+            topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+            compression="zlib",
+            enable_status=False,
+        )
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 import threading
 from typing import Any
 
+from uns_kit.core.client import UnsMqttClient
 from uns_kit.core.proxy_process import UnsProxyProcess
-from uns_kit.core.proxy_process_sync import UnsMqttProxySync, UnsProxyProcessSync
+from uns_kit.core.proxy_process_sync import UnsMqttProxySync, UnsProxyProcessSync, _LoopThread, _SyncSubscriptionIterator
+from uns_kit.core.topic_builder import TopicBuilder
 from uns_kit.core.uns_mqtt_proxy import MessageMode
 
 
@@ -19,10 +22,12 @@ class _FakeAsyncClient:
     def __init__(self) -> None:
         self.messages_calls: list[Any] = []
         self.resilient_calls: list[Any] = []
+        self.limits: list[dict[str, Any]] = []
 
     @asynccontextmanager
-    async def messages(self, topics: str | list[str]):
+    async def messages(self, topics: str | list[str], **limits: Any):
         self.messages_calls.append(topics)
+        self.limits.append(limits)
 
         async def iterator():
             yield _FakeMessage("uns-infra/test/one", b"one")
@@ -30,8 +35,9 @@ class _FakeAsyncClient:
 
         yield iterator()
 
-    async def resilient_messages(self, topics: str | list[str]):
+    async def resilient_messages(self, topics: str | list[str], **limits: Any):
         self.resilient_calls.append(topics)
+        self.limits.append(limits)
         yield _FakeMessage("uns-infra/test/reconnect", b"three")
 
 
@@ -51,6 +57,9 @@ class _FakeAsyncProxy:
     async def publish_mqtt_message(self, mqtt_message: dict[str, Any], mode: MessageMode = MessageMode.RAW) -> None:
         self.calls.append(("publish_mqtt_message", mqtt_message, mode))
 
+    async def publish_many(self, mqtt_messages: list[dict[str, Any]], mode: MessageMode = MessageMode.RAW) -> None:
+        self.calls.append(("publish_many", mqtt_messages, mode))
+
     async def drain_publishes(self, *, timeout: float | None = None) -> None:
         self.calls.append(("drain_publishes", timeout))
 
@@ -110,6 +119,7 @@ def test_sync_process_wraps_async_mqtt_proxy(monkeypatch) -> None:
         },
         mode=MessageMode.RAW,
     )
+    proxy.publish_many([{"topic": "raw/data/", "attributes": []}])
     with proxy.messages("uns-infra/#") as messages:
         assert [msg.payload for msg in messages] == [b"one", b"two"]
     assert [msg.payload for msg in proxy.resilient_messages("uns-infra/#")] == [b"three"]
@@ -138,6 +148,7 @@ def test_sync_process_wraps_async_mqtt_proxy(monkeypatch) -> None:
             },
             MessageMode.RAW,
         ),
+        ("publish_many", [{"topic": "raw/data/", "attributes": []}], MessageMode.RAW),
         ("drain_publishes", None),
         ("flush", None),
         ("stop", True, 30.0),
@@ -145,6 +156,7 @@ def test_sync_process_wraps_async_mqtt_proxy(monkeypatch) -> None:
     ]
     assert fake_proxy.client.messages_calls == ["uns-infra/#"]
     assert fake_proxy.client.resilient_calls == ["uns-infra/#"]
+    assert fake_proxy.client.limits == [{"max_size": None, "policy": None}] * 2
 
 
 def test_sync_proxy_subscribe_invokes_on_message(monkeypatch) -> None:
@@ -204,3 +216,47 @@ def test_sync_process_context_manager_starts_and_stops(monkeypatch) -> None:
         assert process.get_process_name() == "sync-process"
 
     assert state == {"started": 1, "stopped": 1}
+
+
+class _FakeSubscribingConnection:
+    async def subscribe(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def unsubscribe(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    @property
+    def messages(self):
+        async def iterate():
+            await asyncio.Event().wait()
+            yield
+
+        return iterate()
+
+
+def test_sync_iterator_bounds_the_client_subscription_and_counts_once() -> None:
+    loop_thread = _LoopThread()
+
+    async def connected_client() -> UnsMqttClient:
+        client = UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), enable_status=False)
+        client._client = _FakeSubscribingConnection()  # type: ignore[assignment]
+        client._connected.set()
+        return client
+
+    client = loop_thread.run(connected_client())
+    iterator = _SyncSubscriptionIterator(client, loop_thread, "raw/#", resilient=False, max_size=3, policy="drop-oldest")
+
+    async def subscriptions() -> list[Any]:
+        while not client.dispatcher._subscriptions:
+            await asyncio.sleep(0.01)
+        return list(client.dispatcher._subscriptions)
+
+    (subscription,) = loop_thread.run(subscriptions(), timeout=1)
+    # The caller's limit is the one the read loop sees, and only that buffer reports metrics.
+    assert (subscription.stats().max_size, subscription.stats().policy) == (3, "drop-oldest")
+    assert (iterator.stats().max_size, iterator.stats().policy) == (3, "drop-oldest")
+    assert list(client._inbound_metrics.buffers) == [subscription._buffer]
+
+    iterator.close()
+    loop_thread.run(client.close())
+    loop_thread.close()
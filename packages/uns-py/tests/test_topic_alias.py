@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+
+from uns_kit.core import client as client_module
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.topic_alias import TopicAliasTable
+from uns_kit.core.topic_builder import TopicBuilder
+
+
+def test_alias_table_binds_then_reuses_aliases() -> None:
+    table = TopicAliasTable(2)
+    assert table.resolve("a/") == ("a/", 1)
+    assert table.resolve("b/") == ("b/", 2)
+    assert table.resolve("a/") == ("", 1)
+    assert TopicAliasTable(0).resolve("a/") == ("a/", None)
+
+
+def test_alias_table_keeps_hot_set_and_evicts_idle_topics() -> None:
+    table = TopicAliasTable(2)
+    table.resolve("a/")
+    table.resolve("b/")
+    # Both aliases were used recently: a third topic goes out unaliased.
+    assert table.resolve("c/") == ("c/", None)
+    for _ in range(5):
+        table.resolve("b/")
+    # "a/" has been idle for more than 2 * maximum lookups: its alias is re-bound.
+    assert table.resolve("c/") == ("c/", 1)
+    assert table.resolve("a/") == ("a/", None)
+    stats = table.stats()
+    assert (stats.size, stats.evictions, stats.bypassed) == (2, 1, 2)
+
+
+class _FakePaho:
+    def __init__(self) -> None:
+        self.on_connect = lambda *args: None
+
+
+class _FakeAiomqttClient:
+    instances: list["_FakeAiomqttClient"] = []
+    topic_alias_maximum = 10
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self._client = _FakePaho()
+        self.published: list[tuple[str, int, int | None]] = []
+        _FakeAiomqttClient.instances.append(self)
+
+    async def __aenter__(self) -> "_FakeAiomqttClient":
+        properties = Properties(PacketTypes.CONNACK)
+        properties.TopicAliasMaximum = self.topic_alias_maximum
+        self._client.on_connect(self._client, None, None, 0, properties)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    async def publish(self, topic: str, payload: bytes, *, qos: int = 0, retain: bool = False, properties: Any = None) -> None:
+        self.published.append((topic, qos, getattr(properties, "TopicAlias", None)))
+
+
+@pytest.mark.asyncio
+async def test_client_sends_aliases_for_qos0_and_resets_them_on_reconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    _FakeAiomqttClient.instances = []
+    monkeypatch.setattr(client_module.aiomqtt, "Client", _FakeAiomqttClient)
+    client = UnsMqttClient(
+        "localhost",
+        topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"),
+        enable_status=False,
+        mqtt5=True,
+        topic_aliases=True,
+    )
+    topic = "enterprise/site/area/line/asset/energy-meter/main/active-power/"
+    await client.publish_raw(topic, b"1")
+    await client.publish_raw(topic, b"2")
+    await client.publish_raw(topic, b"3", qos=1)
+    first = _FakeAiomqttClient.instances[0]
+    assert first.published == [(topic, 0, 1), ("", 0, 1), (topic, 1, None)]
+    assert client.topic_alias_stats().maximum == 10  # type: ignore[union-attr]
+
+    client._connected.clear()
+    await client.publish_raw(topic, b"4")
+    second = _FakeAiomqttClient.instances[1]
+    assert second.published == [(topic, 0, 1)]
+    await client.close()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+
+import aiomqtt
+import pytest
+
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.topic_builder import TopicBuilder
+from uns_kit.core.topic_dispatcher import TopicTrie
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.subscribed: list[str] = []
+        self.unsubscribed: list[str] = []
+        self.inbox: asyncio.Queue[aiomqtt.Message | None] = asyncio.Queue()
+
+    async def subscribe(self, topic: str, *args: object, **kwargs: object) -> None:
+        self.subscribed.append(topic)
+
+    async def unsubscribe(self, topic: str, *args: object, **kwargs: object) -> None:
+        self.unsubscribed.append(topic)
+
+    @property
+    def messages(self):
+        async def iterate():
+            while True:
+                message = await self.inbox.get()
+                if message is None:
+                    raise aiomqtt.MqttError("Disconnected during message iteration")
+                yield message
+
+        return iterate()
+
+    def deliver(self, topic: str, payload: bytes) -> None:
+        self.inbox.put_nowait(aiomqtt.Message(topic, payload, 0, False, 0, None))
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
+def _connected_client() -> tuple[UnsMqttClient, _FakeConnection]:
+    client = UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), enable_status=False)
+    connection = _FakeConnection()
+    client._client = connection  # type: ignore[assignment]
+    client._connected.set()
+    return client, connection
+
+
+@pytest.mark.parametrize(
+    ("topic_filter", "topic", "expected"),
+    [
+        ("a/b", "a/b", True),
+        ("a/b", "a/c", False),
+        ("a/+", "a/b", True),
+        ("a/+", "a/b/c", False),
+        ("a/+/c", "a/b/c", True),
+        ("a/#", "a", True),
+        ("a/#", "a/b/c", True),
+        ("#", "a/b", True),
+        ("#", "$SYS/broker", False),
+        ("+/broker", "$SYS/broker", False),
+        ("$SYS/#", "$SYS/broker", True),
+        ("raw/data/", "raw/data/", True),
+        ("raw/data/", "raw/data", False),
+        ("raw/+/", "raw/data/", True),
+    ],
+)
+def test_topic_trie_follows_mqtt_wildcard_semantics(topic_filter: str, topic: str, expected: bool) -> None:
+    trie: TopicTrie[str] = TopicTrie()
+    trie.add(topic_filter, "value")
+    assert (trie.match(topic) == ["value"]) is expected
+
+
+def test_topic_trie_remove_prunes_and_rejects_invalid_filters() -> None:
+    trie: TopicTrie[int] = TopicTrie()
+    trie.add("a/+/c", 1)
+    trie.add("a/#", 2)
+    assert sorted(trie.match("a/b/c")) == [1, 2]
+    assert trie.remove("a/+/c", 1)
+    assert not trie.remove("a/+/c", 1)
+    assert trie.match("a/b/c") == [2]
+    assert len(trie) == 1
+    with pytest.raises(ValueError):
+        trie.add("a/#/b", 3)
+    with pytest.raises(ValueError):
+        trie.add("a/b+", 3)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_message_contexts_each_receive_matching_messages() -> None:
+    client, connection = _connected_client()
+
+    async with client.messages("uns-infra/#") as infra, client.messages(["raw/+/", "uns-infra/a/"]) as raw:
+        assert connection.subscribed == ["uns-infra/#", "raw/+/", "uns-infra/a/"]
+        connection.deliver("uns-infra/a/", b"one")
+        connection.deliver("raw/data/", b"two")
+        assert (await infra.__anext__()).payload == b"one"
+        assert (await raw.__anext__()).payload == b"one"
+        assert (await raw.__anext__()).payload == b"two"
+
+    assert sorted(connection.unsubscribed) == ["raw/+/", "uns-infra/#", "uns-infra/a/"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_reference_counts_broker_subscriptions() -> None:
+    client, connection = _connected_client()
+    received: list[bytes] = []
+
+    first = await client.dispatcher.subscribe("raw/#", handler=lambda message: received.append(message.payload))
+    second = await client.dispatcher.subscribe("raw/#")
+    assert connection.subscribed == ["raw/#"]
+    assert client.dispatcher.refcount("raw/#") == 2
+
+    await first.close()
+    assert connection.unsubscribed == []
+    connection.deliver("raw/data/", b"value")
+    assert (await second.__anext__()).payload == b"value"
+    assert received == []
+
+    await second.close()
+    assert connection.unsubscribed == ["raw/#"]
+    assert client.dispatcher.topic_filters == []
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_resubscribes_after_reconnect() -> None:
+    client, connection = _connected_client()
+    subscription = await client.dispatcher.subscribe(["raw/#", "uns-infra/#"])
+    await asyncio.sleep(0)
+
+    reconnected = _FakeConnection()
+
+    async def fake_connect_once() -> None:
+        client._client = reconnected  # type: ignore[assignment]
+        client._connected.set()
+
+    client._connect_once = fake_connect_once  # type: ignore[method-assign]
+    client.reconnect_interval = 0
+    connection.inbox.put_nowait(None)
+    await asyncio.sleep(0.05)
+
+    assert reconnected.subscribed == ["raw/#", "uns-infra/#"]
+    reconnected.deliver("raw/data/", b"after")
+    assert (await subscription.__anext__()).payload == b"after"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stalled_channel_backlog_is_bounded_by_its_block_buffer() -> None:
+    client, connection = _connected_client()
+    dispatcher = client.dispatcher
+    slow = await dispatcher.subscribe("slow/#", max_size=2, policy="block", channel="slow")
+    for index in range(10):
+        connection.deliver("slow/data/", str(index).encode())
+    await asyncio.sleep(0.05)
+
+    # Two in the buffer, one waiting for room, two held back; the read loop waits for the rest.
+    assert len(slow._buffer) == 2
+    assert len(dispatcher._backlogs["slow"]) == 2
+    assert connection.inbox.qsize() == 4
+
+    received = [(await slow.__anext__()).payload for _ in range(10)]
+    assert received == [str(index).encode() for index in range(10)]
+    assert slow.stats().dropped == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stalled_channel_backlog_applies_the_drop_policy() -> None:
+    client, connection = _connected_client()
+    dispatcher = client.dispatcher
+    hold = await dispatcher.subscribe("hold/#", max_size=1, policy="block", channel="slow")
+    data = await dispatcher.subscribe("data/#", max_size=2, policy="drop-oldest", channel="slow")
+    fast = await dispatcher.subscribe("fast/#", max_size=2, policy="block", channel="fast")
+    connection.deliver("hold/a/", b"first")
+    connection.deliver("hold/a/", b"second")
+    for index in range(10):
+        connection.deliver("data/a/", str(index).encode())
+    connection.deliver("fast/a/", b"fast")
+
+    # The slow channel holds back at most two data messages; the read loop keeps going.
+    assert (await asyncio.wait_for(fast.__anext__(), 1)).payload == b"fast"
+    assert len(dispatcher._backlogs["slow"]) == 2
+    assert data.stats().dropped == 8
+
+    assert (await hold.__anext__()).payload == b"first"
+    assert (await hold.__anext__()).payload == b"second"
+    assert [(await data.__anext__()).payload for _ in range(2)] == [b"8", b"9"]
+    await client.close()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from uns_kit.core import topic_state
+from uns_kit.core.topic_state import TopicStateStore
+from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
+
+
+def test_topic_state_evicts_least_recently_used_entries() -> None:
+    store: TopicStateStore[str, int] = TopicStateStore(max_entries=2, entry_bytes=28)
+    store["a"] = 1
+    store["b"] = 2
+    assert store.get("a") == 1
+    store["c"] = 3
+
+    assert "b" not in store and store.get("a") == 1 and store.get("c") == 3
+    stats = store.stats()
+    assert (stats.entries, stats.evicted) == (2, 1)
+    assert stats.approx_bytes > 2 * 28
+
+
+def test_topic_state_expires_entries_unused_for_a_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(topic_state.time, "monotonic", lambda: now[0])
+    store: TopicStateStore[str, int] = TopicStateStore(ttl=10)
+    store["hot"] = 1
+    store["cold"] = 2
+
+    now[0] += 10
+    store["new"] = 3
+    assert store.get("hot") == 1
+    now[0] += 10
+    store["newer"] = 4
+
+    # "cold" went unused for two generations; "hot" was used in between and is kept.
+    assert "cold" not in store and "hot" in store and "new" in store
+    assert store.evicted == 1
+
+    now[0] += 25
+    assert store.get("hot") is None
+    assert len(store) == 0 and store.stats().approx_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_proxy_state_is_bounded_and_reported() -> None:
+    proxy = UnsMqttProxy("localhost", process_name="test-process", instance_name="test-instance", state_max_entries=2)
+    packets: list[dict] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        if not topic.endswith("/topics"):
+            packets.append(json.loads(payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    for object_id in ("coil-1", "coil-2", "coil-3", "coil-1"):
+        await proxy.publish_mqtt_message(
+            {
+                "topic": "test/site/",
+                "asset": "line-1",
+                "objectType": "coil",
+                "objectId": object_id,
+                "attributes": {"attribute": "weight", "data": {"value": 1}},
+            }
+        )
+    await proxy.flush(timeout=1.0)
+
+    # The last value of coil-1 was evicted by coil-3, so its second packet has no interval.
+    assert [packet["sequenceId"] for packet in packets] == [0, 1, 2, 3]
+    assert all("interval" not in packet for packet in packets)
+    stats = proxy.state_stats()
+    # Two last values, two identities and one sequence id (sequence ids are per base topic).
+    assert stats.entries == 5 and stats.evicted == 4
+    metrics = proxy._state_metrics()
+    assert metrics["state-entries"] == (5, None) and metrics["state-evicted"] == (4, None)
+    assert proxy._state_metrics()["state-evicted"] == (0, None)
+    await proxy._stop_publish_workers()
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import json
+
+import aiomqtt
 import pytest
 
+from uns_kit.core.client import UnsMqttClient
+from uns_kit.core.packet import TableColumnPayload, TableTemplate, UnsPacket
+from uns_kit.core.topic_builder import TopicBuilder
 from uns_kit.core.uns_mqtt_proxy import UnsMqttProxy
 
 
@@ -255,3 +262,660 @@ async def test_flush_does_not_hang_if_publish_worker_exits() -> None:
         await proxy.flush(timeout=1.0)
 
     await proxy._stop_publish_workers(drain=False)
+
+
+@pytest.mark.asyncio
+async def test_publish_mqtt_message_enqueues_encoded_packet_bytes() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+    )
+
+    published: list[tuple[str, str | bytes]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        published.append((topic, payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    await proxy.publish_mqtt_message(
+        {
+            "topic": "test/site/",
+            "asset": "line-1",
+            "objectType": "motor",
+            "objectId": "main",
+            "attributes": {
+                "attribute": "temperature",
+                "data": {"time": "2026-01-01T00:00:00.000Z", "value": 21.5, "uom": "C"},
+            },
+        }
+    )
+    await proxy.flush(timeout=1.0)
+
+    payload = dict(published)["test/site/line-1/motor/main/temperature"]
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == {
+        "version": "2.0.0",
+        "message": {
+            "data": {
+                "time": "2026-01-01T00:00:00.000Z",
+                "value": 21.5,
+                "uom": "C",
+                "valueType": "number",
+            }
+        },
+        "sequenceId": 0,
+    }
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_publish_table_row_enqueues_template_bytes() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+    )
+    template = TableTemplate(
+        [
+            TableColumnPayload(name="power", type="double", value=None, uom="kW"),
+            TableColumnPayload(name="running", type="boolean", value=None),
+        ]
+    )
+
+    published: list[tuple[str, str | bytes]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        published.append((topic, payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    await proxy.publish_table_row(template, "test/site/line-1/meter", (42.5, True), time="2026-01-01T00:00:00.000Z")
+    await proxy.flush(timeout=1.0)
+
+    assert published == [("test/site/line-1/meter", template.encode((42.5, True), time="2026-01-01T00:00:00.000Z"))]
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_publish_mqtt_message_publishes_series_as_one_packet() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+    )
+
+    published: list[tuple[str, str | bytes]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        published.append((topic, payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    for start in (0, 2):
+        await proxy.publish_mqtt_message(
+            {
+                "topic": "test/site/",
+                "asset": "line-1",
+                "objectType": "motor",
+                "objectId": "main",
+                "attributes": {
+                    "attribute": "vibration",
+                    "series": UnsPacket.series(
+                        [0.1, 0.2],
+                        [1767225600000 + start, 1767225600001 + start],
+                        uom="mm/s",
+                        delta_encode=True,
+                    )["message"]["series"],
+                },
+            }
+        )
+    await proxy.flush(timeout=1.0)
+
+    packets = [json.loads(payload) for topic, payload in published if topic == "test/site/line-1/motor/main/vibration"]
+    assert [packet["sequenceId"] for packet in packets] == [0, 1]
+    assert packets[1]["interval"] == 1
+    assert packets[1]["message"]["series"]["startTime"] == 1767225600002
+    produced_topic = next(iter(proxy._produced_topics.values()))
+    assert produced_topic["attributeType"] == "Data"
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_publish_packet_uses_binary_codec_with_mqtt5_content_type() -> None:
+    pytest.importorskip("msgpack")
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        mqtt5=True,
+        packet_codec="msgpack",
+    )
+
+    published: list[tuple[str, bytes, str | None]] = []
+
+    async def fake_publish_raw(
+        topic: str, payload: bytes, *, qos: int = 0, retain: bool = False, content_type: str | None = None
+    ) -> None:
+        published.append((topic, payload, content_type))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    packet = UnsPacket.data(value=21.5, uom="C", time="2026-01-01T00:00:00.000Z")
+    await proxy.publish_packet("test/site/line-1/motor/main/temperature", packet)
+    await proxy.flush(timeout=1.0)
+
+    [(topic, payload, content_type)] = published
+    assert topic == "test/site/line-1/motor/main/temperature"
+    assert content_type == "application/msgpack"
+    assert UnsPacket.parse(payload, content_type=content_type) == UnsPacket.parse(UnsPacket.to_json(packet))
+    await proxy._stop_publish_workers()
+
+
+class _FakeSharedConnection:
+    def __init__(self) -> None:
+        self.published: list[str] = []
+        self.closed = False
+
+    async def publish(self, topic: str, payload: bytes, **kwargs: object) -> None:
+        self.published.append(topic)
+
+    async def __aexit__(self, *args: object) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_proxies_with_shared_connection_reuse_owner_client() -> None:
+    owner = UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), enable_status=False)
+    connection = _FakeSharedConnection()
+    owner._client = connection  # type: ignore[assignment]
+    owner._connected.set()
+
+    proxies = [
+        UnsMqttProxy("localhost", process_name="test-process", instance_name=f"instance-{index}", shared_connection=owner)
+        for index in range(3)
+    ]
+    for proxy in proxies:
+        await proxy.client.connect()
+        assert proxy.client._client is connection
+        await proxy.client.publish_raw(f"{proxy.instance_status_topic}probe", b"1")
+
+    assert sum(topic.endswith("probe") for topic in connection.published) == 3
+    for proxy in proxies:
+        await proxy.close()
+    assert not connection.closed
+    await owner.close()
+    assert connection.closed
+
+
+class _FakeSubscribingConnection(_FakeSharedConnection):
+    async def subscribe(self, *args: object, **kwargs: object) -> None:
+        return None
+
+    async def unsubscribe(self, *args: object, **kwargs: object) -> None:
+        return None
+
+    @property
+    def messages(self):
+        async def iterate():
+            await asyncio.Event().wait()
+            yield
+
+        return iterate()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_on_a_shared_connection_does_not_stall_other_proxies() -> None:
+    owner = UnsMqttClient("localhost", topic_builder=TopicBuilder("uns-kit", "0.0.1", "test-process"), enable_status=False)
+    owner._client = _FakeSubscribingConnection()  # type: ignore[assignment]
+    owner._connected.set()
+    slow, fast = (
+        UnsMqttProxy(
+            "localhost",
+            process_name="test-process",
+            instance_name=name,
+            shared_connection=owner,
+            inbound_max_size=max_size,
+            inbound_policy="block",
+        )
+        for name, max_size in (("slow", 2), ("fast", 10))
+    )
+
+    async with slow.client.messages("raw/#") as slow_messages, fast.client.messages("raw/#") as fast_messages:
+        for index in range(5):
+            message = aiomqtt.Message("raw/data/", str(index).encode(), 0, False, 0, None)
+            await asyncio.wait_for(owner.dispatcher.dispatch(message), timeout=1)
+        # The fast proxy keeps up while the slow one's buffer is full and two more are held
+        # back for it (its backlog bound); nothing is dropped.
+        assert [(await fast_messages.__anext__()).payload for _ in range(5)] == [b"0", b"1", b"2", b"3", b"4"]
+        assert [(await slow_messages.__anext__()).payload for _ in range(5)] == [b"0", b"1", b"2", b"3", b"4"]
+    for proxy in (slow, fast):
+        await proxy.close()
+    await owner.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_worker_requeues_the_rest_of_its_batch_in_order() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        publish_concurrency=2,
+        publish_batch_size=64,
+    )
+    release_publish = asyncio.Event()
+    started: list[str] = []
+    published: list[str] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        started.append(topic)
+        await release_publish.wait()
+        published.append(topic)
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    for index in range(6):
+        await proxy.publish_message(f"test/{index}", "payload")
+    await asyncio.sleep(0)
+    # Each worker takes a fair share of the backlog: [0, 1, 2] and [3, 4]; "test/5" stays queued.
+    assert started == ["test/0", "test/3"]
+
+    proxy._publish_workers[0].cancel()
+    await asyncio.sleep(0.01)
+    release_publish.set()
+    with pytest.raises(RuntimeError, match="publish worker exited unexpectedly"):
+        await proxy.flush(timeout=1.0)
+    await asyncio.sleep(0.01)
+    # The cancelled worker's unpublished items went back to the front of the queue.
+    assert published == ["test/3", "test/4", "test/1", "test/2", "test/5"]
+    assert proxy._pending_publish_completions == 0
+    await proxy._stop_publish_workers(drain=False)
+
+
+@pytest.mark.asyncio
+async def test_sharded_publish_mode_keeps_per_topic_order_across_workers() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        publish_concurrency=4,
+        publish_mode="sharded",
+    )
+    delays = random.Random(7)
+    active = 0
+    max_active = 0
+    published: dict[str, list[int]] = {}
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(delays.random() * 0.002)
+        active -= 1
+        published.setdefault(topic, []).append(int(payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    topics = [f"test/{index}" for index in range(16)]
+    for sequence in range(20):
+        for topic in topics:
+            await proxy.publish_message(topic, str(sequence))
+    await proxy.flush(timeout=5.0)
+
+    assert max_active > 1
+    assert published == {topic: list(range(20)) for topic in topics}
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_publish_many_registers_once_and_queues_the_scan_in_order() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        publish_concurrency=1,
+    )
+    published: list[tuple[str, str | bytes]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        published.append((topic, payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    scan = [
+        {
+            "topic": "test/site/",
+            "asset": f"line-{line}",
+            "objectType": "motor",
+            "objectId": "main",
+            "attributes": [
+                {"attribute": "temperature", "data": {"value": 20 + line, "uom": "C"}},
+                {"attribute": "status", "data": {"value": "RUNNING"}},
+            ],
+        }
+        for line in range(3)
+    ]
+    await proxy.publish_many(scan)
+    await proxy.flush(timeout=1.0)
+    await proxy.flush_produced_topics()
+
+    registry_updates = [payload for topic, payload in published if topic.endswith("/topics")]
+    assert len(registry_updates) == 1 and len(json.loads(registry_updates[0])) == 6
+    data = [(topic, json.loads(payload)) for topic, payload in published if not topic.endswith("/topics")]
+    assert [topic for topic, _ in data] == [
+        f"test/site/line-{line}/motor/main/{attribute}" for line in range(3) for attribute in ("temperature", "status")
+    ]
+    # The whole scan shares one timestamp.
+    assert len({packet["message"]["data"]["time"] for _, packet in data}) == 1
+
+    invalid = [scan[0], {"topic": "test/site/", "attributes": {"attribute": "broken"}}]
+    with pytest.raises(ValueError):
+        await proxy.publish_many(invalid)
+    await proxy.flush(timeout=1.0)
+    assert len(published) == 7
+
+    # A bad time in the last entry rejects the batch before any topic is registered or numbered.
+    bad_time = [
+        {"topic": "test/site/", "asset": "line-9", "objectType": "motor", "objectId": "main",
+         "attributes": [{"attribute": "temperature", "data": {"value": 1, "time": "2026-01-01T00:00:00Z"}}]},
+        {"topic": "test/site/", "asset": "line-9", "objectType": "motor", "objectId": "main",
+         "attributes": [{"attribute": "status", "data": {"value": "RUNNING", "time": "not-a-time"}}]},
+    ]
+    registered, sequence_id = len(proxy._produced_topics), proxy._sequence_ids.get("test/site/")
+    with pytest.raises(ValueError):
+        await proxy.publish_many(bad_time)
+    assert len(proxy._produced_topics) == registered
+    assert proxy._sequence_ids.get("test/site/") == sequence_id
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_registry_publishes_are_debounced_deduplicated_and_paged() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        registry_debounce=0.05,
+        registry_page_size=2,
+    )
+    published: list[tuple[str, list | dict]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        assert retain
+        published.append((topic.removeprefix(proxy.instance_status_topic), json.loads(payload)))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    def topic_object(index: int) -> dict[str, str]:
+        return {"topic": "test/site/", "asset": "line-1", "objectType": "motor", "objectId": "main", "attribute": f"a{index}"}
+
+    for index in range(3):
+        await proxy.register_unique_topic(topic_object(index))
+    assert published == []
+    await asyncio.sleep(0.1)
+    # One coalesced publish: both pages and the page index.
+    assert [topic for topic, _ in published] == ["topics/0", "topics/1", "topics"]
+    assert published[-1][1] == {"pages": 2, "pageSize": 2, "count": 3}
+
+    published.clear()
+    await proxy.register_unique_topic(topic_object(1))
+    await proxy._emit_produced_topics()
+    assert published == []
+
+    await proxy.register_unique_topic(topic_object(3))
+    await proxy.flush_produced_topics()
+    # Page 0 is untouched; only the last page and the page index are republished.
+    assert [topic for topic, _ in published] == ["topics/1", "topics"]
+    assert [entry["attribute"] for entry in published[0][1]] == ["a2", "a3"]
+    assert published[1][1] == {"pages": 2, "pageSize": 2, "count": 4}
+
+    # A lost connection may have taken the retained registry with it; the next emit sends it all.
+    published.clear()
+    proxy.client._connection_epoch += 1
+    assert proxy.client.connection_epoch == 1
+    await proxy._emit_produced_topics()
+    assert [topic for topic, _ in published] == ["topics/0", "topics/1", "topics"]
+
+    # The periodic republish repairs a registry cleared on the broker even when nothing changed.
+    published.clear()
+    await proxy._republish_produced_topics()
+    assert [topic for topic, _ in published] == ["topics/0", "topics/1", "topics"]
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_known_topics_skip_registry_work_after_the_first_publish() -> None:
+    proxy = UnsMqttProxy("localhost", process_name="test-process", instance_name="test-instance")
+    published: list[str] = []
+    registered: list[dict] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        published.append(topic)
+
+    async def fake_register_unique_topic(topic_object: dict) -> None:
+        registered.append(topic_object)
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    proxy.register_unique_topic = fake_register_unique_topic  # type: ignore[method-assign]
+    for value in range(3):
+        # Asset, object type and id are parsed from the topic path.
+        await proxy.publish_mqtt_message(
+            {"topic": "test/site/line-1/motor/pump-1", "attributes": {"attribute": "speed", "data": {"value": value}}}
+        )
+    await proxy.flush(timeout=1.0)
+
+    assert len(registered) == 1
+    assert (registered[0]["topic"], registered[0]["asset"], registered[0]["objectType"], registered[0]["objectId"]) == (
+        "test/site/line-1/motor/pump-1/",
+        "line-1",
+        "motor",
+        "pump-1",
+    )
+    assert len(published) == 3 and len(set(published)) == 1
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_publish_mqtt_message_accepts_epoch_ms_times() -> None:
+    proxy = UnsMqttProxy("localhost", process_name="test-process", instance_name="test-instance")
+    packets: list[dict] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        if not topic.endswith("/topics"):
+            packets.append(json.loads(payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    # 0 is the epoch itself, not a missing time.
+    for time in (0, 1_767_225_600_000, "2026-01-01T00:00:01.500Z", 1_767_225_602_250):
+        await proxy.publish_mqtt_message(
+            {
+                "topic": "test/site/",
+                "asset": "line-1",
+                "objectType": "motor",
+                "objectId": "main",
+                "attributes": {"attribute": "speed", "data": {"value": 1, "time": time}},
+            }
+        )
+    await proxy.flush(timeout=1.0)
+
+    assert [packet["message"]["data"]["time"] for packet in packets] == [
+        "1970-01-01T00:00:00.000Z",
+        "2026-01-01T00:00:00.000Z",
+        "2026-01-01T00:00:01.500Z",
+        "2026-01-01T00:00:02.250Z",
+    ]
+    assert [packet.get("interval") for packet in packets] == [None, 1_767_225_600_000, 1500, 750]
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_table_epoch_ms_times_are_published_as_iso_strings() -> None:
+    proxy = UnsMqttProxy("localhost", process_name="test-process", instance_name="test-instance")
+    payloads: list[str | bytes] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        if not topic.endswith("/topics"):
+            payloads.append(payload)
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    await proxy.publish_mqtt_message(
+        {
+            "topic": "test/site/",
+            "asset": "line-1",
+            "objectType": "meter",
+            "objectId": "main",
+            "attributes": {
+                "attribute": "readings",
+                "table": {"time": 1_767_225_600_000, "columns": {"power": {"type": "double", "value": 42.5}}},
+            },
+        }
+    )
+    template = TableTemplate([TableColumnPayload(name="power", type="double", value=None)])
+    await proxy.publish_table_row(template, "test/site/line-1/meter", (42.5,), time=1_767_225_601_500)
+    await proxy.flush(timeout=1.0)
+
+    times = []
+    for payload in payloads:
+        parsed = UnsPacket.parse_view(payload, validate="strict")
+        assert parsed is not None and parsed.table is not None
+        times.append(parsed.table["time"])
+    assert times == ["2026-01-01T00:00:00.000Z", "2026-01-01T00:00:01.500Z"]
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_report_by_exception_suppresses_small_changes_and_sends_heartbeats() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        report_by_exception={"deadband": 0.5},
+    )
+    packets: dict[str, list[dict]] = {}
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        if not topic.endswith("/topics"):
+            packets.setdefault(topic.rstrip("/").rsplit("/", 1)[-1], []).append(json.loads(payload))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+    speeds = [10, 10.2, 10.4, 11, 11, 11, 11, 11]
+    running = ["on", "on", "off", "off", "on", "on", "on", "on"]
+    for second, (speed, run) in enumerate(zip(speeds, running)):
+        time = 1_767_225_600_000 + second * 1000
+        await proxy.publish_mqtt_message(
+            {
+                "topic": "test/site/",
+                "asset": "line-1",
+                "objectType": "motor",
+                "objectId": "main",
+                "attributes": [
+                    {"attribute": "speed", "expectedIntervalMs": 4000, "data": {"value": speed, "time": time}},
+                    {
+                        "attribute": "running",
+                        "reportByException": {"minIntervalMs": 2000},
+                        "data": {"value": run, "time": time},
+                    },
+                    {"attribute": "raw", "reportByException": False, "data": {"value": 1, "time": time}},
+                ],
+            }
+        )
+    await proxy.flush(timeout=1.0)
+
+    # 10.2 and 10.4 stay within the deadband; 11 is republished once expectedIntervalMs would otherwise pass.
+    speed = packets["speed"]
+    assert [packet["message"]["data"]["value"] for packet in speed] == [10, 11, 11]
+    assert [packet.get("interval") for packet in speed] == [None, 3000, 4000]
+    assert [packet["message"]["data"]["value"] for packet in packets["running"]] == ["on", "off", "on"]
+    assert len(packets["raw"]) == 8
+    # Suppressed values take no sequence id, so consumers see no gaps.
+    assert sorted(packet["sequenceId"] for topic in packets.values() for packet in topic) == list(range(14))
+    stats = proxy.report_by_exception_stats()
+    assert stats is not None
+    assert (stats.topics, stats.published, stats.suppressed, stats.heartbeats) == (2, 6, 10, 1)
+    metrics = proxy._exception_reporter.collect()  # type: ignore[union-attr]
+    assert metrics["rbe-suppressed"] == (10, None) and proxy._exception_reporter.collect()["rbe-suppressed"] == (0, None)  # type: ignore[union-attr]
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_publish_mode_keeps_only_the_newest_value_per_topic() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        publish_concurrency=2,
+        publish_mode="coalesce",
+        coalesce_max_rate=10,
+    )
+    loop = asyncio.get_running_loop()
+    sent: list[tuple[str, int, float]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        if not topic.endswith("/topics"):
+            sent.append((topic.rstrip("/").rsplit("/", 1)[-1], json.loads(payload)["message"]["data"]["value"], loop.time()))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    async def publish(attribute: str, value: int) -> None:
+        await proxy.publish_mqtt_message(
+            {
+                "topic": "test/site/",
+                "asset": "line-1",
+                "objectType": "motor",
+                "objectId": "main",
+                "attributes": {"attribute": attribute, "data": {"value": value}},
+            }
+        )
+
+    await publish("speed", 0)
+    await asyncio.sleep(0.01)
+    for value in range(1, 50):
+        await publish("speed", value)
+        await publish("torque", value)
+        assert sum(len(queue._queue) + len(queue._deferred) for queue in proxy._publish_queues) <= 2  # type: ignore[attr-defined]
+    await proxy.flush(timeout=1.0)
+
+    speed = [(value, at) for name, value, at in sent if name == "speed"]
+    assert [value for value, _ in speed] == [0, 49]
+    assert speed[1][1] - speed[0][1] >= 0.09
+    # Torque was not rate limited yet when its first value arrived, so it went out before being superseded.
+    torque = [value for name, value, _ in sent if name == "torque"]
+    assert torque[-1] == 49 and len(torque) <= 2
+    assert proxy.superseded_publishes() == 48 + 49 - len(torque)
+    assert proxy._coalesce_metrics()["publish-superseded"] == (proxy.superseded_publishes(), None)
+    await proxy._stop_publish_workers()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_batch_with_repeated_topics_flushes() -> None:
+    proxy = UnsMqttProxy(
+        "localhost",
+        process_name="test-process",
+        instance_name="test-instance",
+        publish_mode="coalesce",
+        publish_concurrency=1,
+        max_pending_publishes=2,
+    )
+    sent: list[tuple[str, int]] = []
+
+    async def fake_publish_raw(topic: str, payload: str | bytes, *, qos: int = 0, retain: bool = False) -> None:
+        if not topic.endswith("/topics"):
+            sent.append((topic.rstrip("/").rsplit("/", 1)[-1], json.loads(payload)["message"]["data"]["value"]))
+
+    proxy.client.publish_raw = fake_publish_raw  # type: ignore[method-assign]
+
+    def message(attribute: str, value: int) -> dict:
+        return {
+            "topic": "test/site/",
+            "asset": "line-1",
+            "objectType": "motor",
+            "objectId": "main",
+            "attributes": {"attribute": attribute, "data": {"value": value}},
+        }
+
+    # Five values for two topics fit a queue of two: repeats coalesce within the batch.
+    await proxy.publish_many([message("speed", 1), message("speed", 2), message("torque", 1), message("speed", 3), message("torque", 2)])
+    await proxy.flush(timeout=1.0)
+
+    assert sorted(sent) == [("speed", 3), ("torque", 2)]
+    assert proxy.superseded_publishes() == 3
+    assert proxy._pending_publish_completions == 0
+    await proxy._stop_publish_workers()